@@ -6,6 +6,7 @@ import threading
 import warnings
 
 from chainer import configuration  # NOQA
+from chainer import cpu_memory  # NOQA
 from chainer import cuda  # NOQA
 from chainer import dataset  # NOQA
 from chainer import datasets  # NOQA
@@ -22,6 +23,7 @@ from chainer import optimizers  # NOQA
 from chainer import reporter  # NOQA
 from chainer import serializer  # NOQA
 from chainer import serializers  # NOQA
+from chainer import static_subgraph  # NOQA
 from chainer import training  # NOQA
 from chainer import variable  # NOQA
 
@@ -55,6 +57,8 @@ from chainer.reporter import Summary  # NOQA
 from chainer.serializer import AbstractSerializer  # NOQA
 from chainer.serializer import Deserializer  # NOQA
 from chainer.serializer import Serializer  # NOQA
+from chainer.static_subgraph import static_graph  # NOQA
+from chainer.static_subgraph import StaticGraph  # NOQA
 from chainer.variable import Variable  # NOQA
 
 
@@ -82,7 +86,12 @@ def get_function_hooks():
     return thread_local.function_hooks
 
 
+global_config.cpu_conv_threads = int(
+    os.environ.get('CHAINER_CPU_CONV_THREADS', '1'))
+global_config.cpu_conv_workspace_size = int(
+    os.environ.get('CHAINER_CPU_CONV_WORKSPACE_SIZE', str(256 * 1024 * 1024)))
 global_config.debug = bool(int(os.environ.get('CHAINER_DEBUG', '0')))
+global_config.dropout_mask = os.environ.get('CHAINER_DROPOUT_MASK', 'dense')
 global_config.enable_backprop = True
 global_config.train = True
 global_config.type_check = bool(int(os.environ.get('CHAINER_TYPE_CHECK', '1')))
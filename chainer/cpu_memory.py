@@ -0,0 +1,218 @@
+"""Memory pool for NumPy arrays.
+
+As Chainer reuses the device memory by the memory pool of CuPy, CPU
+implementations of functions allocate their large temporary and output arrays
+from :class:`MemoryPool` to reuse the host memory over iterations. The memory
+of an array goes back to the pool when the array and all its views, e.g. the
+data or the gradient of a released :class:`~chainer.Variable`, are freed.
+
+"""
+import collections
+import os
+import threading
+
+import numpy
+import six
+
+
+MemoryPoolInfo = collections.namedtuple(
+    'MemoryPoolInfo',
+    ['hits', 'misses', 'used_bytes', 'cached_bytes', 'capacity'])
+
+
+class _Memory(object):
+
+    """Memory lent to an array by a pool.
+
+    Arrays made from it and their views keep it alive. It goes back to the
+    pool when all of them are freed.
+
+    """
+
+    def __init__(self, returned, raw, ptr, shape, dtype):
+        self._returned = returned
+        self._raw = raw
+        self.__array_interface__ = {
+            'data': (ptr, False),
+            'shape': shape,
+            'typestr': dtype.str,
+            'version': 3,
+        }
+
+    def __del__(self):
+        # It may be called by the garbage collector in the middle of a method
+        # of the pool, so the memory is only queued here.
+        self._returned.append(self._raw)
+
+
+class MemoryPool(object):
+
+    """Memory pool for NumPy arrays.
+
+    It keeps the memory of the arrays it has allocated after they are freed,
+    and allocates a new array of the same size in bytes from it. It avoids
+    the page faults and the cost of the allocator on each iteration of a
+    training loop with fixed shapes, which are not negligible for large
+    arrays. The arrays are ordinary :class:`numpy.ndarray` objects whose
+    memory goes back to the pool when they and all their views are freed.
+
+    Small arrays are allocated by :func:`numpy.empty` as usual.
+
+    Args:
+        capacity (int): Maximum total size in bytes of the cached memory that
+            is not used by any array. When it is exceeded, the least recently
+            freed memory is released. If it is ``0``, the pool allocates
+            every array by :func:`numpy.empty`.
+        min_size (int): Arrays smaller than this size in bytes are not
+            allocated from the pool.
+
+    Attributes:
+        allocated_bytes (int): Total size in bytes of the arrays allocated by
+            :meth:`empty` so far, including the small ones.
+
+    """
+
+    def __init__(self, capacity, min_size=1 << 16):
+        if capacity < 0:
+            raise ValueError('capacity must be non-negative')
+        self.capacity = capacity
+        self.min_size = min_size
+        self._lock = threading.Lock()
+        self._returned = collections.deque()
+        self._free = collections.OrderedDict()  # id -> memory, oldest first
+        self._free_ids = collections.defaultdict(list)  # size -> ids
+        self._cached_bytes = 0
+        self._used_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self.allocated_bytes = 0
+
+    def empty(self, shape, dtype=float):
+        """Returns an uninitialized array allocated from the pool.
+
+        Args:
+            shape (int or tuple of ints): Shape of the array.
+            dtype: Data type of the array.
+
+        Returns:
+            numpy.ndarray: New array.
+
+        """
+        dtype = numpy.dtype(dtype)
+        if isinstance(shape, six.integer_types + (numpy.integer,)):
+            shape = (int(shape),)
+        else:
+            shape = tuple(int(s) for s in shape)
+        nbytes = dtype.itemsize
+        for s in shape:
+            nbytes *= s
+        self.allocated_bytes += nbytes
+        if nbytes < self.min_size or self.capacity == 0:
+            return numpy.empty(shape, dtype=dtype)
+
+        with self._lock:
+            self._collect()
+            ids = self._free_ids.get(nbytes)
+            if ids:
+                raw = self._free.pop(ids.pop())
+                self._cached_bytes -= nbytes
+                self._hits += 1
+            else:
+                raw = None
+                self._misses += 1
+            self._used_bytes += nbytes
+        if raw is None:
+            raw = numpy.empty(nbytes, dtype=numpy.uint8)
+        return numpy.asarray(_Memory(
+            self._returned, raw, raw.ctypes.data, shape, dtype))
+
+    def empty_like(self, a):
+        """Returns an uninitialized array of the same shape and dtype."""
+        return self.empty(a.shape, a.dtype)
+
+    def info(self):
+        """Returns the statistics of the pool.
+
+        Returns:
+            MemoryPoolInfo: Named tuple of the numbers of allocations served
+            from the cached memory (hits) and by new memory (misses), the
+            total size in bytes of the memory used by living arrays and of the
+            cached memory, and the capacity.
+
+        """
+        with self._lock:
+            self._collect()
+            return MemoryPoolInfo(self._hits, self._misses, self._used_bytes,
+                                  self._cached_bytes, self.capacity)
+
+    def set_capacity(self, capacity):
+        """Changes the capacity and releases the cached memory exceeding it.
+
+        Args:
+            capacity (int): Maximum total size in bytes of the cached memory.
+
+        """
+        if capacity < 0:
+            raise ValueError('capacity must be non-negative')
+        with self._lock:
+            self.capacity = capacity
+            self._collect()
+
+    def free_all_blocks(self):
+        """Releases all the cached memory."""
+        with self._lock:
+            self._collect()
+            self._free.clear()
+            self._free_ids.clear()
+            self._cached_bytes = 0
+
+    def _collect(self):
+        # Caches the memory of the freed arrays and evicts the oldest ones
+        returned = self._returned
+        while returned:
+            raw = returned.popleft()
+            size = raw.size
+            self._used_bytes -= size
+            if size > self.capacity:
+                continue
+            self._free[id(raw)] = raw
+            self._free_ids[size].append(id(raw))
+            self._cached_bytes += size
+        while self._cached_bytes > self.capacity:
+            key, raw = self._free.popitem(last=False)
+            self._free_ids[raw.size].remove(key)
+            self._cached_bytes -= raw.size
+
+
+_memory_pool = MemoryPool(int(os.environ.get(
+    'CHAINER_CPU_MEMORY_POOL_CAPACITY', str(1 << 30))))
+
+
+def get_memory_pool():
+    """Returns the default memory pool for NumPy arrays.
+
+    Its initial capacity is taken from the ``CHAINER_CPU_MEMORY_POOL_CAPACITY``
+    environment variable, which defaults to 1 GiB.
+
+    Returns:
+        MemoryPool: The default memory pool.
+
+    """
+    return _memory_pool
+
+
+def empty(shape, dtype=float):
+    """Returns an uninitialized array allocated from the default pool.
+
+    CPU implementations of functions use it for the temporary and output
+    arrays whose contents are entirely overwritten.
+
+    Args:
+        shape (int or tuple of ints): Shape of the array.
+        dtype: Data type of the array.
+
+    Returns:
+        numpy.ndarray: New array.
+
+    """
+    return _memory_pool.empty(shape, dtype)
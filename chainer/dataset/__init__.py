@@ -6,8 +6,11 @@ from chainer.dataset import iterator  # NOQA
 
 # import class and function
 from chainer.dataset.convert import concat_examples  # NOQA
+from chainer.dataset.convert import ConcatenatedBatch  # NOQA
+from chainer.dataset.convert import get_batch  # NOQA
 from chainer.dataset.convert import to_device  # NOQA
 from chainer.dataset.dataset_mixin import DatasetMixin  # NOQA
+from chainer.dataset.download import cache_or_load_arrays  # NOQA
 from chainer.dataset.download import cache_or_load_file  # NOQA
 from chainer.dataset.download import cached_download  # NOQA
 from chainer.dataset.download import get_dataset_directory  # NOQA
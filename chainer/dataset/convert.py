@@ -35,6 +35,99 @@ def to_device(device, x):
         return cuda.to_gpu(x, device, cuda.Stream.null)
 
 
+class ConcatenatedBatch(object):
+
+    """Batch of examples that are already concatenated into arrays.
+
+    This is a sequence of examples that holds the arrays built by
+    :func:`concat_examples` instead of the examples themselves. Iterators that
+    assemble batches in place return this object, which
+    :func:`concat_examples` passes through without copying the arrays.
+
+    Indexing by an integer returns the example at the index, whose entries are
+    views of the concatenated arrays, and slicing returns a new
+    :class:`ConcatenatedBatch` of views. It can thus be used as a list of
+    examples in most cases, e.g., split by ``batch[i::n]``.
+
+    Args:
+        arrays: Array, tuple of arrays, or dictionary of arrays with the same
+            length along the first axis, in the form that
+            :func:`concat_examples` returns.
+
+    Attributes:
+        arrays: The concatenated arrays.
+
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+
+    def __len__(self):
+        arrays = self.arrays
+        if isinstance(arrays, tuple):
+            return len(arrays[0])
+        elif isinstance(arrays, dict):
+            return len(next(six.itervalues(arrays)))
+        else:
+            return len(arrays)
+
+    def __getitem__(self, index):
+        example = _map_arrays(lambda x: x[index], self.arrays)
+        if isinstance(index, slice):
+            return ConcatenatedBatch(example)
+        return example
+
+    def __iter__(self):
+        for i in six.moves.range(len(self)):
+            yield self[i]
+
+
+def get_batch(dataset, indices):
+    """Gets the examples of a dataset at given indices as arrays at once.
+
+    This is the entry point of the *batch-index protocol*, with which a
+    dataset gathers a batch by a few array indexings instead of building the
+    examples one by one. A dataset supports the protocol if it is a NumPy or
+    CuPy array, or if it has a ``get_batch`` method that takes an array of
+    indices and returns a :class:`ConcatenatedBatch` of the examples at them.
+    The method may return ``None`` if it cannot gather them at once, e.g.
+    when the underlying datasets are lists. Iterators use this function and
+    fall back to the usual indexing when it returns ``None``.
+
+    Args:
+        dataset: Dataset to gather the examples from.
+        indices (numpy.ndarray): Integer array of indices.
+
+    Returns:
+        ConcatenatedBatch: The examples at ``indices``, or ``None`` if the
+        dataset does not support the protocol.
+
+    """
+    if isinstance(dataset, (numpy.ndarray, cuda.ndarray)):
+        return ConcatenatedBatch(dataset[indices])
+    get_batch_method = getattr(dataset, 'get_batch', None)
+    if get_batch_method is None:
+        return None
+    return get_batch_method(indices)
+
+
+def _get_batch_array(dataset, indices):
+    # Gathers the examples of a dataset of arrays into a single array
+    batch = get_batch(dataset, indices)
+    if batch is None or isinstance(batch.arrays, (tuple, dict)):
+        return None
+    return batch.arrays
+
+
+def _map_arrays(f, arrays):
+    if isinstance(arrays, tuple):
+        return tuple(f(x) for x in arrays)
+    elif isinstance(arrays, dict):
+        return {key: f(x) for key, x in six.iteritems(arrays)}
+    else:
+        return f(arrays)
+
+
 def concat_examples(batch, device=None, padding=None):
     """Concatenates a list of examples into array(s).
 
@@ -59,6 +152,9 @@ def concat_examples(batch, device=None, padding=None):
     contents of all arrays can be substituted to. The padding value is then
     used to the extra elements of the resulting arrays.
 
+    If ``batch`` is a :class:`ConcatenatedBatch`, its arrays are returned
+    without copying them, except for sending them to ``device``.
+
     TODO(beam2d): Add an example.
 
     Args:
@@ -81,6 +177,9 @@ def concat_examples(batch, device=None, padding=None):
     if len(batch) == 0:
         raise ValueError('batch is empty')
 
+    if isinstance(batch, ConcatenatedBatch):
+        return _map_arrays(lambda x: to_device(device, x), batch.arrays)
+
     first_elem = batch[0]
 
     if isinstance(first_elem, tuple):
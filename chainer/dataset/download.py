@@ -5,6 +5,8 @@ import shutil
 import tempfile
 
 import filelock
+import numpy
+import six
 from six.moves.urllib import request
 
 
@@ -150,3 +152,50 @@ def cache_or_load_file(path, creator, loader):
         shutil.rmtree(temp_dir)
 
     return content
+
+
+def cache_or_load_arrays(path, creator, mmap_mode='r'):
+    """Caches arrays as raw ``.npy`` files, or maps them into memory.
+
+    This is a variant of :func:`cache_or_load_file` for datasets made of
+    arrays. The cache is a directory that contains one uncompressed ``.npy``
+    file for each array. The loader opens them with :func:`numpy.load` in
+    the given memory-map mode instead of reading them, so loading the cache
+    takes almost no time, and processes that load the same dataset, e.g. the
+    workers of :class:`~chainer.iterators.MultiprocessIterator`, share the
+    page cache of the files instead of holding their own copies.
+
+    Args:
+        path (str): Path to the cache directory.
+        creator: Function that takes no arguments and returns a dictionary of
+            arrays. The keys are used as the file names, so they must be
+            valid ones.
+        mmap_mode (str): Memory-map mode passed to :func:`numpy.load`. The
+            default ``'r'`` makes the arrays read-only. Use ``'c'`` to make
+            them writable without modifying the files.
+
+    Returns:
+        dict: Dictionary of the arrays. They are the arrays returned by the
+        creator if the cache has just been created, and arrays mapped to the
+        cached files otherwise.
+
+    """
+    def create(temp_path):
+        arrays = creator()
+        os.mkdir(temp_path)
+        for key, array in six.iteritems(arrays):
+            numpy.save(os.path.join(temp_path, key + '.npy'), array)
+        return arrays
+
+    def load(path):
+        arrays = {}
+        for file_name in os.listdir(path):
+            key, ext = os.path.splitext(file_name)
+            if ext == '.npy':
+                array = numpy.load(os.path.join(path, file_name),
+                                   mmap_mode=mmap_mode)
+                # The view keeps the memory map alive
+                arrays[key] = array.view(numpy.ndarray)
+        return arrays
+
+    return cache_or_load_file(path, create, load)
@@ -108,10 +108,10 @@ def _preprocess_cifar(images, labels, withlabel, ndim, scale):
 
 def _retrieve_cifar_100():
     root = download.get_dataset_directory('pfnet/chainer/cifar')
-    path = os.path.join(root, 'cifar-100.npz')
+    path = os.path.join(root, 'cifar-100')
     url = 'https://www.cs.toronto.edu/~kriz/cifar-100-python.tar.gz'
 
-    def creator(path):
+    def creator():
 
         def load(archive, file_name):
             d = _pickle_load(archive.extractfile(file_name))
@@ -124,20 +124,18 @@ def _retrieve_cifar_100():
             train_x, train_y = load(archive, 'cifar-100-python/train')
             test_x, test_y = load(archive, 'cifar-100-python/test')
 
-        numpy.savez_compressed(path, train_x=train_x, train_y=train_y,
-                               test_x=test_x, test_y=test_y)
         return {'train_x': train_x, 'train_y': train_y,
                 'test_x': test_x, 'test_y': test_y}
 
-    return download.cache_or_load_file(path, creator, numpy.load)
+    return download.cache_or_load_arrays(path, creator)
 
 
 def _retrieve_cifar(name):
     root = download.get_dataset_directory('pfnet/chainer/cifar')
-    path = os.path.join(root, '{}.npz'.format(name))
+    path = os.path.join(root, name)
     url = 'https://www.cs.toronto.edu/~kriz/{}-python.tar.gz'.format(name)
 
-    def creator(path):
+    def creator():
         archive_path = download.cached_download(url)
 
         train_x = numpy.empty((5, 10000, 3072), dtype=numpy.uint8)
@@ -163,12 +161,10 @@ def _retrieve_cifar(name):
         train_x = train_x.reshape(50000, 3072)
         train_y = train_y.reshape(50000)
 
-        numpy.savez_compressed(path, train_x=train_x, train_y=train_y,
-                               test_x=test_x, test_y=test_y)
         return {'train_x': train_x, 'train_y': train_y,
                 'test_x': test_x, 'test_y': test_y}
 
-    return download.cache_or_load_file(path, creator, numpy.load)
+    return download.cache_or_load_arrays(path, creator)
 
 
 def _pickle_load(f):
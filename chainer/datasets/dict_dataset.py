@@ -1,5 +1,7 @@
 import six
 
+from chainer.dataset import convert
+
 
 class DictDataset(object):
 
@@ -39,3 +41,26 @@ class DictDataset(object):
 
     def __len__(self):
         return self._length
+
+    def get_batch(self, indices):
+        """Gathers the examples at given indices by indexing each dataset.
+
+        It supports the batch-index protocol (see
+        :func:`~chainer.dataset.get_batch`) if all the underlying datasets
+        are arrays or datasets of arrays supporting the protocol.
+
+        Args:
+            indices (numpy.ndarray): Integer array of indices.
+
+        Returns:
+            ~chainer.dataset.ConcatenatedBatch: Dictionary of the arrays of
+            each dataset, or ``None`` if the protocol is not supported.
+
+        """
+        arrays = {}
+        for key, dataset in six.iteritems(self._datasets):
+            array = convert._get_batch_array(dataset, indices)
+            if array is None:
+                return None
+            arrays[key] = array
+        return convert.ConcatenatedBatch(arrays)
@@ -3,7 +3,6 @@ import os
 import struct
 
 import numpy
-import six
 
 from chainer.dataset import download
 from chainer.datasets import tuple_dataset
@@ -74,23 +73,22 @@ def _preprocess_mnist(raw, withlabel, ndim, scale, image_dtype, label_dtype):
 def _retrieve_mnist_training():
     urls = ['http://yann.lecun.com/exdb/mnist/train-images-idx3-ubyte.gz',
             'http://yann.lecun.com/exdb/mnist/train-labels-idx1-ubyte.gz']
-    return _retrieve_mnist('train.npz', urls)
+    return _retrieve_mnist('train', urls)
 
 
 def _retrieve_mnist_test():
     urls = ['http://yann.lecun.com/exdb/mnist/t10k-images-idx3-ubyte.gz',
             'http://yann.lecun.com/exdb/mnist/t10k-labels-idx1-ubyte.gz']
-    return _retrieve_mnist('test.npz', urls)
+    return _retrieve_mnist('test', urls)
 
 
 def _retrieve_mnist(name, urls):
     root = download.get_dataset_directory('pfnet/chainer/mnist')
     path = os.path.join(root, name)
-    return download.cache_or_load_file(
-        path, lambda path: _make_npz(path, urls), numpy.load)
+    return download.cache_or_load_arrays(path, lambda: _make_arrays(urls))
 
 
-def _make_npz(path, urls):
+def _make_arrays(urls):
     x_url, y_url = urls
     x_path = download.cached_download(x_url)
     y_path = download.cached_download(y_url)
@@ -103,13 +101,11 @@ def _make_npz(path, urls):
             raise RuntimeError('wrong pair of MNIST images and labels')
         fx.read(8)
 
-        x = numpy.empty((N, 784), dtype=numpy.uint8)
-        y = numpy.empty(N, dtype=numpy.uint8)
+        x = fx.read(N * 784)
+        y = fy.read(N)
+    if len(x) != N * 784 or len(y) != N:
+        raise RuntimeError('MNIST file is truncated')
 
-        for i in six.moves.range(N):
-            y[i] = ord(fy.read(1))
-            for j in six.moves.range(784):
-                x[i, j] = ord(fx.read(1))
-
-    numpy.savez_compressed(path, x=x, y=y)
+    x = numpy.frombuffer(x, dtype=numpy.uint8).reshape(N, 784)
+    y = numpy.frombuffer(y, dtype=numpy.uint8)
     return {'x': x, 'y': y}
@@ -28,9 +28,9 @@ def get_ptb_words():
        words and word IDs.
 
     """
-    train = _retrieve_ptb_words('train.npz', _train_url)
-    valid = _retrieve_ptb_words('valid.npz', _valid_url)
-    test = _retrieve_ptb_words('test.npz', _test_url)
+    train = _retrieve_ptb_words('train', _train_url)
+    valid = _retrieve_ptb_words('valid', _valid_url)
+    test = _retrieve_ptb_words('test', _test_url)
     return train, valid, test
 
 
@@ -54,19 +54,16 @@ _test_url = 'https://raw.githubusercontent.com/tomsercu/lstm/master/data/ptb.tes
 
 
 def _retrieve_ptb_words(name, url):
-    def creator(path):
+    def creator():
         vocab = _retrieve_word_vocabulary()
         words = _load_words(url)
-        x = numpy.empty(len(words), dtype=numpy.int32)
-        for i, word in enumerate(words):
-            x[i] = vocab[word]
-
-        numpy.savez_compressed(path, x=x)
+        x = numpy.array([vocab[word] for word in words], dtype=numpy.int32)
         return {'x': x}
 
     root = download.get_dataset_directory('pfnet/chainer/ptb')
     path = os.path.join(root, name)
-    loaded = download.cache_or_load_file(path, creator, numpy.load)
+    # The arrays have been writable, so they are mapped copy-on-write
+    loaded = download.cache_or_load_arrays(path, creator, mmap_mode='c')
     return loaded['x']
 
 
@@ -1,6 +1,7 @@
 import numpy
 import six
 
+from chainer.dataset import convert
 from chainer.dataset import dataset_mixin
 
 
@@ -75,6 +76,33 @@ class SubDataset(dataset_mixin.DatasetMixin):
             index = self._order[index]
         return self._dataset[index]
 
+    def get_batch(self, indices):
+        """Gathers the examples at given indices from the base dataset.
+
+        It supports the batch-index protocol (see
+        :func:`~chainer.dataset.get_batch`) if the base dataset does.
+
+        Args:
+            indices (numpy.ndarray): Integer array of indices.
+
+        Returns:
+            ~chainer.dataset.ConcatenatedBatch: The examples, or ``None`` if
+            the protocol is not supported.
+
+        """
+        indices = numpy.asarray(indices)
+        if indices.size and (indices.max() >= self._size or
+                             indices.min() < -self._size):
+            raise IndexError('dataset index out of range')
+        index = numpy.where(
+            indices >= 0, indices + self._start, indices + self._finish)
+        order = self._order
+        if order is not None:
+            if not isinstance(order, numpy.ndarray):
+                order = self._order = numpy.asarray(order)
+            index = order[index]
+        return convert.get_batch(self._dataset, index)
+
 
 def split_dataset(dataset, split_at, order=None):
     """Splits a dataset into two subsets.
@@ -1,5 +1,7 @@
 import six
 
+from chainer.dataset import convert
+
 
 class TupleDataset(object):
 
@@ -37,3 +39,26 @@ class TupleDataset(object):
 
     def __len__(self):
         return self._length
+
+    def get_batch(self, indices):
+        """Gathers the examples at given indices by indexing each dataset.
+
+        It supports the batch-index protocol (see
+        :func:`~chainer.dataset.get_batch`) if all the underlying datasets
+        are arrays or datasets of arrays supporting the protocol.
+
+        Args:
+            indices (numpy.ndarray): Integer array of indices.
+
+        Returns:
+            ~chainer.dataset.ConcatenatedBatch: Tuple of the arrays of each
+            dataset, or ``None`` if the protocol is not supported.
+
+        """
+        arrays = []
+        for dataset in self._datasets:
+            array = convert._get_batch_array(dataset, indices)
+            if array is None:
+                return None
+            arrays.append(array)
+        return convert.ConcatenatedBatch(tuple(arrays))
@@ -70,6 +70,56 @@ def force_backprop_mode():
     return configuration.using_config('enable_backprop', True)
 
 
+_type_check_cache_size = 256
+_type_check_caches = {}
+_type_check_ignored_attrs = frozenset(
+    ('inputs', 'outputs', 'rank', '_stack', '_local_function_hooks'))
+_type_check_scalar_types = six.integer_types + six.string_types + (
+    bool, float, type(None), np.generic, np.dtype, type)
+
+
+def _freeze_type_check_value(value):
+    if isinstance(value, _type_check_scalar_types):
+        return value
+    if isinstance(value, np.ndarray) and value.size <= 64:
+        # check_type_forward may read the values, e.g. the indices of
+        # SplitAxis. Larger arrays and GPU arrays are not worth hashing.
+        return type(value), value.shape, value.dtype, value.tobytes()
+    if isinstance(value, (tuple, list)):
+        return type(value), tuple(
+            [_freeze_type_check_value(v) for v in value])
+    raise TypeError('unsupported attribute: {}'.format(type(value)))
+
+
+def _get_type_check_key(func, in_data):
+    try:
+        attrs = tuple(sorted(
+            (k, _freeze_type_check_value(v))
+            for k, v in six.iteritems(func.__dict__)
+            if k not in _type_check_ignored_attrs))
+    except TypeError:
+        return None
+    return attrs, tuple([(type(x), x.shape, x.dtype) for x in in_data])
+
+
+def clear_type_check_cache():
+    """Clears the cache of input types that passed the type checking.
+
+    :class:`Function` memorizes signatures of inputs that passed
+    :meth:`~Function.check_type_forward` for each function class, and skips
+    the type checking for the same signatures. A signature consists of the
+    shapes and dtypes of the input arrays and the attributes (i.e.,
+    hyperparameters) of the function object. Up to 256 signatures are kept for
+    each class, and the least recently used one is discarded when it is
+    exceeded. The contents of small NumPy array attributes are part of the
+    signature, and functions with larger or GPU array attributes are always
+    checked. This function clears all the memorized signatures, e.g. after
+    patching :meth:`~Function.check_type_forward` of a class.
+
+    """
+    _type_check_caches.clear()
+
+
 class Function(object):
 
     """Function on variables with backpropagation ability.
@@ -257,10 +307,25 @@ class Function(object):
             return None
 
     def _check_data_type_forward(self, in_data):
+        key = _get_type_check_key(self, in_data)
+        if key is not None:
+            cache = _type_check_caches.get(type(self))
+            if cache is None:
+                cache = _type_check_caches.setdefault(
+                    type(self), collections.OrderedDict())
+            elif cache.pop(key, None) is not None:
+                cache[key] = True
+                return
+
         in_type = type_check.get_types(in_data, 'in_types', False)
         with type_check.get_function_check_context(self):
             self.check_type_forward(in_type)
 
+        if key is not None:
+            cache[key] = True
+            if len(cache) > _type_check_cache_size:
+                cache.popitem(last=False)
+
     def check_type_forward(self, in_types):
         """Checks types of input data before forward propagation.
 
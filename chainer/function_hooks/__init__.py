@@ -4,4 +4,5 @@ from chainer.function_hooks import timer  # NOQA
 
 # import class and function
 from chainer.function_hooks.debug_print import PrintHook  # NOQA
+from chainer.function_hooks.timer import ProfileHook  # NOQA
 from chainer.function_hooks.timer import TimerHook  # NOQA
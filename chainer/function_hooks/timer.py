@@ -1,9 +1,20 @@
+import collections
+import json
+import os
+import random
+import sys
+import threading
 import time
+import timeit
+import weakref
 
 import numpy
+import six
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
+from chainer import mkld
 
 
 class TimerHook(function.FunctionHook):
@@ -61,3 +72,299 @@ class TimerHook(function.FunctionHook):
     def total_time(self):
         """Returns total elapsed time in seconds."""
         return sum(t for (_, t) in self.call_history)
+
+
+class _Stats(object):
+
+    def __init__(self, sample_size, random_state):
+        self.count = 0
+        self.total = 0.
+        self.min = float('inf')
+        self.max = 0.
+        self.allocated_bytes = 0
+        self.samples = []
+        self.sample_size = sample_size
+        self.random_state = random_state
+        self.shapes = {}
+
+    def add(self, elapsed_time, allocated_bytes, shapes, max_shapes):
+        self.count += 1
+        self.total += elapsed_time
+        if elapsed_time < self.min:
+            self.min = elapsed_time
+        if elapsed_time > self.max:
+            self.max = elapsed_time
+        self.allocated_bytes += allocated_bytes
+
+        # Reservoir sampling keeps a uniform sample of the elapsed times
+        samples = self.samples
+        if len(samples) < self.sample_size:
+            samples.append(elapsed_time)
+        else:
+            i = self.random_state.randrange(self.count)
+            if i < self.sample_size:
+                samples[i] = elapsed_time
+
+        shape_counts = self.shapes
+        if shapes in shape_counts:
+            shape_counts[shapes] += 1
+        elif len(shape_counts) < max_shapes:
+            shape_counts[shapes] = 1
+
+
+def _call_site():
+    # Returns the innermost frame outside of Chainer
+    frame = sys._getframe(2)
+    while frame is not None and \
+            frame.f_code.co_filename.startswith(_chainer_dir):
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return '{}:{}'.format(frame.f_code.co_filename, frame.f_lineno)
+
+
+_chainer_dir = os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))) + os.sep
+
+
+class ProfileHook(function.FunctionHook):
+
+    """Function hook for profiling functions with aggregated statistics.
+
+    Unlike :class:`TimerHook`, this hook does not keep the functions nor a
+    record of each call. It aggregates the calls into statistics whose size
+    does not grow over iterations, so that it can be kept enabled during long
+    training. The calls are grouped by the key given by ``group_by``, the
+    phase (``'forward'`` or ``'backward'``) and the implementation that ran:
+    ``'mkldnn'`` if the function chose the MKLDNN implementation (see
+    :mod:`chainer.mkld`), ``'numpy'`` for other CPU implementations, and
+    ``'cupy'`` on GPU. For each group, it records the number of calls, the
+    total, minimum and maximum elapsed times, percentiles estimated from a
+    uniform sample of the elapsed times, the input shapes, and the total size
+    of the arrays allocated from the CPU memory pool (see
+    :mod:`chainer.cpu_memory`).
+
+    It can also record each call of a window between :meth:`start_trace` and
+    :meth:`stop_trace`, which is written in the Chrome trace event format by
+    :meth:`export_chrome_trace` and viewed in ``chrome://tracing``.
+
+    On GPU, it synchronizes the device after each call to measure the elapsed
+    time, as :class:`TimerHook` does.
+
+    Args:
+        group_by: How to group the calls. ``'class'`` groups them by the class
+            name of the function, ``'label'`` by :attr:`Function.label`, and
+            ``'call_site'`` by the file name and the line number of the code
+            outside of Chainer that called the function. The backward
+            computation of a function is grouped with its forward call site.
+            It can also be a callable that takes a function and returns a
+            hashable key.
+        sample_size (int): Maximum number of elapsed times kept for each
+            group to estimate the percentiles.
+        max_shapes (int): Maximum number of distinct input shapes recorded
+            for each group. Shapes that appear after this number of shapes
+            are not recorded, though their calls are counted in the other
+            statistics.
+
+    """
+
+    name = 'ProfileHook'
+
+    def __init__(self, group_by='class', sample_size=1000, max_shapes=8):
+        if group_by == 'class':
+            self._key = _class_name
+        elif group_by == 'label':
+            self._key = _label
+        elif group_by == 'call_site':
+            self._key = self._call_site_key
+            self._call_sites = weakref.WeakKeyDictionary()
+        elif callable(group_by):
+            self._key = group_by
+        else:
+            raise ValueError('invalid group_by: {}'.format(group_by))
+        self._group_by = group_by
+        self.sample_size = sample_size
+        self.max_shapes = max_shapes
+        self._stats = {}
+        # A private generator leaves the global random stream of user code
+        # untouched
+        self._random_state = random.Random()
+        self._running = []
+        self._trace = None
+        self._trace_events = []
+        self._trace_origin = 0.
+        self._pool = cpu_memory.get_memory_pool()
+
+    def _call_site_key(self, function):
+        return self._call_sites.get(function)
+
+    def _preprocess(self, xp):
+        mkld.mkldnn_dispatched = None
+        if xp is numpy:
+            self._running.append(
+                (None, self._pool.allocated_bytes, timeit.default_timer()))
+        else:
+            start = cuda.Event()
+            start.record()
+            self._running.append((start, 0, None))
+
+    def _postprocess(self, function, phase, xp, arrays):
+        start, allocated_bytes, start_time = self._running.pop()
+        if start is None:
+            stop_time = timeit.default_timer()
+            elapsed_time = stop_time - start_time
+            allocated_bytes = self._pool.allocated_bytes - allocated_bytes
+            path = 'mkldnn' if mkld.mkldnn_dispatched else 'numpy'
+        else:
+            stop = cuda.Event()
+            stop.record()
+            stop.synchronize()
+            elapsed_time = cuda.cupy.cuda.get_elapsed_time(start, stop) / 1000
+            stop_time = timeit.default_timer()
+            start_time = stop_time - elapsed_time
+            allocated_bytes = 0
+            path = 'cupy'
+
+        key = (self._key(function), phase, path)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _Stats(
+                self.sample_size, self._random_state)
+        shapes = tuple([None if x is None else x.shape for x in arrays])
+        stats.add(elapsed_time, allocated_bytes, shapes, self.max_shapes)
+
+        if self._trace is not None:
+            self._trace.append({
+                'name': str(key[0]), 'cat': phase, 'ph': 'X',
+                'ts': (start_time - self._trace_origin) * 1e6,
+                'dur': elapsed_time * 1e6,
+                'pid': os.getpid(), 'tid': threading.current_thread().ident,
+                'args': {'path': path, 'shapes': str(shapes),
+                         'allocated_bytes': allocated_bytes},
+            })
+
+    def forward_preprocess(self, function, in_data):
+        if self._group_by == 'call_site':
+            self._call_sites[function] = _call_site()
+        self._preprocess(cuda.get_array_module(*in_data))
+
+    def forward_postprocess(self, function, in_data):
+        self._postprocess(function, 'forward',
+                          cuda.get_array_module(*in_data), in_data)
+
+    def backward_preprocess(self, function, in_data, out_grad):
+        self._preprocess(cuda.get_array_module(*(in_data + out_grad)))
+
+    def backward_postprocess(self, function, in_data, out_grad):
+        self._postprocess(function, 'backward',
+                          cuda.get_array_module(*(in_data + out_grad)),
+                          in_data)
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Returns the statistics of the recorded calls.
+
+        Args:
+            percentiles (tuple of numbers): Percentiles of the elapsed times
+                to estimate.
+
+        Returns:
+            list of dicts: Statistics of each group in descending order of
+            the total elapsed time. Each dictionary has the following
+            entries: ``'key'``, ``'phase'``, ``'path'``, ``'count'``,
+            ``'total'``, ``'mean'``, ``'min'``, ``'max'``, ``'percentiles'``
+            (a dictionary from each percentile to the elapsed time),
+            ``'allocated_bytes'`` and ``'shapes'`` (a dictionary from the
+            tuple of the input shapes to the number of calls). Times are in
+            seconds.
+
+        """
+        result = []
+        for (key, phase, path), stats in six.iteritems(self._stats):
+            values = numpy.percentile(stats.samples, percentiles)
+            result.append({
+                'key': key, 'phase': phase, 'path': path,
+                'count': stats.count, 'total': stats.total,
+                'mean': stats.total / stats.count,
+                'min': stats.min, 'max': stats.max,
+                'percentiles': dict(zip(percentiles, values.tolist())),
+                'allocated_bytes': stats.allocated_bytes,
+                'shapes': dict(stats.shapes),
+            })
+        result.sort(key=lambda entry: entry['total'], reverse=True)
+        return result
+
+    def print_report(self, file=sys.stdout):
+        """Prints a table of the statistics of the recorded calls.
+
+        Times are shown in milliseconds.
+
+        Args:
+            file: Output file-like object.
+
+        """
+        row = '{:<32} {:<8} {:<6} {:>8} {:>10} {:>9} {:>9} {:>9} {:>12}\n'
+        file.write(row.format('key', 'phase', 'path', 'count', 'total',
+                              'mean', 'p50', 'p99', 'bytes'))
+        for entry in self.summary(percentiles=(50, 99)):
+            file.write(row.format(
+                str(entry['key'])[-32:], entry['phase'], entry['path'],
+                entry['count'], '%.3f' % (entry['total'] * 1e3),
+                '%.3f' % (entry['mean'] * 1e3),
+                '%.3f' % (entry['percentiles'][50] * 1e3),
+                '%.3f' % (entry['percentiles'][99] * 1e3),
+                entry['allocated_bytes']))
+
+    def total_time(self):
+        """Returns total elapsed time in seconds."""
+        return sum(stats.total for stats in six.itervalues(self._stats))
+
+    def clear(self):
+        """Discards the recorded statistics."""
+        self._stats.clear()
+
+    def start_trace(self, max_events=100000):
+        """Starts recording each call for the Chrome trace.
+
+        Args:
+            max_events (int): Maximum number of calls to keep. Older calls are
+                discarded when it is exceeded.
+
+        """
+        self._trace = collections.deque(maxlen=max_events)
+        self._trace_origin = timeit.default_timer()
+
+    def stop_trace(self):
+        """Stops recording the calls for the Chrome trace.
+
+        The calls recorded so far are kept until :meth:`start_trace` is called
+        again.
+
+        """
+        if self._trace is not None:
+            self._trace_events = list(self._trace)
+            self._trace = None
+
+    def export_chrome_trace(self, file):
+        """Writes the recorded calls in the Chrome trace event format.
+
+        Args:
+            file: Path to the output file or a file-like object.
+
+        """
+        events = self._trace
+        if events is None:
+            events = self._trace_events
+        data = {'traceEvents': list(events), 'displayTimeUnit': 'ms'}
+        if isinstance(file, six.string_types):
+            with open(file, 'w') as f:
+                json.dump(data, f)
+        else:
+            json.dump(data, file)
+
+
+def _class_name(function):
+    return type(function).__name__
+
+
+def _label(function):
+    return function.label
@@ -1,6 +1,7 @@
 import numpy
 import chainer
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
 from chainer import utils
@@ -34,7 +35,7 @@ class ReLU(function.Function):
 
     def forward_cpu(self, x):
         if mkld.enable_reluF((x,)):
-            y = numpy.empty(x[0].shape, dtype=numpy.float32)
+            y = cpu_memory.empty(x[0].shape, dtype=numpy.float32)
             if x[0].ndim == 4:
                 mkldnn.Relu4D_F32.do_forward(x[0], y)
             else:
@@ -60,7 +61,7 @@ class ReLU(function.Function):
 
     def backward_cpu(self, x, gy):
         if mkld.enable_reluF((x, gy)):
-            gx = numpy.empty(x[0].shape, dtype=numpy.float32)
+            gx = cpu_memory.empty(x[0].shape, dtype=numpy.float32)
             if x[0].ndim == 4:
                 mkldnn.Relu4D_F32.do_backward(x[0], gy[0], gx)
             else:
@@ -1,6 +1,7 @@
 import numpy
 import six
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
 from chainer.utils import type_check
@@ -68,7 +69,7 @@ class Concat(function.Function):
             """
             only support channel dim concat
             """
-            y = numpy.empty(shape=(xs[0].shape[0], out_c, xs[0].shape[2], xs[0].shape[3]), dtype=xs[0].dtype)
+            y = cpu_memory.empty(shape=(xs[0].shape[0], out_c, xs[0].shape[2], xs[0].shape[3]), dtype=xs[0].dtype)
             if need_copy:
                 self.mkldnn_concat.forward(xs_new, y, self.axis)
             else:
@@ -86,7 +87,7 @@ class Concat(function.Function):
             # x should have same shape as xs
             xs_new = ()
             for xi in xs:
-                temp = numpy.empty(shape=xi.shape, dtype=xi.dtype)
+                temp = cpu_memory.empty(shape=xi.shape, dtype=xi.dtype)
                 xs_new += (temp,)
             self.mkldnn_concat.backward(xs_new, gy[0], self.axis)
             return xs_new
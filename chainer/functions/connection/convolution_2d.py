@@ -1,5 +1,6 @@
 import numpy
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
 from chainer.utils import conv
@@ -84,22 +85,19 @@ class Convolution2DFunction(function.Function):
             self.pd = self.sy*(out_h-1) + kh - h - self.ph
             self.pr = self.sx*(out_w-1) + kw - w - self.pw
 
-            y = numpy.empty(shape=(n, out_c, out_h, out_w), dtype=x.dtype)
+            y = cpu_memory.empty(shape=(n, out_c, out_h, out_w), dtype=x.dtype)
             if b is not None:
                 mkldnn.Convolution2D_F32.do_forward(x, W, b, y, kh, kw, self.sx, self.sy, self.ph, self.pw, self.pd, self.pr)
             else:
                 mkldnn.Convolution2D_F32.do_forward(x, W, y, kh, kw, self.sx, self.sy, self.ph, self.pw, self.pd, self.pr)
+            mkld.track_layout(y)
             return y,
         else:
-            self.col = conv.im2col_cpu(
-                x, kh, kw, self.sy, self.sx, self.ph, self.pw,
-                cover_all=self.cover_all)
-            # print "%f, %f" %(cos_module.cos_func(0.5), sin_module.sin_func(0.5))
-            y = numpy.tensordot(
-                self.col, W, ((1, 2, 3), (1, 2, 3))).astype(x.dtype, copy=False)
+            y, self.col = conv.conv_forward_cpu(
+                x, W, self.sy, self.sx, self.ph, self.pw,
+                cover_all=self.cover_all, keep_col=True)
             if b is not None:
-                y += b
-            y = numpy.rollaxis(y, 3, 1)
+                y += b.reshape(1, b.size, 1, 1)
             return y,
 
     def forward_gpu(self, inputs):
@@ -183,21 +181,25 @@ class Convolution2DFunction(function.Function):
         For MKLDNN backward, only support float32
         """
         if mkld.enable_convF(inputs):
-            gW = numpy.empty(shape=(out_c, input_c, kh, kw), dtype=W.dtype)
-            gx = numpy.empty(shape=(n, c, h, w), dtype=W.dtype)
+            gW = cpu_memory.empty(
+                shape=(out_c, input_c, kh, kw), dtype=W.dtype)
+            gx = cpu_memory.empty(shape=(n, c, h, w), dtype=W.dtype)
             if b is None:
                 mkldnn.Convolution2D_F32.do_backward(x, W, gy, gW, gx, kh, kw, self.sy, self.sx, self.ph, self.pw, self.pd, self.pr, self.mkldnn_opt)
                 return gx, gW
             else:
-                gb = numpy.empty(shape=b.shape, dtype=W.dtype)
+                gb = cpu_memory.empty(shape=b.shape, dtype=W.dtype)
                 mkldnn.Convolution2D_F32.do_backward(x, W, b, gy, gW, gx, gb, kh, kw, self.sy, self.sx, self.ph, self.pw, self.pd, self.pr, self.mkldnn_opt)
                 return gx, gW, gb
         else:
-            gW = numpy.tensordot(
-                    gy, self.col, ((0, 2, 3), (0, 4, 5))).astype(W.dtype, copy=False)
-            gcol = numpy.tensordot(W, gy, (0, 1)).astype(x.dtype, copy=False)
-            gcol = numpy.rollaxis(gcol, 3)
-            gx = conv.col2im_cpu(gcol, self.sy, self.sx, self.ph, self.pw, h, w)
+            gW = conv.conv_backward_filter_cpu(
+                x, gy, kh, kw, self.sy, self.sx, self.ph, self.pw,
+                cover_all=self.cover_all, col=self.col).astype(
+                    W.dtype, copy=False)
+            self.col = None
+            gx = conv.conv_backward_data_cpu(
+                W, gy, self.sy, self.sx, self.ph, self.pw, h, w,
+                dtype=x.dtype)
             if b is None:
                 return gx, gW
             else:
@@ -1,5 +1,6 @@
 import numpy
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
 from chainer.functions.connection import convolution_2d
@@ -90,23 +91,12 @@ class Deconvolution2DFunction(function.Function):
             assert self.outw > 0, 'Width in the output should be positive.'
 
         if mkld.enable_deconvF(inputs):
-            y = numpy.empty(shape=(n, input_c, self.outh, self.outw), dtype=x.dtype)
+            y = cpu_memory.empty(shape=(n, input_c, self.outh, self.outw), dtype=x.dtype)
             mkldnn.DeConvolution2D_F32.do_forward(x, W, y, kh, kw, self.sx, self.sy, self.ph, self.pw, self.ph, self.pw)
         else:
-            gcol = numpy.tensordot(W, x, (0, 1)).astype(x.dtype, copy=False)
-            # - k, m, n: shape of out_channel
-            # - b: number of inputs
-            # - h, w: height and width of kernels
-            # k, m, n, b, h, w -> b, k, m, n, h, w
-            gcol = numpy.rollaxis(gcol, 3)
-            if self.outh is None:
-                self.outh = conv.get_deconv_outsize(h, kh, self.sy, self.ph)
-                assert self.outh > 0, 'Height in the output should be positive.'
-            if self.outw is None:
-                self.outw = conv.get_deconv_outsize(w, kw, self.sx, self.pw)
-                assert self.outw > 0, 'Width in the output should be positive.'
-            y = conv.col2im_cpu(
-                gcol, self.sy, self.sx, self.ph, self.pw, self.outh, self.outw)
+            y = conv.conv_backward_data_cpu(
+                W, x, self.sy, self.sx, self.ph, self.pw, self.outh,
+                self.outw, dtype=x.dtype)
 
         # b, k, h, w
         if b is not None:
@@ -196,17 +186,16 @@ class Deconvolution2DFunction(function.Function):
         kh, kw = W.shape[2:]
 
         if mkld.enable_deconvF(inputs):
-            gW = numpy.empty(shape=W.shape, dtype=W.dtype)
-            gx = numpy.empty(shape=x.shape, dtype=x.dtype)
+            gW = cpu_memory.empty(shape=W.shape, dtype=W.dtype)
+            gx = cpu_memory.empty(shape=x.shape, dtype=x.dtype)
             mkldnn.DeConvolution2D_F32.do_backward(x, W, gy, gW, gx, kh, kw, self.sy, self.sx, self.ph, self.pw, self.ph, self.pw, False)
         else:
-            col = conv.im2col_cpu(
-                gy, kh, kw, self.sy, self.sx, self.ph, self.pw)
-            gW = numpy.tensordot(
-                x, col, ([0, 2, 3], [0, 4, 5])).astype(W.dtype, copy=False)
-            gx = numpy.tensordot(
-                col, W, ([1, 2, 3], [1, 2, 3])).astype(x.dtype, copy=False)
-            gx = numpy.rollaxis(gx, 3, 1)
+            gx, col = conv.conv_forward_cpu(
+                gy, W, self.sy, self.sx, self.ph, self.pw, keep_col=True)
+            gx = gx.astype(x.dtype, copy=False)
+            gW = conv.conv_backward_filter_cpu(
+                gy, x, kh, kw, self.sy, self.sx, self.ph, self.pw,
+                col=col).astype(W.dtype, copy=False)
 
         if b is None:
             return gx, gW
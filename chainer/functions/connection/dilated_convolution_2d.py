@@ -65,14 +65,12 @@ class DilatedConvolution2DFunction(function.Function):
         x, W = inputs[:2]
         b = inputs[2] if len(inputs) == 3 else None
         kh, kw = W.shape[2:]
-        self.col = conv.im2col_cpu(
-            x, kh, kw, self.sy, self.sx, self.ph, self.pw,
-            cover_all=self.cover_all, dy=self.dy, dx=self.dx)
-        y = numpy.tensordot(
-            self.col, W, ((1, 2, 3), (1, 2, 3))).astype(x.dtype, copy=False)
+        y, self.col = conv.conv_forward_cpu(
+            x, W, self.sy, self.sx, self.ph, self.pw,
+            cover_all=self.cover_all, dy=self.dy, dx=self.dx, keep_col=True)
         if b is not None:
-            y += b
-        return numpy.rollaxis(y, 3, 1),
+            y += b.reshape(1, b.size, 1, 1)
+        return y,
 
     def forward_gpu(self, inputs):
         x, W = inputs[:2]
@@ -159,13 +157,16 @@ class DilatedConvolution2DFunction(function.Function):
         b = inputs[2] if len(inputs) == 3 else None
         gy = grad_outputs[0]
         h, w = x.shape[2:]
+        kh, kw = W.shape[2:]
 
-        gW = numpy.tensordot(
-            gy, self.col, ((0, 2, 3), (0, 4, 5))).astype(W.dtype, copy=False)
-        gcol = numpy.tensordot(W, gy, (0, 1)).astype(x.dtype, copy=False)
-        gcol = numpy.rollaxis(gcol, 3)
-        gx = conv.col2im_cpu(gcol, self.sy, self.sx,
-                             self.ph, self.pw, h, w, dy=self.dy, dx=self.dx)
+        gW = conv.conv_backward_filter_cpu(
+            x, gy, kh, kw, self.sy, self.sx, self.ph, self.pw,
+            cover_all=self.cover_all, dy=self.dy, dx=self.dx,
+            col=self.col).astype(W.dtype, copy=False)
+        self.col = None
+        gx = conv.conv_backward_data_cpu(
+            W, gy, self.sy, self.sx, self.ph, self.pw, h, w,
+            dy=self.dy, dx=self.dx, dtype=x.dtype)
 
         if b is None:
             return gx, gW
@@ -1,5 +1,6 @@
 import numpy
 
+from chainer import cpu_memory
 from chainer import function
 from chainer.utils import type_check
 from chainer import mkld
@@ -41,7 +42,7 @@ class LinearFunction(function.Function):
         W = inputs[1]
         b = inputs[2] if len(inputs) == 3 else None
         if mkld.enable_linearF(inputs) and isinstance(x, numpy.ndarray):
-            y = numpy.empty(shape=(x.shape[0], W.shape[0]), dtype=W.dtype)
+            y = cpu_memory.empty(shape=(x.shape[0], W.shape[0]), dtype=W.dtype)
             if b is not None:
                 mkldnn.Linear_F32.do_forward(x, W, b, y)
             else:
@@ -62,10 +63,10 @@ class LinearFunction(function.Function):
         For MKLDNN backward, only support float32
         """
         if mkld.enable_linearF(inputs) and isinstance(x, numpy.ndarray):
-            gW = numpy.empty(shape=W.shape, dtype=W.dtype)
-            gx = numpy.empty(shape=x.shape, dtype=W.dtype)
+            gW = cpu_memory.empty(shape=W.shape, dtype=W.dtype)
+            gx = cpu_memory.empty(shape=x.shape, dtype=W.dtype)
             if b is not None:
-                gb = numpy.empty(shape=b.shape, dtype=W.dtype)
+                gb = cpu_memory.empty(shape=b.shape, dtype=W.dtype)
                 mkldnn.Linear_F32.do_backward(x, W, b, gy, gW, gx, gb)
                 return gx.reshape(inputs[0].shape), gW, gb
             else:
@@ -355,6 +355,215 @@ class NStepLSTM(function.Function):
         return tuple([dhx, dcx] + dws + dbs + dx_list)
 
 
+def _sigmoid_inplace(x):
+    half = x.dtype.type(0.5)
+    x *= half
+    numpy.tanh(x, out=x)
+    x *= half
+    x += half
+
+
+def _dropout_mask(shape, ratio, dtype):
+    scale = dtype.type(1. / (1 - ratio))
+    return scale * (numpy.random.rand(*shape) >= ratio).astype(dtype)
+
+
+class NStepLSTMCPU(NStepLSTM):
+
+    """Stacked LSTM over whole sequences on CPU.
+
+    It computes all the layers and time steps of :func:`n_step_lstm` in one
+    function application. The inputs are laid out time-major, i.e., the
+    inputs of all the time steps are concatenated into an array of shape
+    ``(sum(B_t), I)``, so that the input projections of each layer for all the
+    time steps are computed by one matrix product. Only the recurrent
+    projections and the gate activations are computed step by step, in
+    buffers preallocated for the whole sequence that are kept for the
+    backpropagation through time.
+
+    The dropout of the inputs and the hidden states of each layer is applied
+    in the function, and is enabled only in the training mode. The masks are
+    kept for backward as ``chainer.config.dropout_mask`` specifies, i.e. the
+    ``'packed'`` and ``'seed'`` modes of :func:`~chainer.functions.dropout`
+    keep the bits or the seeds of the masks of each time step instead of
+    dense arrays.
+
+    """
+
+    def __init__(self, n_layers, dropout_ratio):
+        self.n_layers = n_layers
+        self.dropout_ratio = dropout_ratio
+
+    def forward(self, inputs):
+        (hx, cx), inputs = _split(inputs, 2)
+        ws, inputs = _split(inputs, self.n_layers * 8)
+        bs, inputs = _split(inputs, self.n_layers * 8)
+        x_list = inputs
+
+        n_units = hx.shape[2]
+        batches = [len(x) for x in x_list]
+        offsets = numpy.concatenate(([0], numpy.cumsum(batches))).tolist()
+        n_rows = offsets[-1]
+        dtype = hx.dtype
+        use_dropout = configuration.config.train and self.dropout_ratio > 0
+        mask_mode = configuration.config.dropout_mask
+
+        hy = hx.copy()
+        cy = cx.copy()
+        x = numpy.concatenate(x_list, axis=0)
+        tmp = numpy.empty((batches[0], 4 * n_units), dtype=dtype)
+        self.layers = []
+        for layer in six.moves.range(self.n_layers):
+            w = ws[layer * 8:layer * 8 + 8]
+            b = bs[layer * 8:layer * 8 + 8]
+            # Gates are laid out in the order of a, i, f and o
+            w_x = numpy.concatenate((w[2], w[0], w[1], w[3]))
+            w_h = numpy.concatenate((w[6], w[4], w[5], w[7]))
+            bias = numpy.concatenate(
+                (b[2] + b[6], b[0] + b[4], b[1] + b[5], b[3] + b[7]))
+
+            if use_dropout:
+                x_drop = dropout.Dropout(self.dropout_ratio, mask_mode)
+                h_drops = [dropout.Dropout(self.dropout_ratio, mask_mode)
+                           for _ in batches]
+                if mask_mode == 'dense':
+                    # The dense masks of all the time steps are drawn at once
+                    x_drop.mask = _dropout_mask(
+                        x.shape, self.dropout_ratio, dtype)
+                    h_mask = _dropout_mask(
+                        (n_rows, n_units), self.dropout_ratio, dtype)
+                    for t, h_drop in enumerate(h_drops):
+                        h_drop.mask = h_mask[offsets[t]:offsets[t + 1]]
+                x = x_drop.forward((x,))[0]
+            else:
+                x_drop = h_drops = None
+
+            gates = numpy.dot(x, w_x.T)
+            gates += bias
+            h_prev = numpy.empty((n_rows, n_units), dtype=dtype)
+            c = numpy.empty((n_rows, n_units), dtype=dtype)
+            tanh_c = numpy.empty((n_rows, n_units), dtype=dtype)
+            y = numpy.empty((n_rows, n_units), dtype=dtype)
+
+            for t, batch in enumerate(batches):
+                start, stop = offsets[t], offsets[t + 1]
+                if t == 0:
+                    h_prev[start:stop] = hx[layer, :batch]
+                    c_prev = cx[layer, :batch]
+                else:
+                    prev = offsets[t - 1]
+                    h_prev[start:stop] = y[prev:prev + batch]
+                    c_prev = c[prev:prev + batch]
+                if use_dropout:
+                    h_prev[start:stop] = h_drops[t].forward(
+                        (h_prev[start:stop],))[0]
+                g = gates[start:stop]
+                g += numpy.dot(h_prev[start:stop], w_h.T, out=tmp[:batch])
+
+                a = g[:, :n_units]
+                i = g[:, n_units:2 * n_units]
+                f = g[:, 2 * n_units:3 * n_units]
+                o = g[:, 3 * n_units:]
+                numpy.tanh(a, out=a)
+                _sigmoid_inplace(g[:, n_units:])
+                c_t = c[start:stop]
+                numpy.multiply(a, i, out=c_t)
+                c_t += f * c_prev
+                numpy.tanh(c_t, out=tanh_c[start:stop])
+                numpy.multiply(o, tanh_c[start:stop], out=y[start:stop])
+
+                # Sequences that end at this step
+                rest = batches[t + 1] if t + 1 < len(batches) else 0
+                hy[layer, rest:batch] = y[start + rest:stop]
+                cy[layer, rest:batch] = c_t[rest:]
+
+            self.layers.append((x, x_drop, h_prev, h_drops, gates, c, tanh_c,
+                                w_x, w_h))
+            x = y
+
+        self.offsets = offsets
+        sections = offsets[1:-1]
+        return tuple([hy, cy] + numpy.split(y, sections))
+
+    def backward(self, inputs, grads):
+        (hx, cx), inputs = _split(inputs, 2)
+        x_list = inputs[self.n_layers * 16:]
+
+        offsets = self.offsets
+        batches = [len(x) for x in x_list]
+        n_units = hx.shape[2]
+        dtype = hx.dtype
+
+        dhy, dcy = grads[:2]
+        dy_list = [numpy.zeros((batch, n_units), dtype=dtype) if dy is None
+                   else dy for batch, dy in zip(batches, grads[2:])]
+        dy = numpy.concatenate(dy_list, axis=0)
+        dhx = numpy.zeros(hx.shape, dtype) if dhy is None else dhy.copy()
+        dcx = numpy.zeros(cx.shape, dtype) if dcy is None else dcy.copy()
+
+        dws = [None] * (self.n_layers * 8)
+        dbs = [None] * (self.n_layers * 8)
+        for layer in reversed(six.moves.range(self.n_layers)):
+            (x, x_drop, h_prev, h_drops, gates, c, tanh_c,
+             w_x, w_h) = self.layers[layer]
+            dh = dhx[layer]
+            dc = dcx[layer]
+            dgates = numpy.empty_like(gates)
+
+            for t in reversed(six.moves.range(len(batches))):
+                batch = batches[t]
+                start, stop = offsets[t], offsets[t + 1]
+                if t == 0:
+                    c_prev = cx[layer, :batch]
+                else:
+                    prev = offsets[t - 1]
+                    c_prev = c[prev:prev + batch]
+                g = gates[start:stop]
+                a = g[:, :n_units]
+                i = g[:, n_units:2 * n_units]
+                f = g[:, 2 * n_units:3 * n_units]
+                o = g[:, 3 * n_units:]
+                tc = tanh_c[start:stop]
+
+                dh_t = dh[:batch] + dy[start:stop]
+                dc_t = dc[:batch] + dh_t * o * (1 - tc * tc)
+
+                dg = dgates[start:stop]
+                numpy.multiply(dc_t * i, 1 - a * a, out=dg[:, :n_units])
+                numpy.multiply(dc_t * a, i * (1 - i),
+                               out=dg[:, n_units:2 * n_units])
+                numpy.multiply(dc_t * c_prev, f * (1 - f),
+                               out=dg[:, 2 * n_units:3 * n_units])
+                numpy.multiply(dh_t * tc, o * (1 - o),
+                               out=dg[:, 3 * n_units:])
+
+                numpy.dot(dg, w_h, out=dh[:batch])
+                if h_drops is not None:
+                    dh[:batch] = h_drops[t].backward(None, (dh[:batch],))[0]
+                numpy.multiply(dc_t, f, out=dc[:batch])
+
+            # Gradients of the parameters for all the time steps at once
+            dw_x = numpy.dot(dgates.T, x)
+            dw_h = numpy.dot(dgates.T, h_prev)
+            db = dgates.sum(axis=0)
+            dw_xs = numpy.split(dw_x, 4)
+            dw_hs = numpy.split(dw_h, 4)
+            d_bs = numpy.split(db, 4)
+            base = layer * 8
+            for j, k in enumerate((2, 0, 1, 3)):
+                dws[base + k] = dw_xs[j]
+                dws[base + k + 4] = dw_hs[j]
+                dbs[base + k] = d_bs[j]
+                dbs[base + k + 4] = d_bs[j].copy()
+
+            dy = numpy.dot(dgates, w_x)
+            if x_drop is not None:
+                dy = x_drop.backward(None, (dy,))[0]
+
+        dx_list = numpy.split(dy, offsets[1:-1])
+        return tuple([dhx, dcx] + dws + dbs + dx_list)
+
+
 def _stack_weight(ws):
     # TODO(unno): Input of the current LSTM implementaiton is shuffled
     w = stack.stack(ws, axis=1)
@@ -439,6 +648,11 @@ def n_step_lstm(
               mini-batch size for time ``t``, and ``N`` is size of hidden
               units. Note that ``B_t`` is the same value as ``xs[t]``.
 
+    On CPU, the whole computation is done by one
+    :class:`~chainer.functions.connection.n_step_lstm.NStepLSTMCPU` function
+    application, which computes the input projections of all the time steps
+    of each layer at once.
+
     .. seealso::
 
        :func:`chainer.functions.lstm`
@@ -462,6 +676,15 @@ def n_step_lstm(
         ys = ret[2:]
         return hy, cy, ys
 
+    elif xp is numpy:
+        inputs = tuple(itertools.chain(
+            (hx, cx),
+            itertools.chain.from_iterable(ws),
+            itertools.chain.from_iterable(bs),
+            xs))
+        ret = NStepLSTMCPU(n_layers, dropout_ratio)(*inputs)
+        return ret[0], ret[1], ret[2:]
+
     else:
         hx = split_axis.split_axis(hx, n_layers, axis=0, force_tuple=True)
         hx = [reshape.reshape(h, h.shape[1:]) for h in hx]
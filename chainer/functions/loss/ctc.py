@@ -56,6 +56,11 @@ class ConnectionistTemporalClassification(function.Function):
     2. This class applies the softmax function to inputs. The Backward
     values of CTC loss is often overflows. This is avoided by computing
     backward values before the activation function is applied.
+
+    On CPU, the forward and backward variables of all the time steps are
+    computed in arrays of shape ``(T, B, 2L + 1)`` allocated once, where the
+    transitions between the states of the label paths are done by adding
+    shifted arrays. Sequences of different lengths are processed together.
     """
 
     def __init__(self, blank_symbol):
@@ -87,16 +92,21 @@ class ConnectionistTemporalClassification(function.Function):
             res = create_recurrence_relation(x, self.zero_padding)
         return res.astype(numpy.float32)
 
-    def recurrence_relation(self, path_length, max_length, dtype, xp):
+    def recurrence_relation(self, path, path_length, max_length, dtype, xp):
         """Transition in forword and backword algorithms is represented as matrix.
 
+        The blank between two identical labels of ``path`` cannot be skipped.
+
         See also
         https://blog.wtf.sg/2014/10/06/connectionist-temporal-classification-ctc-with-theano/
         """
+        skip = xp.ones(path.shape, dtype=dtype)
+        skip[:, 2:] = path[:, 2:] != path[:, :-2]
         rr = (xp.eye(max_length, dtype=dtype) +
               xp.eye(max_length, k=1, dtype=dtype) +
               xp.eye(max_length, k=2, dtype=dtype) *
-              (xp.arange(max_length, dtype=dtype) % dtype(2)))
+              (xp.arange(max_length, dtype=dtype) % dtype(2)) *
+              skip[:, None, :])
         return self.log_matrix(
             rr * (path_length[:, None] > xp.arange(max_length))[..., None], xp)
 
@@ -155,7 +165,7 @@ class ConnectionistTemporalClassification(function.Function):
         # prob[i] := forward[i] + backward[-i-1]
         index = offset + path
         frr = self.recurrence_relation(
-            self.path_length, path.shape[1], numpy.float32, xp)
+            path, self.path_length, path.shape[1], numpy.float32, xp)
         prob = xp.empty(
             (len(yseq),) + index.shape, dtype=forward_prob.dtype)
         # forward computation.
@@ -164,12 +174,13 @@ class ConnectionistTemporalClassification(function.Function):
             forward_prob = xp.take(y, index) + _log_dot(
                 forward_prob[:, None, :], frr, xp)
             prob[i] = forward_prob
-        r_index = offset + _move_label_to_back(path, self.path_length, xp)
+        r_path = _move_label_to_back(path, self.path_length, xp)
+        r_index = offset + r_path
 
         # rotate yseq with path_length
         yseq_inv = _move_inputs(yseq, self.input_length, xp)[::-1]
         brr = self.recurrence_relation(
-            self.path_length, path.shape[1], numpy.float32, xp)
+            r_path, self.path_length, path.shape[1], numpy.float32, xp)
 
         # move to back.
         prob = _move_inputs(prob, self.input_length, xp)
@@ -189,7 +200,121 @@ class ConnectionistTemporalClassification(function.Function):
         # move to front.
         return _move_inputs(prob, -self.input_length, xp)
 
-    def forward(self, inputs):
+    def forward_cpu(self, inputs):
+        input_length, label_length, t = inputs[:3]
+        xs = inputs[3:]
+
+        if chainer.is_debug():
+            # Batch size check.
+            assert len(xs[0]) == len(t)
+            assert len(xs[0]) == len(input_length)
+            assert len(xs[0]) == len(label_length)
+
+            # Length check.
+            assert len(xs) >= numpy.max(input_length)
+            assert len(t[0]) >= numpy.max(label_length)
+
+        neg = numpy.float32(self.zero_padding)
+        n_steps = len(xs)
+        batch_size, n_units = xs[0].shape
+        path = _label_to_path(t, self.blank_symbol, numpy)
+        path_length = 2 * label_length + 1
+        n_states = path.shape[1]
+        batch_index = numpy.arange(batch_size)
+        # Padded labels may be out of range
+        path[numpy.arange(n_states) >= path_length[:, None]] = \
+            self.blank_symbol
+
+        # Log-softmax of the inputs
+        log_y = numpy.stack(xs)
+        log_y -= log_y.max(axis=2, keepdims=True)
+        self.y = numpy.exp(log_y)
+        log_y -= numpy.log(self.y.sum(axis=2, keepdims=True))
+        numpy.exp(log_y, out=self.y)
+
+        # Log-probabilities of the symbols of the paths at each time
+        log_p = numpy.take(
+            log_y.reshape(n_steps, batch_size * n_units),
+            batch_index[:, None] * n_units + path, axis=1)
+
+        # Penalty of the transitions that skip a blank. They are allowed
+        # only between different labels.
+        skip = numpy.where(path[:, 2:] != path[:, :-2],
+                           numpy.float32(0), neg)
+
+        alpha = numpy.empty_like(log_p)
+        beta = numpy.empty_like(log_p)
+        tmp = numpy.empty((batch_size, max(n_states - 2, 0)),
+                          dtype=numpy.float32)
+
+        # Forward variables. The states beyond the path of each sequence are
+        # never used since the transitions only go forward.
+        alpha[0] = neg
+        alpha[0, :, :2] = log_p[0, :, :2]
+        for i in six.moves.range(1, n_steps):
+            prev = alpha[i - 1]
+            cur = alpha[i]
+            cur[...] = prev
+            numpy.logaddexp(cur[:, 1:], prev[:, :-1], out=cur[:, 1:])
+            numpy.add(prev[:, :-2], skip, out=tmp)
+            numpy.logaddexp(cur[:, 2:], tmp, out=cur[:, 2:])
+            cur += log_p[i]
+
+        # Backward variables. Each sequence starts from its last time step
+        # and the last two states of its path.
+        end_states = numpy.arange(n_states) >= (path_length - 2)[:, None]
+        end_states &= numpy.arange(n_states) < path_length[:, None]
+        last_step = input_length - 1
+        beta[-1] = neg
+        for i in six.moves.range(n_steps - 1, -1, -1):
+            cur = beta[i]
+            if i < n_steps - 1:
+                nxt = beta[i + 1]
+                cur[...] = nxt
+                numpy.logaddexp(cur[:, :-1], nxt[:, 1:], out=cur[:, :-1])
+                numpy.add(nxt[:, 2:], skip, out=tmp)
+                numpy.logaddexp(cur[:, :-2], tmp, out=cur[:, :-2])
+                cur += log_p[i]
+            ends = last_step == i
+            if ends.any():
+                numpy.copyto(cur, numpy.where(end_states, log_p[i], neg),
+                             where=ends[:, None])
+
+        last_alpha = alpha[last_step, batch_index]
+        total = last_alpha[batch_index, path_length - 1]
+        total = numpy.logaddexp(total, numpy.where(
+            path_length > 1,
+            last_alpha[batch_index, numpy.maximum(path_length - 2, 0)], neg))
+
+        # Occupation probability of each state, which is used in backward
+        alpha += beta
+        alpha -= log_p
+        alpha -= total[:, None]
+        self.occupation = numpy.exp(alpha, out=alpha)
+        self.path = path
+
+        loss = utils.force_array(-total.sum() / batch_size)
+        return loss,
+
+    def backward_cpu(self, inputs, grad_output):
+        input_length = inputs[0]
+        n_steps, batch_size, n_units = self.y.shape
+        occupation = self.occupation
+
+        # Sum up the occupation probabilities of the states of each symbol
+        gx = self.y
+        gx[:, :, self.blank_symbol] -= occupation[:, :, 0::2].sum(axis=2)
+        index = (numpy.arange(n_steps * batch_size).reshape(
+            n_steps, batch_size, 1) * n_units + self.path[:, 1::2]).ravel()
+        gx -= numpy.bincount(
+            index, weights=occupation[:, :, 1::2].ravel(),
+            minlength=gx.size).reshape(gx.shape).astype(numpy.float32)
+
+        gx *= grad_output[0] / batch_size
+        gx *= (numpy.arange(n_steps)[:, None] < input_length)[..., None]
+        return (None, None, None) + tuple(gx)
+
+    def forward_gpu(self, inputs):
         xp = cuda.get_array_module(inputs[0])
         self.input_length = inputs[0]
         label_length = inputs[1]
@@ -220,7 +345,7 @@ class ConnectionistTemporalClassification(function.Function):
         loss /= -batch_size
         return loss,
 
-    def backward(self, inputs, grad_output):
+    def backward_gpu(self, inputs, grad_output):
         xp = cuda.get_array_module(inputs[0])
         batch_size = len(inputs[2])
 
@@ -1,8 +1,8 @@
 import numpy
-import six
 
 from chainer import cuda
 from chainer import function
+from chainer.utils import array
 from chainer.utils import type_check
 
 
@@ -43,13 +43,15 @@ class NegativeSamplingFunction(function.Function):
         self.ignore_mask = (t != self.ignore_label)
         self._make_samples(t)
 
-        loss = numpy.float32(0.0)
-        for ix, k in six.moves.zip(x[self.ignore_mask],
-                                   self.samples[self.ignore_mask]):
-            w = W[k]
-            f = w.dot(ix)
-            f[0] *= -1  # positive sample
-            loss += numpy.sum(numpy.logaddexp(f, 0))
+        # Scores of all samples of all valid rows: wx[i, j] = W[k[i, j]].x[i]
+        x = x[self.ignore_mask]
+        w = W[self.samples[self.ignore_mask]]
+        wx = numpy.einsum('ij,ikj->ik', x, w)
+        self.wx = wx
+
+        f = wx.copy()
+        f[:, 0] *= -1  # positive sample
+        loss = numpy.sum(numpy.logaddexp(f, 0), dtype=numpy.float32)
         return numpy.array(loss, numpy.float32),
 
     def forward_gpu(self, inputs):
@@ -100,21 +102,20 @@ class NegativeSamplingFunction(function.Function):
         x, t, W = inputs
         gloss, = grads
 
-        gx = numpy.zeros_like(x)
+        x = x[self.ignore_mask]
+        k = self.samples[self.ignore_mask]
+
+        # g == -y * gloss / (1 + exp(yf))
+        f = self.wx.copy()
+        f[:, 0] *= -1
+        g = gloss / (1 + numpy.exp(-f))
+        g[:, 0] *= -1
+        g = g.astype(W.dtype, copy=False)
+
+        gx = numpy.zeros_like(inputs[0])
+        gx[self.ignore_mask] = numpy.einsum('ik,ikj->ij', g, W[k])
         gW = numpy.zeros_like(W)
-        for i, (ix, k) in enumerate(six.moves.zip(
-                x[self.ignore_mask], self.samples[self.ignore_mask])):
-            w = W[k]
-            f = w.dot(ix)
-
-            # g == -y * gloss / (1 + exp(yf))
-            f[0] *= -1
-            g = gloss / (1 + numpy.exp(-f))
-            g[0] *= -1
-
-            gx[i] = g.dot(w)
-            for ik, ig in six.moves.zip(k, g):
-                gW[ik] += ig * ix
+        array.scatter_add_rows(gW, k, g[:, :, None] * x[:, None, :])
         return gx, None, gW
 
     def backward_gpu(self, inputs, grads):
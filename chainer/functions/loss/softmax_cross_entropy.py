@@ -2,6 +2,7 @@ import numpy
 import six
 
 import chainer
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
 from chainer.functions.activation import log_softmax
@@ -63,7 +64,7 @@ class SoftmaxCrossEntropy(function.Function):
         # Improve me
         # It is disabled by default
         if mkld.enable_softmax_cross_entropyF(inputs):
-            y_out = numpy.empty(x.shape, dtype=numpy.float32)
+            y_out = cpu_memory.empty(x.shape, dtype=numpy.float32)
             mkldnn_sce_fwd = mkldnn.SoftmaxCrossEntropy_F32_softmax_cross_entropy_create_forward(x.shape)
             mkldnn_sce_fwd.forward(x.ravel(), y_out.ravel(), x.shape)
             log_y = y_out
@@ -1,4 +1,5 @@
 import numpy
+import six
 
 from chainer import configuration
 from chainer import cuda
@@ -6,34 +7,94 @@ from chainer import function
 from chainer.utils import type_check
 
 
+_mask_modes = ('dense', 'packed', 'seed')
+
+# Number of elements drawn at once by the lean modes (a multiple of 8)
+_chunk_size = 1 << 20
+
+
 class Dropout(function.Function):
 
-    """Dropout regularization."""
+    """Dropout regularization.
+
+    See :func:`dropout` for the mask modes.
+
+    """
 
-    def __init__(self, dropout_ratio):
+    def __init__(self, dropout_ratio, mask_mode='dense'):
+        if mask_mode not in _mask_modes:
+            raise ValueError('mask_mode must be one of {}: {}'.format(
+                _mask_modes, mask_mode))
         self.dropout_ratio = dropout_ratio
+        self.mask_mode = mask_mode
 
     def check_type_forward(self, in_types):
         type_check.expect(in_types.size() == 1)
         type_check.expect(in_types[0].dtype.kind == 'f')
 
     def forward(self, x):
-        if not hasattr(self, 'mask'):
-            scale = x[0].dtype.type(1. / (1 - self.dropout_ratio))
-            xp = cuda.get_array_module(*x)
-            if xp == numpy:
-                flag = xp.random.rand(*x[0].shape) >= self.dropout_ratio
-            else:
-                flag = (xp.random.rand(*x[0].shape, dtype=numpy.float32) >=
-                        self.dropout_ratio)
-            self.mask = scale * flag
-        return x[0] * self.mask,
+        xp = cuda.get_array_module(*x)
+        if self.mask_mode == 'dense' or xp is not numpy:
+            if not hasattr(self, 'mask'):
+                scale = x[0].dtype.type(1. / (1 - self.dropout_ratio))
+                if xp == numpy:
+                    flag = xp.random.rand(*x[0].shape) >= self.dropout_ratio
+                else:
+                    flag = (xp.random.rand(*x[0].shape, dtype=numpy.float32)
+                            >= self.dropout_ratio)
+                self.mask = scale * flag
+            return x[0] * self.mask,
+
+        if not hasattr(self, 'seed'):
+            self.seed = numpy.random.randint(2 ** 31)
+            if self.mask_mode == 'packed':
+                packed = numpy.empty((x[0].size + 7) // 8, numpy.uint8)
+                for start, stop, flag in self._generate_mask(x[0].size):
+                    packed[start // 8:(stop + 7) // 8] = numpy.packbits(flag)
+                self.packed_mask = packed
+        return self._apply_mask(x[0]),
 
     def backward(self, x, gy):
-        return gy[0] * self.mask,
+        if hasattr(self, 'mask'):
+            return gy[0] * self.mask,
+        return self._apply_mask(gy[0]),
+
+    def _generate_mask(self, size):
+        # Comparing uniform 32-bit integers with the ratio scaled to 2 ** 32
+        # is equivalent to comparing float32 uniforms with the ratio, while it
+        # consumes half the random bits of the float64 ones.
+        rs = numpy.random.RandomState(self.seed)
+        threshold = min(int(self.dropout_ratio * 2 ** 32), 2 ** 32 - 1)
+        for start in six.moves.range(0, size, _chunk_size):
+            stop = min(start + _chunk_size, size)
+            r = numpy.frombuffer(rs.bytes(4 * (stop - start)), numpy.uint32)
+            # uint8 is multiplied much faster than bool
+            yield start, stop, (r >= threshold).view(numpy.uint8)
+
+    def _unpack_mask(self, size):
+        for start in six.moves.range(0, size, _chunk_size):
+            stop = min(start + _chunk_size, size)
+            bits = numpy.unpackbits(
+                self.packed_mask[start // 8:(stop + 7) // 8])
+            yield start, stop, bits[:stop - start]
+
+    def _apply_mask(self, a):
+        scale = a.dtype.type(1. / (1 - self.dropout_ratio))
+        if self.mask_mode == 'packed':
+            mask = self._unpack_mask(a.size)
+        else:
+            mask = self._generate_mask(a.size)
+        y = numpy.empty(a.shape, a.dtype)
+        a = a.ravel()
+        y_flat = y.reshape(-1)
+        for start, stop, flag in mask:
+            y_chunk = y_flat[start:stop]
+            numpy.multiply(a[start:stop], flag, out=y_chunk)
+            y_chunk *= scale
+        return y
 
 
-def dropout(x, ratio=.5):
+def dropout(x, ratio=.5, mask_mode=None):
     """Drops elements of input variable randomly.
 
     This function drops input elements randomly with probability ``ratio`` and
@@ -43,6 +104,14 @@ def dropout(x, ratio=.5):
     Args:
         x (~chainer.Variable): Input variable.
         ratio (float): Dropout ratio.
+        mask_mode (str): How the mask is kept for backward. ``'dense'``
+            keeps the mask as an array of the input dtype. ``'packed'`` keeps
+            it as bits, i.e. 1/32 of the memory of a float32 mask, and
+            ``'seed'`` keeps only the seed of the random generator to
+            regenerate the mask in backward. The latter two modes draw the
+            mask from 32-bit random integers chunk by chunk, and only apply to
+            CPU arrays; GPU arrays always use the dense mask. If it is
+            ``None``, ``chainer.config.dropout_mask`` is used.
 
     Returns:
         ~chainer.Variable: Output variable.
@@ -52,5 +121,7 @@ def dropout(x, ratio=.5):
 
     """
     if configuration.config.train:
-        return Dropout(ratio)(x)
+        if mask_mode is None:
+            mask_mode = configuration.config.dropout_mask
+        return Dropout(ratio, mask_mode)(x)
     return x
@@ -1,6 +1,7 @@
 import numpy
 
 from chainer import configuration
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
 from chainer.utils import type_check
@@ -164,7 +165,7 @@ class BatchNormalizationFunction(function.Function):
             if x.ndim == 2:
                 self.expand_dim = True
                 x = x[:, :, None, None]
-            y = numpy.empty(x.shape, dtype=x[0].dtype)
+            y = cpu_memory.empty(x.shape, dtype=x[0].dtype)
             if configuration.config.train:
                 if self.mean_cache is None:
                     # Output cache to speed up backward pass.
@@ -188,6 +189,7 @@ class BatchNormalizationFunction(function.Function):
                 mkldnn.BatchNormalization_F32.do_forward(
                     x, y, weights, self.fixed_mean, self.fixed_var, self.eps,
                     False, True, True)
+            mkld.track_layout(y)
 
             if self.expand_dim:
                 assert y.ndim == 4
@@ -293,9 +295,9 @@ class BatchNormalizationFunction(function.Function):
                 assert gy.ndim == 2
                 gy = gy[:, :, None, None]
 
-            gW = numpy.empty(shape=(self.weights_cache.shape),
-                             dtype=self.weights_cache.dtype)
-            gx = numpy.empty(shape=(x.shape), dtype=x.dtype)
+            gW = cpu_memory.empty(shape=(self.weights_cache.shape),
+                                  dtype=self.weights_cache.dtype)
+            gx = cpu_memory.empty(shape=(x.shape), dtype=x.dtype)
             mkldnn.BatchNormalization_F32.do_backward(
                 x, self.weights_cache, self.mean_cache, self.var_cache, gy, gx, gW,
                 self.eps, True, True, False)
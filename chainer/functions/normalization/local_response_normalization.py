@@ -1,6 +1,7 @@
 import numpy
 import six
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import function
 from chainer.utils import type_check
@@ -58,13 +59,14 @@ class LocalResponseNormalization(function.Function):
 
     def forward_cpu(self, x):
         if mkld.enable_lrnF((x,)):
-            self.y = numpy.empty(x[0].shape, dtype=x[0].dtype)
+            self.y = cpu_memory.empty(x[0].shape, dtype=x[0].dtype)
             in_alpha = self.n*self.alpha
             ws_size = mkldnn.LocalResponseNormalization_F32.get_workspace_size(
                 x[0], self.y, self.n, self.k, in_alpha, self.beta)
-            self.ws = numpy.empty(ws_size, dtype=x[0].dtype)
+            self.ws = cpu_memory.empty(ws_size, dtype=x[0].dtype)
             mkldnn.LocalResponseNormalization_F32.do_forward(
                 x[0], self.y, self.ws, self.n, self.k, in_alpha, self.beta)
+            mkld.track_layout(self.y)
             return self.y,
         else:
             half_n = self.n // 2
@@ -80,7 +82,7 @@ class LocalResponseNormalization(function.Function):
 
     def backward_cpu(self, x, gy):
         if mkld.enable_lrnF((x, gy)):
-            gx = numpy.empty(x[0].shape, dtype=x[0].dtype)
+            gx = cpu_memory.empty(x[0].shape, dtype=x[0].dtype)
             in_alpha = self.n*self.alpha
             mkldnn.LocalResponseNormalization_F32.do_backward(
                 x[0], gy[0], gx, self.ws, self.n, self.k, in_alpha, self.beta)
@@ -1,5 +1,6 @@
 import numpy
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer.functions.pooling import pooling_2d
 from chainer.utils import conv
@@ -29,13 +30,14 @@ class AveragePooling2D(pooling_2d.Pooling2D):
             # here we calculate asymmetry padding
             self.pd = self.sy*(y_h-1)+self.kh - h - self.ph
             self.pr = self.sx*(y_w-1)+self.kw - w - self.pw
-            y = numpy.empty((n, c, y_h, y_w), dtype=x[0].dtype)
+            y = cpu_memory.empty((n, c, y_h, y_w), dtype=x[0].dtype)
 
             mkldnn.AvgPooling_F32.do_forward(
                                     x[0], y,
                                     self.sy, self.sx,
                                     self.ph, self.pd, self.pw, self.pr,
                                     self.kh, self.kw)
+            mkld.track_layout(y)
             return y,
         else:
             col = conv.im2col_cpu(x[0], self.kh, self.kw, self.sy, self.sx, self.ph, self.pw)
@@ -81,7 +83,7 @@ class AveragePooling2D(pooling_2d.Pooling2D):
     def backward_cpu(self, x, gy):
         if mkld.enable_avg_poolingF((x, gy)):
             n, c, h, w = x[0].shape
-            gx = numpy.empty((n, c, h, w), dtype=x[0].dtype)
+            gx = cpu_memory.empty((n, c, h, w), dtype=x[0].dtype)
 
             mkldnn.AvgPooling_F32.do_backward(
                                     gy[0], x[0], gx,
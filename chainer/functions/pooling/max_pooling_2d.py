@@ -1,5 +1,6 @@
 import numpy
 
+from chainer import cpu_memory
 from chainer import cuda
 from chainer.functions.pooling import pooling_2d
 from chainer.utils import conv
@@ -29,14 +30,16 @@ class MaxPooling2D(pooling_2d.Pooling2D):
                 w, self.kw, self.sx, self.pw, self.cover_all)
             self.pd = self.sy*(y_h-1)+self.kh - h - self.ph
             self.pr = self.sx*(y_w-1)+self.kw - w - self.pw
-            y = numpy.empty((n, c, y_h, y_w), dtype=x[0].dtype)
-            self.indexes = numpy.empty((n, c, y_h, y_w), dtype=numpy.int32)
+            y = cpu_memory.empty((n, c, y_h, y_w), dtype=x[0].dtype)
+            self.indexes = cpu_memory.empty(
+                (n, c, y_h, y_w), dtype=numpy.int32)
 
             mkldnn.MaxPooling_F32.do_forward(
                                     x[0], y, self.indexes,
                                     self.sy, self.sx,
                                     self.ph, self.pd, self.pw, self.pr,
                                     self.kh, self.kw)
+            mkld.track_layout(y)
             return y,
         else:
             col = conv.im2col_cpu(
@@ -105,7 +108,7 @@ class MaxPooling2D(pooling_2d.Pooling2D):
     def backward_cpu(self, x, gy):
         if mkld.enable_max_poolingF((x, gy)):
             n, c, h, w = x[0].shape
-            gx = numpy.empty((n, c, h, w), dtype=x[0].dtype)
+            gx = cpu_memory.empty((n, c, h, w), dtype=x[0].dtype)
 
             mkldnn.MaxPooling_F32.do_backward(
                                     gy[0], x[0], gx, self.indexes,
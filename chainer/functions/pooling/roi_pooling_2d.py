@@ -36,14 +36,32 @@ from chainer import function
 from chainer.utils import type_check
 
 
-def _roi_pooling_slice(size, stride, max_size, roi_offset):
-    start = int(numpy.floor(size * stride))
-    end = int(numpy.ceil((size + 1) * stride))
+# Maximum number of elements gathered at once by the CPU forward computation
+_cpu_chunk_size = 1 << 24
 
-    start = min(max(start + roi_offset, 0), max_size)
-    end = min(max(end + roi_offset, 0), max_size)
 
-    return slice(start, end), end - start
+def _round(x):
+    # rounds half away from zero, like round() in CUDA
+    return numpy.sign(x) * numpy.floor(numpy.abs(x) + 0.5)
+
+
+def _roi_bins(size, start, n_bins, max_size):
+    # Bin boundaries of all RoIs along one axis, computed in float32 as the
+    # GPU kernels do.
+    bin_size = size.astype(numpy.float32) / numpy.float32(n_bins)
+    p = numpy.arange(n_bins, dtype=numpy.float32)
+    bin_start = numpy.floor(p * bin_size[:, None]).astype(numpy.int32)
+    bin_end = numpy.ceil((p + 1) * bin_size[:, None]).astype(numpy.int32)
+    bin_start = numpy.clip(bin_start + start[:, None], 0, max_size)
+    bin_end = numpy.clip(bin_end + start[:, None], 0, max_size)
+    return bin_start, bin_end
+
+
+def _roi_coordinates(bottom_rois, spatial_scale):
+    scale = numpy.float32(spatial_scale)
+    coords = _round(bottom_rois[:, 1:] * scale).astype(numpy.int32)
+    batch = bottom_rois[:, 0].astype(numpy.int32)
+    return (batch,) + tuple(coords.T)
 
 
 class ROIPooling2D(function.Function):
@@ -70,43 +88,69 @@ class ROIPooling2D(function.Function):
         bottom_data, bottom_rois = inputs
         channels, height, width = bottom_data.shape[1:]
         n_rois = bottom_rois.shape[0]
-        top_data = numpy.empty((n_rois, channels, self.outh, self.outw),
+        outh, outw = self.outh, self.outw
+        top_data = numpy.empty((n_rois, channels, outh, outw),
                                dtype=numpy.float32)
         self.argmax_data = numpy.empty(top_data.shape, numpy.int32)
-
-        for i_roi in six.moves.range(n_rois):
-            idx, xmin, ymin, xmax, ymax = bottom_rois[i_roi]
-            xmin = int(round(xmin * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            ymin = int(round(ymin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            roi_width = max(xmax - xmin + 1, 1)
-            roi_height = max(ymax - ymin + 1, 1)
-            strideh = 1. * roi_height / self.outh
-            stridew = 1. * roi_width / self.outw
-
-            for outh in six.moves.range(self.outh):
-                sliceh, lenh = _roi_pooling_slice(
-                    outh, strideh, height, ymin)
-                if sliceh.stop <= sliceh.start:
-                    continue
-                for outw in six.moves.range(self.outw):
-                    slicew, lenw = _roi_pooling_slice(
-                        outw, stridew, width, xmin)
-                    if slicew.stop <= slicew.start:
-                        continue
-                    roi_data = bottom_data[int(idx), :, sliceh, slicew]\
-                        .reshape(channels, -1)
-                    top_data[i_roi, :, outh, outw] =\
-                        numpy.max(roi_data, axis=1)
-
-                    # get the max idx respect to feature_maps coordinates
-                    max_idx_slice = numpy.unravel_index(
-                        numpy.argmax(roi_data, axis=1), (lenh, lenw))
-                    max_idx_slice_h = max_idx_slice[0] + sliceh.start
-                    max_idx_slice_w = max_idx_slice[1] + slicew.start
-                    max_idx_slice = max_idx_slice_h * width + max_idx_slice_w
-                    self.argmax_data[i_roi, :, outh, outw] = max_idx_slice
+        if n_rois == 0:
+            return top_data,
+
+        batch, xmin, ymin, xmax, ymax = _roi_coordinates(
+            bottom_rois, self.spatial_scale)
+        # Force malformed RoIs to be 1x1
+        roi_height = numpy.maximum(ymax - ymin + 1, 1)
+        roi_width = numpy.maximum(xmax - xmin + 1, 1)
+        hstart, hend = _roi_bins(roi_height, ymin, outh, height)
+        wstart, wend = _roi_bins(roi_width, xmin, outw, width)
+
+        empty = (hend <= hstart)[:, :, None] | (wend <= wstart)[:, None, :]
+        kh = numpy.maximum((hend - hstart).max(axis=1), 1)
+        kw = numpy.maximum((wend - wstart).max(axis=1), 1)
+
+        # Gather contiguous channel vectors
+        bottom_data = numpy.ascontiguousarray(
+            bottom_data.transpose(0, 2, 3, 1))
+        # RoIs with the same largest bin size are pooled together. Smaller
+        # bins are padded by repeating their last row and column, which
+        # changes neither the maximum nor its first position.
+        group = kh * (int(kw.max()) + 1) + kw
+        order = numpy.argsort(group, kind='mergesort')
+        bounds = numpy.flatnonzero(numpy.diff(group[order])) + 1
+        for rois in numpy.split(order, bounds):
+            gh, gw = int(kh[rois[0]]), int(kw[rois[0]])
+            step = max(
+                _cpu_chunk_size // (channels * outh * outw * gh * gw), 1)
+            for i in six.moves.range(0, len(rois), step):
+                r = rois[i:i + step]
+                hidx = numpy.minimum(hstart[r, :, None] + numpy.arange(gh),
+                                     hend[r, :, None] - 1).clip(0, height - 1)
+                widx = numpy.minimum(wstart[r, :, None] + numpy.arange(gw),
+                                     wend[r, :, None] - 1).clip(0, width - 1)
+                x = bottom_data[batch[r, None, None, None, None],
+                                hidx[:, :, None, :, None],
+                                widx[:, None, :, None, :]]
+                x = x.reshape(len(r), outh, outw, gh * gw, channels)
+                y = x.max(axis=3)
+                # First position of the maximum, scanning backwards (faster
+                # than argmax over a non-contiguous axis)
+                k = numpy.empty(y.shape, dtype=numpy.int32)
+                for j in six.moves.range(gh * gw - 1, -1, -1):
+                    numpy.copyto(k, j, where=x[:, :, :, j] == y)
+
+                n = numpy.arange(len(r))[:, None, None, None]
+                h = hidx[n, numpy.arange(outh)[:, None, None], k // gw]
+                w = widx[n, numpy.arange(outw)[:, None], k % gw]
+                argmax = h * width + w
+                # The GPU kernel starts from -1E+37 and defines empty bins as
+                # zero
+                low = y <= numpy.float32(-1E+37)
+                y[low] = numpy.float32(-1E+37)
+                argmax[low] = -1
+                y[empty[r]] = 0
+                argmax[empty[r]] = -1
+
+                top_data[r] = y.transpose(0, 3, 1, 2)
+                self.argmax_data[r] = argmax.transpose(0, 3, 1, 2)
         return top_data,
 
     def forward_gpu(self, inputs):
@@ -186,43 +230,24 @@ class ROIPooling2D(function.Function):
     def backward_cpu(self, inputs, gy):
         bottom_data, bottom_rois = inputs
         channels, height, width = bottom_data.shape[1:]
-        n_rois = bottom_rois.shape[0]
-        bottom_delta = numpy.zeros_like(bottom_data, dtype=numpy.float32)
-
-        for i_roi in six.moves.range(n_rois):
-            idx, xmin, ymin, xmax, ymax = bottom_rois[i_roi]
-            idx = int(idx)
-            xmin = int(round(xmin * self.spatial_scale))
-            xmax = int(round(xmax * self.spatial_scale))
-            ymin = int(round(ymin * self.spatial_scale))
-            ymax = int(round(ymax * self.spatial_scale))
-            roi_width = max(xmax - xmin + 1, 1)
-            roi_height = max(ymax - ymin + 1, 1)
-
-            strideh = float(roi_height) / float(self.outh)
-            stridew = float(roi_width) / float(self.outw)
-
-            # iterate all the w, h (from feature map) that fall into this ROIs
-            for w in six.moves.range(xmin, xmax + 1):
-                for h in six.moves.range(ymin, ymax + 1):
-                    phstart = int(numpy.floor(float(h - ymin) / strideh))
-                    phend = int(numpy.ceil(float(h - ymin + 1) / strideh))
-                    pwstart = int(numpy.floor(float(w - xmin) / stridew))
-                    pwend = int(numpy.ceil(float(w - xmin + 1) / stridew))
-
-                    phstart = min(max(phstart, 0), self.outh)
-                    phend = min(max(phend, 0), self.outh)
-                    pwstart = min(max(pwstart, 0), self.outw)
-                    pwend = min(max(pwend, 0), self.outw)
-
-                    for ph in six.moves.range(phstart, phend):
-                        for pw in six.moves.range(pwstart, pwend):
-                            max_idx_tmp = self.argmax_data[i_roi, :, ph, pw]
-                            for c in six.moves.range(channels):
-                                if max_idx_tmp[c] == (h * width + w):
-                                    bottom_delta[idx, c, h, w] += \
-                                        gy[0][i_roi, c, ph, pw]
-        return bottom_delta, None
+        batch, xmin, ymin, xmax, ymax = [
+            c[:, None, None, None] for c in _roi_coordinates(
+                bottom_rois, self.spatial_scale)]
+
+        # Each pooled unit routes its gradient to the argmax, unless the
+        # argmax lies outside of its (malformed) RoI as in the GPU kernel
+        argmax = self.argmax_data
+        h = argmax // width
+        w = argmax % width
+        valid = ((argmax >= 0) & (h >= ymin) & (h <= ymax) &
+                 (w >= xmin) & (w <= xmax))
+        index = (batch * channels +
+                 numpy.arange(channels)[:, None, None]) * (height * width)
+        index = index + argmax
+        bottom_delta = numpy.bincount(
+            index[valid], weights=gy[0][valid], minlength=bottom_data.size)
+        bottom_delta = bottom_delta.astype(numpy.float32, copy=False)
+        return bottom_delta.reshape(bottom_data.shape), None
 
     def backward_gpu(self, inputs, gy):
         bottom_data, bottom_rois = inputs
@@ -1,4 +1,5 @@
 from __future__ import division
+import collections
 import multiprocessing
 from multiprocessing import sharedctypes
 import threading
@@ -7,6 +8,7 @@ import warnings
 import numpy
 import six
 
+from chainer.dataset import convert
 from chainer.dataset import iterator
 
 
@@ -35,13 +37,27 @@ class MultiprocessIterator(iterator.Iterator):
         n_prefetch (int): Number of prefetch batches.
         shared_mem (int): The size of using shared memory per data.
             If ``None``, size is adjusted automatically.
+        zero_copy (bool): If ``True``, the worker processes write the examples
+            directly into preallocated shared-memory arrays of the batch shape,
+            and each batch is returned as a
+            :class:`~chainer.dataset.ConcatenatedBatch` of views of these
+            arrays, which :func:`~chainer.dataset.concat_examples` passes
+            through without copying. The arrays are reused for later batches,
+            so a batch is only valid until the next batch is retrieved.
+            This mode requires that every example is an array or a tuple or
+            dictionary of arrays (or NumPy scalars) whose shapes and dtypes
+            are the same over the dataset. A batch containing an example that
+            does not fit the arrays is returned as a list of examples, and the
+            mode is disabled with a warning if the first example is not of
+            these types. ``shared_mem`` is not used in this mode.
 
     """
 
     _last_signal = object()
 
     def __init__(self, dataset, batch_size, repeat=True, shuffle=True,
-                 n_processes=None, n_prefetch=1, shared_mem=None):
+                 n_processes=None, n_prefetch=1, shared_mem=None,
+                 zero_copy=False):
         self.dataset = dataset
         self.batch_size = batch_size
         self._repeat = repeat
@@ -59,6 +75,7 @@ class MultiprocessIterator(iterator.Iterator):
         self.n_processes = n_processes or multiprocessing.cpu_count()
         self.n_prefetch = max(n_prefetch, 1)
         self._shared_mem_size = shared_mem
+        self._zero_copy = zero_copy
 
         self._finalized = None
 
@@ -91,6 +108,19 @@ class MultiprocessIterator(iterator.Iterator):
             return
 
         self._finalized.set()
+        if self._zero_copy:
+            for _ in self._workers:
+                self._index_queue.put((-1, -1, -1, -1))  # termination signal
+            for worker in self._workers:
+                # drain the queue so that the workers can flush their outputs
+                while worker.is_alive():
+                    try:
+                        self._data_queue.get(timeout=0.1)
+                    except six.moves.queue.Empty:
+                        pass
+                worker.join()
+            return
+
         self._ordered_data_queue.put(self._last_signal)
         self._data_queue.put((-1, -1, -1))
         for _ in self._workers:
@@ -111,6 +141,13 @@ class MultiprocessIterator(iterator.Iterator):
         finalized = threading.Event()
         self._index_queue = multiprocessing.Queue()
         self._data_queue = multiprocessing.Queue()
+
+        if self._zero_copy:
+            self._zero_copy = self._init_zero_copy()
+            if self._zero_copy:
+                self._finalized = finalized
+                return
+
         self._ordered_data_queue = six.moves.queue.Queue()
         self._unused_mem_queue = six.moves.queue.Queue()
         self._mem_list = []
@@ -147,7 +184,42 @@ class MultiprocessIterator(iterator.Iterator):
             self._workers.append(worker)
             worker.start()
 
+    def _init_zero_copy(self):
+        i = self.current_position
+        index = i if self._order is None else self._order[i]
+        example = self.dataset[index]
+        if _example_spec(example) is None:
+            warnings.warn(
+                'zero_copy mode of MultiprocessIterator is disabled, since '
+                'the examples are not arrays or tuples or dictionaries of '
+                'arrays.', UserWarning)
+            return False
+
+        n_slots = self.n_prefetch + 1
+        self._slots = [_allocate_batch(example, self.batch_size)
+                       for _ in six.moves.range(n_slots)]
+        self._unused_slots = list(six.moves.range(n_slots))
+        self._current_slot = None  # slot held by the last returned batch
+        self._pending = collections.deque()
+        self._received = {}
+        self._cnt = 0
+
+        self._workers = []
+        args = (self.dataset, self._index_queue, self._data_queue,
+                self._slots)
+        for _ in six.moves.range(self.n_processes):
+            worker = multiprocessing.Process(
+                target=_zero_copy_worker, args=args)
+            worker.daemon = True
+            self._workers.append(worker)
+            worker.start()
+        return True
+
     def _invoke_prefetch(self):
+        if self._zero_copy:
+            self._invoke_prefetch_zero_copy()
+            return
+
         n = len(self.dataset)
         i = self._pushed_position
         if i is None:  # first iteration
@@ -187,7 +259,80 @@ class MultiprocessIterator(iterator.Iterator):
             self._shared_mem_size = max_size
             self._init_process()
 
+    def _invoke_prefetch_zero_copy(self):
+        n = len(self.dataset)
+        i = self._pushed_position
+        order = self._prefetch_order
+        if i is None:  # first iteration
+            i = self.current_position
+            order = self._order
+
+        slot = self._unused_slots.pop()
+        size = 0
+        for pos in six.moves.range(self.batch_size):
+            if i >= n:
+                if not self._repeat:
+                    break
+                i = 0
+                if order is not None:
+                    # See _invoke_prefetch for the reason of copying.
+                    order = order.copy()
+                    numpy.random.shuffle(order)
+            index = i if order is None else order[i]
+            self._index_queue.put((self._cnt, slot, pos, index))
+            size += 1
+            i += 1
+
+        # The order is stored for each batch, which is set to the iterator
+        # when the batch is retrieved.
+        self._pending.append((self._cnt, slot, size, order))
+        self._cnt += 1
+        self._prefetch_order = order
+        self._pushed_position = i
+
+    def _get_zero_copy(self):
+        if self._current_slot is not None:
+            # the previous batch is not used any more
+            self._unused_slots.append(self._current_slot)
+            self._current_slot = None
+
+        cnt, slot, size, order = self._pending.popleft()
+        received = self._received
+        while received.get(cnt, (0,))[0] < size:
+            c, _, pos, data = self._data_queue.get()
+            count, fallback = received.pop(c, (0, {}))
+            if data is not None:
+                fallback[pos] = data
+            received[c] = count + 1, fallback
+        _, fallback = received.pop(cnt, (0, {}))
+
+        n = len(self.dataset)
+        i = self.current_position
+        for _ in six.moves.range(size):
+            i += 1
+            if i >= n:
+                self.epoch += 1
+                self.is_new_epoch = True
+                if not self._repeat:
+                    break
+                i = 0
+        self.current_position = i
+        self._order = order
+
+        batch = convert.ConcatenatedBatch(self._slots[slot])[:size]
+        if fallback:
+            # some examples did not fit the arrays
+            batch = [fallback[j] if j in fallback else _copy_example(batch[j])
+                     for j in six.moves.range(size)]
+            self._unused_slots.append(slot)
+        else:
+            self._current_slot = slot
+        return batch
+
     def _get(self):
+        if self._zero_copy:
+            return self._get_zero_copy()
+
         n = len(self.dataset)
         i = self.current_position
 
@@ -338,3 +483,75 @@ def _worker(dataset, in_queue, out_queue, mem_list):
         out_queue.put((cnt, mem_index, data))
     out_queue.close()
     out_queue.join_thread()
+
+
+def _example_spec(example):
+    def spec(x):
+        if isinstance(x, (numpy.ndarray, numpy.generic)):
+            return x.shape, x.dtype
+        return None
+
+    t = type(example)
+    if t is tuple:
+        specs = tuple(spec(x) for x in example)
+        return None if None in specs else specs
+    elif t is dict:
+        specs = {key: spec(x) for key, x in six.iteritems(example)}
+        return None if None in specs.values() else specs
+    return spec(example)
+
+
+def _allocate_batch(example, batch_size):
+    def allocate(x):
+        shape = (batch_size,) + x.shape
+        mem = sharedctypes.RawArray('b', int(numpy.prod(shape)) * x.itemsize)
+        return numpy.frombuffer(mem, x.dtype).reshape(shape)
+
+    if isinstance(example, tuple):
+        return tuple(allocate(x) for x in example)
+    elif isinstance(example, dict):
+        return {key: allocate(x) for key, x in six.iteritems(example)}
+    return allocate(example)
+
+
+def _write_example(arrays, pos, example):
+    """Writes an example to the batch arrays if it fits them."""
+    if isinstance(arrays, tuple):
+        if type(example) is not tuple or len(example) != len(arrays):
+            return False
+        pairs = list(six.moves.zip(arrays, example))
+    elif isinstance(arrays, dict):
+        if type(example) is not dict or set(example) != set(arrays):
+            return False
+        pairs = [(arrays[key], x) for key, x in six.iteritems(example)]
+    else:
+        pairs = [(arrays, example)]
+
+    for array, x in pairs:
+        if (not isinstance(x, (numpy.ndarray, numpy.generic)) or
+                x.shape != array.shape[1:] or x.dtype != array.dtype):
+            return False
+    for array, x in pairs:
+        array[pos] = x
+    return True
+
+
+def _copy_example(example):
+    if isinstance(example, tuple):
+        return tuple(x.copy() for x in example)
+    elif isinstance(example, dict):
+        return {key: x.copy() for key, x in six.iteritems(example)}
+    return example.copy()
+
+
+def _zero_copy_worker(dataset, in_queue, out_queue, slots):
+    while True:
+        cnt, slot, pos, index = in_queue.get()
+        if cnt < 0:
+            break
+        data = dataset[index]
+        if _write_example(slots[slot], pos, data):
+            data = None
+        out_queue.put((cnt, slot, pos, data))
+    out_queue.close()
+    out_queue.join_thread()
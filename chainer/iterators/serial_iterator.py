@@ -1,7 +1,10 @@
 from __future__ import division
 
 import numpy
+import six
 
+from chainer import cuda
+from chainer.dataset import convert
 from chainer.dataset import iterator
 
 
@@ -19,6 +22,12 @@ class SerialIterator(iterator.Iterator):
     order of examples has an important meaning and the updater depends on the
     original order, this option should be set to ``False``.
 
+    If the dataset supports the batch-index protocol (see
+    :func:`~chainer.dataset.get_batch`), e.g. an array or a
+    :class:`~chainer.datasets.TupleDataset` of arrays, each batch is gathered
+    by indexing the arrays at once and returned as a
+    :class:`~chainer.dataset.ConcatenatedBatch`.
+
     Args:
         dataset: Dataset to iterate.
         batch_size (int): Number of examples within each batch.
@@ -51,10 +60,7 @@ class SerialIterator(iterator.Iterator):
         i_end = i + self.batch_size
         N = len(self.dataset)
 
-        if self._order is None:
-            batch = self.dataset[i:i_end]
-        else:
-            batch = [self.dataset[index] for index in self._order[i:i_end]]
+        batch = self._get_batch(i, i_end)
 
         if i_end >= N:
             if self._repeat:
@@ -62,11 +68,11 @@ class SerialIterator(iterator.Iterator):
                 if self._order is not None:
                     numpy.random.shuffle(self._order)
                 if rest > 0:
-                    if self._order is None:
-                        batch.extend(self.dataset[:rest])
+                    rest_batch = self._get_batch(0, rest)
+                    if isinstance(batch, convert.ConcatenatedBatch):
+                        batch = _join_batches(batch, rest_batch)
                     else:
-                        batch.extend([self.dataset[index]
-                                      for index in self._order[:rest]])
+                        batch.extend(rest_batch)
                 self.current_position = rest
             else:
                 self.current_position = N
@@ -81,6 +87,19 @@ class SerialIterator(iterator.Iterator):
 
     next = __next__
 
+    def _get_batch(self, start, end):
+        dataset = self.dataset
+        if self._order is None:
+            indices = numpy.arange(start, min(end, len(dataset)))
+        else:
+            indices = self._order[start:end]
+        batch = convert.get_batch(dataset, indices)
+        if batch is not None:
+            return batch
+        if self._order is None:
+            return dataset[start:end]
+        return [dataset[index] for index in indices]
+
     @property
     def epoch_detail(self):
         return self.epoch + self.current_position / len(self.dataset)
@@ -92,3 +111,21 @@ class SerialIterator(iterator.Iterator):
         self.is_new_epoch = serializer('is_new_epoch', self.is_new_epoch)
         if self._order is not None:
             serializer('_order', self._order)
+
+
+def _join_batches(batch, rest):
+    if isinstance(batch.arrays, tuple):
+        return convert.ConcatenatedBatch(tuple(
+            _concat(x, y) for x, y in zip(batch.arrays, rest.arrays)))
+    elif isinstance(batch.arrays, dict):
+        return convert.ConcatenatedBatch({
+            key: _concat(x, rest.arrays[key])
+            for key, x in six.iteritems(batch.arrays)})
+    else:
+        return convert.ConcatenatedBatch(_concat(batch.arrays, rest.arrays))
+
+
+def _concat(x, y):
+    xp = cuda.get_array_module(x)
+    with cuda.get_device(x):
+        return xp.concatenate((x, y))
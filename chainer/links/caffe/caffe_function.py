@@ -10,6 +10,7 @@ from chainer import configuration
 from chainer import functions
 from chainer import link
 from chainer import links
+from chainer.links.model import fold
 
 
 def _protobuf3():
@@ -137,6 +138,7 @@ class CaffeFunction(link.Chain):
         self.forwards = {}
         self.split_map = {}
         self.layers = []
+        self._plans = {}
 
         if net.layer:
             for layer in net.layer:
@@ -165,6 +167,12 @@ class CaffeFunction(link.Chain):
         bottom blobs are already computed, then emulates the layer and stores
         output blobs as :class:`~chainer.Variable` objects.
 
+        Only the layers needed to compute ``outputs`` are executed, and each
+        blob is released as soon as no later layer reads it. The execution
+        plan is computed once for each combination of the names of
+        ``inputs``, ``outputs`` and ``disable``. After the call, the
+        ``variables`` attribute holds only the output blobs.
+
         Args:
             inputs (dict): A dictionary whose key-value pairs indicate initial
                 correspondences between blob names and
@@ -179,13 +187,11 @@ class CaffeFunction(link.Chain):
                 corresponding to elements of the  `outputs` argument.
 
         """
+        plan, dead_inputs = self._get_plan(inputs, outputs, disable)
         variables = dict(inputs)
-        for func_name, bottom, top in self.layers:
-            if (func_name in disable or
-                func_name not in self.forwards or
-                    any(blob not in variables for blob in bottom)):
-                continue
-
+        for blob in dead_inputs:
+            del variables[blob]
+        for func_name, bottom, top, dead in plan:
             func = self.forwards[func_name]
             input_vars = tuple(variables[blob] for blob in bottom)
             output_vars = func(*input_vars)
@@ -193,15 +199,73 @@ class CaffeFunction(link.Chain):
                 output_vars = output_vars,
             for var, name in zip(output_vars, top):
                 variables[name] = var
+            # Release the blobs that are not used anymore
+            for blob in dead:
+                variables.pop(blob, None)
 
         self.variables = variables
         return tuple(variables[blob] for blob in outputs)
 
+    def fold_batch_normalization(self):
+        """Folds normalization layers into the preceding linear layers.
+
+        This method modifies the network in place for inference. A chain of
+        BatchNorm and Scale layers that directly follows a Convolution or
+        InnerProduct layer is folded into the weight and the bias of the
+        latter, and the folded layers are removed. The BatchNorm layers are
+        folded in testing mode, i.e. with the population statistics, so the
+        resulting network computes the same outputs only in testing mode.
+        A layer is folded only when it is the only layer that reads the output
+        of the preceding one.
+
+        The folded network can be saved by
+        :func:`~chainer.serializers.save_npz`. To load it, create a
+        :class:`CaffeFunction` from the same model file, call this method and
+        then load it by :func:`~chainer.serializers.load_npz`.
+
+        Returns:
+            CaffeFunction: The network itself.
+
+        """
+        layers = []
+        folded = set()
+        for i, (func_name, bottom, top) in enumerate(self.layers):
+            if func_name in folded:
+                continue
+            link = self.__dict__.get(func_name)
+            if (func_name in self._children and len(top) == 1 and
+                    isinstance(link, (links.Convolution2D, links.Linear))):
+                j = i
+                while True:
+                    k = _next_foldable_layer(self, j, top[0])
+                    if k is None:
+                        break
+                    name = self.layers[k][0]
+                    _fold_link(link, self[name])
+                    fold._remove_link(self, name)
+                    del self.forwards[name]
+                    folded.add(name)
+                    top = self.layers[k][2]
+                    j = k
+            layers.append((func_name, bottom, top))
+        self.layers = layers
+        self._plans.clear()
+        return self
+
+    def _get_plan(self, inputs, outputs, disable):
+        key = frozenset(inputs), tuple(outputs), frozenset(disable)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = _make_plan(self.layers, self.forwards, *key)
+            self._plans[key] = plan
+        return plan
+
     def _add_layer(self, layer):
         bottom = []
         for blob_name in layer.bottom:
             bottom.append(self.split_map.get(blob_name, blob_name))
         self.layers.append((layer.name, bottom, list(layer.top)))
+        self._plans.clear()
 
     @_layer('Concat', 'CONCAT')
     def _setup_concat(self, layer):
@@ -447,6 +511,91 @@ class CaffeFunction(link.Chain):
 
 # Internal functions
 
+def _fold_link(link, child):
+    if isinstance(child, links.BatchNormalization):
+        fold.fold_batch_normalization(link, child)
+    else:
+        fold.fold_scale(link, child)
+
+
+def _next_foldable_layer(caffe_func, index, blob):
+    """Finds the layer that can be folded into the output of a layer.
+
+    It returns the index of the layer following ``caffe_func.layers[index]``
+    that reads ``blob`` if it is the only reader of ``blob`` written by the
+    latter, and it is a BatchNorm layer or a Scale layer with its own weight.
+    No other layers may read or write the blobs in between.
+
+    """
+    layers = caffe_func.layers
+    reader = None
+    for k in six.moves.range(index + 1, len(layers)):
+        func_name, bottom, top = layers[k]
+        if blob in bottom:
+            if reader is not None:
+                return None
+            reader = k
+        if blob in top:
+            break
+    if reader is None:
+        return None
+
+    func_name, bottom, top = layers[reader]
+    child = caffe_func.__dict__.get(func_name)
+    if func_name not in caffe_func._children or bottom != [blob] or (
+            len(top) != 1):
+        return None
+    if isinstance(child, links.BatchNormalization):
+        if child.avg_mean.ndim != 1:
+            return None
+    elif not (isinstance(child, links.Scale) and hasattr(child, 'W') and
+              child.axis == 1 and child.W.data.ndim == 1):
+        return None
+    for _, bottom_k, top_k in layers[index + 1:reader]:
+        if top[0] in bottom_k or top[0] in top_k:
+            return None
+    return reader
+
+
+def _make_plan(layers, forwards, inputs, outputs, disable):
+    """Makes the execution plan of a sub-network.
+
+    It returns the list of the layers to run and the input blobs that are not
+    used at all. Each element of the list is a tuple of the layer name, the
+    bottom and top blobs, and the blobs that are dead after the layer. Only
+    the layers whose outputs are needed to compute ``outputs`` are included.
+
+    """
+    # Layers that can run, in the same manner as the interpreter does
+    available = set(inputs)
+    runnable = []
+    for func_name, bottom, top in layers:
+        if (func_name in disable or
+            func_name not in forwards or
+                any(blob not in available for blob in bottom)):
+            continue
+        runnable.append((func_name, bottom, top))
+        available.update(top)
+
+    # Trace back from the outputs; each blob in ``live`` is read later
+    live = set(outputs)
+    plan = []
+    for func_name, bottom, top in reversed(runnable):
+        if not any(blob in live for blob in top):
+            continue
+        # Blobs touched by the layer and not read later are released right
+        # after it; a bottom overwritten by an in-place layer is never dead
+        # here as long as the new value is read later.
+        dead = set(bottom).union(top) - live
+        live.difference_update(top)
+        live.update(bottom)
+        plan.append((func_name, bottom, top, tuple(sorted(dead))))
+    plan.reverse()
+
+    dead_inputs = tuple(sorted(blob for blob in inputs if blob not in live))
+    return plan, dead_inputs
+
+
 def _get_ksize(param):
     if param.kernel_h > 0:
         return param.kernel_h, param.kernel_w
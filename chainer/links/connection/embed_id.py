@@ -20,6 +20,8 @@ class EmbedID(link.Link):
             ``cupy.ndarray`` and edits its value.
         ignore_label (int or None): If ``ignore_label`` is an int value,
             ``i``-th column of return value is filled with ``0``.
+        sparse_grad (bool): If ``True``, the gradient of ``W`` is given by
+            its row-sparse form. See :func:`~chainer.functions.embed_id`.
 
     .. seealso:: :func:`chainer.functions.embed_id`
 
@@ -29,13 +31,16 @@ class EmbedID(link.Link):
     """
 
     ignore_label = None
+    sparse_grad = False
 
-    def __init__(self, in_size, out_size, initialW=None, ignore_label=None):
+    def __init__(self, in_size, out_size, initialW=None, ignore_label=None,
+                 sparse_grad=False):
         super(EmbedID, self).__init__(W=(in_size, out_size))
         if initialW is None:
             initialW = initializers.Normal(1.0)
         initializers.init_weight(self.W.data, initialW)
         self.ignore_label = ignore_label
+        self.sparse_grad = sparse_grad
 
     def __call__(self, x):
         """Extracts the word embedding of given IDs.
@@ -47,4 +52,5 @@ class EmbedID(link.Link):
             ~chainer.Variable: Batch of corresponding embeddings.
 
         """
-        return embed_id.embed_id(x, self.W, ignore_label=self.ignore_label)
+        return embed_id.embed_id(x, self.W, ignore_label=self.ignore_label,
+                                 sparse_grad=self.sparse_grad)
@@ -6,6 +6,7 @@ import six
 from chainer import cuda
 from chainer import function
 from chainer import link
+from chainer.utils import array
 from chainer.utils import type_check
 
 
@@ -93,6 +94,18 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
             begins[i + 1] = begins[i] + length
         self.begins = begins
 
+        # Paths and codes padded to the depth of the tree, used by the batched
+        # CPU implementation. Padded entries have code 0 and are masked out.
+        max_depth = max(len(p) for p in paths.values())
+        self.padded_paths = numpy.zeros(
+            (n_vocab, max_depth), dtype=numpy.int32)
+        self.padded_codes = numpy.zeros(
+            (n_vocab, max_depth), dtype=numpy.float32)
+        for i, path in six.iteritems(paths):
+            self.padded_paths[i, :len(path)] = path
+            self.padded_codes[i, :len(path)] = codes[i]
+        self.padded_mask = self.padded_codes != 0
+
         self.parser_size = parser.size()
 
     def check_type_forward(self, in_types):
@@ -124,43 +137,34 @@ class BinaryHierarchicalSoftmaxFunction(function.Function):
 
     def forward_cpu(self, inputs):
         x, t, W = inputs
+        paths = self.padded_paths[t]
+        codes = self.padded_codes[t]
 
-        loss = numpy.float32(0.0)
-        for ix, it in six.moves.zip(x, t):
-            loss += self._forward_cpu_one(ix, it, W)
-        return numpy.array(loss),
-
-    def _forward_cpu_one(self, x, t, W):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        w = W[self.paths[begin:end]]
-        wxy = w.dot(x) * self.codes[begin:end]
+        wxy = numpy.einsum('ijk,ik->ij', W[paths], x) * codes
         loss = numpy.logaddexp(0.0, -wxy)  # == log(1 + exp(-wxy))
-        return numpy.sum(loss)
+        loss = numpy.sum(loss[self.padded_mask[t]], dtype=numpy.float32)
+        return numpy.array(loss),
 
     def backward_cpu(self, inputs, grad_outputs):
         x, t, W = inputs
         gloss, = grad_outputs
-        gx = numpy.empty_like(x)
+        paths = self.padded_paths[t]
+        codes = self.padded_codes[t]
+        mask = self.padded_mask[t]
+
+        w = W[paths]
+        wxy = numpy.einsum('ijk,ik->ij', w, x) * codes
+        # codes of padded entries are 0, so are their gradients
+        g = (-gloss * codes / (1.0 + numpy.exp(wxy))).astype(
+            W.dtype, copy=False)
+        gx = numpy.einsum('ij,ijk->ik', g, w)
         gW = numpy.zeros_like(W)
-        for i, (ix, it) in enumerate(six.moves.zip(x, t)):
-            gx[i] = self._backward_cpu_one(ix, it, W, gloss, gW)
+        rows = numpy.broadcast_to(
+            numpy.arange(len(x))[:, None], mask.shape)[mask]
+        array.scatter_add_rows(
+            gW, paths[mask], g[mask][:, None] * x[rows])
         return gx, None, gW
 
-    def _backward_cpu_one(self, x, t, W, gloss, gW):
-        begin = self.begins[t]
-        end = self.begins[t + 1]
-
-        path = self.paths[begin:end]
-        w = W[path]
-        wxy = w.dot(x) * self.codes[begin:end]
-        g = -gloss * self.codes[begin:end] / (1.0 + numpy.exp(wxy))
-        gx = g.dot(w)
-        gw = g.reshape((g.shape[0], 1)).dot(x.reshape(1, x.shape[0]))
-        gW[path] += gw
-        return gx
-
     def forward_gpu(self, inputs):
         x, t, W = inputs
         max_length = cuda.reduce(
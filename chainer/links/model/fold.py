@@ -0,0 +1,119 @@
+import numpy
+
+from chainer import cuda
+from chainer.links.connection import convolution_2d
+from chainer.links.connection import linear
+
+
+def _check_link(link):
+    if not isinstance(link, (convolution_2d.Convolution2D, linear.Linear)):
+        raise TypeError(
+            'only Convolution2D and Linear can be folded into: {}'.format(
+                type(link).__name__))
+    if not hasattr(link, 'W'):
+        raise RuntimeError('the weight of {} is not initialized'.format(
+            type(link).__name__))
+
+
+def _check_channel(link, name, array):
+    n_out = link.W.data.shape[0]
+    if array.shape != (n_out,):
+        raise ValueError(
+            '{} of shape {} cannot be folded into {} outputs'.format(
+                name, array.shape, n_out))
+
+
+def _fold(link, multiplier, shift):
+    """Replaces the outputs ``y`` of ``link`` by ``y * multiplier + shift``."""
+    W = link.W.data
+    xp = cuda.get_array_module(W)
+    if link.b is None:
+        del link.b
+        link.add_param('b', W.shape[0], dtype=W.dtype)
+        link.b.data.fill(0)
+    b = link.b.data
+    multiplier = xp.asarray(multiplier, dtype=numpy.float64)
+    shape = (-1,) + (1,) * (W.ndim - 1)
+    W[...] = W * multiplier.reshape(shape)
+    b[...] = b * multiplier + xp.asarray(shift, dtype=numpy.float64)
+
+
+def fold_batch_normalization(link, bn):
+    """Folds a batch normalization in testing mode into the preceding link.
+
+    It modifies the weight and the bias of ``link`` so that its output equals
+    the output of ``bn`` applied to the original output of ``link`` in
+    testing mode, i.e., normalized by the population statistics. A bias
+    parameter is added to ``link`` if it does not have one. ``bn`` is not
+    modified, and should be removed from the network afterwards.
+
+    Args:
+        link (~chainer.links.Convolution2D or ~chainer.links.Linear): Link
+            whose outputs are normalized.
+        bn (~chainer.links.BatchNormalization): Batch normalization applied
+            to the outputs of ``link``.
+
+    """
+    _check_link(link)
+    xp = cuda.get_array_module(bn.avg_mean)
+    _check_channel(link, 'BatchNormalization', bn.avg_mean)
+    mean = bn.avg_mean.astype(numpy.float64)
+    multiplier = 1 / xp.sqrt(bn.avg_var.astype(numpy.float64) + bn.eps)
+    if hasattr(bn, 'gamma'):
+        multiplier *= bn.gamma.data
+    shift = -mean * multiplier
+    if hasattr(bn, 'beta'):
+        shift += bn.beta.data
+    _fold(link, multiplier, shift)
+
+
+def fold_scale(link, scale):
+    """Folds a :class:`~chainer.links.Scale` into the preceding link.
+
+    The scale must have its own weight of the shape of the output channels
+    applied to the first axis. Its bias term, if any, is also folded.
+
+    Args:
+        link (~chainer.links.Convolution2D or ~chainer.links.Linear): Link
+            whose outputs are scaled.
+        scale (~chainer.links.Scale): Scale applied to the outputs of
+            ``link``.
+
+    """
+    _check_link(link)
+    if not hasattr(scale, 'W') or scale.axis != 1:
+        raise ValueError('only Scale with its own weight along the axis 1 '
+                         'can be folded')
+    _check_channel(link, 'Scale', scale.W.data)
+    if hasattr(scale, 'bias'):
+        shift = scale.bias.b.data
+    else:
+        shift = 0
+    _fold(link, scale.W.data, shift)
+
+
+def fold_bias(link, bias):
+    """Folds a :class:`~chainer.links.Bias` into the preceding link.
+
+    The bias must have its own parameter of the shape of the output channels
+    applied to the first axis.
+
+    Args:
+        link (~chainer.links.Convolution2D or ~chainer.links.Linear): Link
+            whose outputs are shifted.
+        bias (~chainer.links.Bias): Bias applied to the outputs of ``link``.
+
+    """
+    _check_link(link)
+    if not hasattr(bias, 'b') or bias.axis != 1:
+        raise ValueError('only Bias with its own parameter along the axis 1 '
+                         'can be folded')
+    _check_channel(link, 'Bias', bias.b.data)
+    _fold(link, 1, bias.b.data)
+
+
+def _remove_link(chain, name):
+    chain._children.remove(name)
+    link = chain.__dict__.pop(name)
+    link.name = None
+    return link
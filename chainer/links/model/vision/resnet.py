@@ -10,13 +10,12 @@ except ImportError as e:
     available = False
     _import_error = e
 
-from chainer.dataset.convert import concat_examples
 from chainer.dataset import download
 from chainer import flag
 from chainer.functions.activation.relu import relu
 from chainer.functions.activation.softmax import softmax
+from chainer.functions.array.concat import concat
 from chainer.functions.array.reshape import reshape
-from chainer.functions.math.sum import sum
 from chainer.functions.pooling.average_pooling_2d import average_pooling_2d
 from chainer.functions.pooling.max_pooling_2d import max_pooling_2d
 from chainer.initializers import constant
@@ -24,6 +23,7 @@ from chainer.initializers import normal
 from chainer import link
 from chainer.links.connection.convolution_2d import Convolution2D
 from chainer.links.connection.linear import Linear
+from chainer.links.model import fold
 from chainer.links.normalization.batch_normalization import BatchNormalization
 from chainer.serializers import npz
 from chainer.utils import imgproc
@@ -127,6 +127,33 @@ class ResNet50Layers(link.Chain):
         _transfer_resnet50(caffemodel, chainermodel)
         npz.save_npz(path_npz, chainermodel, compression=False)
 
+    def fold_batch_normalization(self):
+        """Folds the batch normalizations into the preceding convolutions.
+
+        This method modifies the model in place for inference: the population
+        statistics and the scaling and shifting parameters of every
+        batch normalization are folded into the weight and the bias of the
+        preceding convolution, and the batch normalization links are removed.
+        The resulting model computes the same outputs in testing mode without
+        the elementwise passes of the batch normalizations, and it can be
+        saved by :func:`~chainer.serializers.save_npz`. To load the saved
+        model, create a model with ``pretrained_model=None``, call this method
+        and then load it by :func:`~chainer.serializers.load_npz`.
+
+        Note that the folded model cannot be trained in the original way.
+        Use :func:`copy.deepcopy` beforehand to keep the original model.
+
+        Returns:
+            ResNet50Layers: The model itself.
+
+        """
+        _fold_batch_normalization(self, 'conv1', 'bn1')
+        self.functions['conv1'] = [self.conv1, relu]
+        for block in (self.res2, self.res3, self.res4, self.res5):
+            for _, bottleneck in block.forward:
+                bottleneck.fold_batch_normalization()
+        return self
+
     def __call__(self, x, layers=['prob']):
         """Computes all the feature maps specified by ``layers``.
 
@@ -155,7 +182,7 @@ class ResNet50Layers(link.Chain):
         return activations
 
     def extract(self, images, layers=['pool5'], size=(224, 224),
-                volatile=flag.OFF):
+                volatile=flag.OFF, batchsize=None, n_threads=None):
         """Extracts all the feature maps of given images.
 
         The difference of directly executing ``__call__`` is that
@@ -172,6 +199,12 @@ class ResNet50Layers(link.Chain):
                 if this argument is ``None``, but the resolutions of
                 all the images should be the same.
             volatile (~chainer.Flag): Volatility flag used for input variables.
+            batchsize (int): If it is given, the images are consumed lazily
+                and processed by chunks of this size, and the outputs of the
+                chunks are concatenated. ``images`` can be an iterable of
+                arbitrary length then.
+            n_threads (int): Number of threads that decode and resize images.
+                See :func:`chainer.utils.imgproc.load_images`.
 
         Returns:
             Dictionary of ~chainer.Variable: A directory in which
@@ -180,18 +213,27 @@ class ResNet50Layers(link.Chain):
 
         """
 
-        x = concat_examples([prepare(img, size=size) for img in images])
-        x = Variable(self.xp.asarray(x), volatile=volatile)
-        return self(x, layers=layers)
+        outputs = []
+        for chunk in imgproc.iter_chunks(images, batchsize):
+            x = prepare_batch(chunk, size=size, n_threads=n_threads)
+            x = Variable(self.xp.asarray(x), volatile=volatile)
+            outputs.append(self(x, layers=layers))
+        return _concat_outputs(outputs)
 
-    def predict(self, images, oversample=True):
+    def predict(self, images, oversample=True, batchsize=None,
+                n_threads=None):
         """Computes all the probabilities of given images.
 
         Args:
             images (iterable of PIL.Image or numpy.ndarray): Input images.
             oversample (bool): If ``True``, it averages results across
                 center, corners, and mirrors. Otherwise, it uses only the
-                center.
+                center. The crops are fed to the network one after another
+                to reduce memory consumption.
+            batchsize (int): If it is given, the images are consumed lazily
+                and processed by chunks of this size.
+            n_threads (int): Number of threads that decode and resize images.
+                See :func:`chainer.utils.imgproc.load_images`.
 
         Returns:
             ~chainer.Variable: Output that contains the class probabilities
@@ -199,20 +241,26 @@ class ResNet50Layers(link.Chain):
 
         """
 
-        x = concat_examples([prepare(img, size=(256, 256)) for img in images])
-        if oversample:
-            x = imgproc.oversample(x, crop_dims=(224, 224))
-        else:
-            x = x[:, :, 16:240, 16:240]
-        # Set volatile option to ON to reduce memory consumption
-        x = Variable(self.xp.asarray(x), volatile=flag.ON)
-        y = self(x, layers=['prob'])['prob']
-        if oversample:
-            n = y.data.shape[0] // 10
-            y_shape = y.data.shape[1:]
-            y = reshape(y, (n, 10) + y_shape)
-            y = sum(y, axis=1) / 10
-        return y
+        outputs = []
+        for chunk in imgproc.iter_chunks(images, batchsize):
+            x = prepare_batch(chunk, size=(256, 256), n_threads=n_threads)
+            if oversample:
+                crops = imgproc.iter_oversample(x, crop_dims=(224, 224))
+            else:
+                crops = [x[:, :, 16:240, 16:240]]
+            y = None
+            for crop in crops:
+                # Set volatile option to ON to reduce memory consumption
+                crop = Variable(self.xp.asarray(numpy.ascontiguousarray(crop)),
+                                volatile=flag.ON)
+                prob = self(crop, layers=['prob'])['prob']
+                y = prob if y is None else y + prob
+            if oversample:
+                y = y / 10
+            outputs.append(y)
+        if len(outputs) == 1:
+            return outputs[0]
+        return concat(outputs, axis=0)
 
 
 def prepare(image, size=(224, 224)):
@@ -237,10 +285,54 @@ def prepare(image, size=(224, 224)):
 
     """
 
+    _check_available()
+    image = _to_rgb_array(image, size)
+    return imgproc.subtract_mean(image[None], _mean)[0]
+
+
+def prepare_batch(images, size=(224, 224), n_threads=None):
+    """Converts the given images to a batch array for ResNets.
+
+    It returns the same array as stacking the outputs of :func:`prepare`,
+    while the images are decoded and resized by a thread pool and written
+    directly into a preallocated batch, and the channel swap and the mean
+    subtraction are applied to the whole batch at once.
+
+    Args:
+        images (list of PIL.Image or numpy.ndarray): Input images. See
+            :func:`prepare` for the supported formats.
+        size (pair of ints): Size of converted images.
+            If ``None``, the given images are not resized, and all of them
+            must have the same resolution.
+        n_threads (int): Number of worker threads. See
+            :func:`chainer.utils.imgproc.load_images`.
+
+    Returns:
+        numpy.ndarray: The converted output array of shape ``(N, 3, H, W)``.
+
+    """
+
+    _check_available()
+    images = imgproc.load_images(
+        images, lambda image: _to_rgb_array(image, size), n_threads)
+    return imgproc.subtract_mean(images, _mean)
+
+
+# NOTE: in the original paper they subtract a fixed mean image,
+#       however, in order to support arbitrary size we instead use the
+#       mean pixel (rather than mean image) as with VGG team. The mean
+#       value used in ResNet is slightly different from that of VGG16.
+_mean = numpy.array([103.063, 115.903, 123.152], dtype=numpy.float32)
+
+
+def _check_available():
     if not available:
         raise ImportError('PIL cannot be loaded. Install Pillow!\n'
                           'The actual import error is as follows:\n' +
                           str(_import_error))
+
+
+def _to_rgb_array(image, size):
     if isinstance(image, numpy.ndarray):
         if image.ndim == 3:
             if image.shape[0] == 1:
@@ -251,16 +343,14 @@ def prepare(image, size=(224, 224)):
     image = image.convert('RGB')
     if size:
         image = image.resize(size)
-    image = numpy.asarray(image, dtype=numpy.float32)
-    image = image[:, :, ::-1]
-    # NOTE: in the original paper they subtract a fixed mean image,
-    #       however, in order to support arbitrary size we instead use the
-    #       mean pixel (rather than mean image) as with VGG team. The mean
-    #       value used in ResNet is slightly different from that of VGG16.
-    image -= numpy.array(
-        [103.063,  115.903,  123.152], dtype=numpy.float32)
-    image = image.transpose((2, 0, 1))
-    return image
+    return numpy.asarray(image, dtype=numpy.uint8)
+
+
+def _concat_outputs(outputs):
+    if len(outputs) == 1:
+        return outputs[0]
+    return dict((key, concat([out[key] for out in outputs], axis=0))
+                for key in outputs[0])
 
 
 class BuildingBlock(link.Chain):
@@ -337,6 +427,11 @@ class BottleneckA(link.Chain):
         h2 = self.bn4(self.conv4(x))
         return relu(h1 + h2)
 
+    def fold_batch_normalization(self):
+        for i in range(1, 5):
+            _fold_batch_normalization(
+                self, 'conv{}'.format(i), 'bn{}'.format(i))
+
 
 class BottleneckB(link.Chain):
 
@@ -371,6 +466,25 @@ class BottleneckB(link.Chain):
         h = self.bn3(self.conv3(h))
         return relu(h + x)
 
+    def fold_batch_normalization(self):
+        for i in range(1, 4):
+            _fold_batch_normalization(
+                self, 'conv{}'.format(i), 'bn{}'.format(i))
+
+
+def _identity(x):
+    return x
+
+
+def _fold_batch_normalization(chain, conv_name, bn_name):
+    bn = getattr(chain, bn_name)
+    if bn is _identity:
+        return  # already folded
+    fold.fold_batch_normalization(getattr(chain, conv_name), bn)
+    fold._remove_link(chain, bn_name)
+    # The forward computation calls it as a no-op
+    setattr(chain, bn_name, _identity)
+
 
 def _global_average_pooling_2d(x):
     n, channel, rows, cols = x.data.shape
@@ -10,13 +10,11 @@ except ImportError as e:
     available = False
     _import_error = e
 
-from chainer.dataset.convert import concat_examples
 from chainer.dataset import download
 from chainer import flag
 from chainer.functions.activation.relu import relu
 from chainer.functions.activation.softmax import softmax
-from chainer.functions.array.reshape import reshape
-from chainer.functions.math.sum import sum
+from chainer.functions.array.concat import concat
 from chainer.functions.noise.dropout import dropout
 from chainer.functions.pooling.max_pooling_2d import max_pooling_2d
 from chainer.initializers import constant
@@ -182,7 +180,7 @@ class VGG16Layers(link.Chain):
         return activations
 
     def extract(self, images, layers=['fc7'], size=(224, 224),
-                volatile=flag.OFF):
+                volatile=flag.OFF, batchsize=None, n_threads=None):
         """Extracts all the feature maps of given images.
 
         The difference of directly executing ``__call__`` is that
@@ -199,6 +197,12 @@ class VGG16Layers(link.Chain):
                 if this argument is ``None``, but the resolutions of
                 all the images should be the same.
             volatile (~chainer.Flag): Volatility flag used for input variables.
+            batchsize (int): If it is given, the images are consumed lazily
+                and processed by chunks of this size, and the outputs of the
+                chunks are concatenated. ``images`` can be an iterable of
+                arbitrary length then.
+            n_threads (int): Number of threads that decode and resize images.
+                See :func:`chainer.utils.imgproc.load_images`.
 
         Returns:
             Dictionary of ~chainer.Variable: A directory in which
@@ -207,18 +211,27 @@ class VGG16Layers(link.Chain):
 
         """
 
-        x = concat_examples([prepare(img, size=size) for img in images])
-        x = Variable(self.xp.asarray(x), volatile=volatile)
-        return self(x, layers=layers)
+        outputs = []
+        for chunk in imgproc.iter_chunks(images, batchsize):
+            x = prepare_batch(chunk, size=size, n_threads=n_threads)
+            x = Variable(self.xp.asarray(x), volatile=volatile)
+            outputs.append(self(x, layers=layers))
+        return _concat_outputs(outputs)
 
-    def predict(self, images, oversample=True):
+    def predict(self, images, oversample=True, batchsize=None,
+                n_threads=None):
         """Computes all the probabilities of given images.
 
         Args:
             images (iterable of PIL.Image or numpy.ndarray): Input images.
             oversample (bool): If ``True``, it averages results across
                 center, corners, and mirrors. Otherwise, it uses only the
-                center.
+                center. The crops are fed to the network one after another
+                to reduce memory consumption.
+            batchsize (int): If it is given, the images are consumed lazily
+                and processed by chunks of this size.
+            n_threads (int): Number of threads that decode and resize images.
+                See :func:`chainer.utils.imgproc.load_images`.
 
         Returns:
             ~chainer.Variable: Output that contains the class probabilities
@@ -226,20 +239,26 @@ class VGG16Layers(link.Chain):
 
         """
 
-        x = concat_examples([prepare(img, size=(256, 256)) for img in images])
-        if oversample:
-            x = imgproc.oversample(x, crop_dims=(224, 224))
-        else:
-            x = x[:, :, 16:240, 16:240]
-        # Set volatile option to ON to reduce memory consumption
-        x = Variable(self.xp.asarray(x), volatile=flag.ON)
-        y = self(x, layers=['prob'])['prob']
-        if oversample:
-            n = y.data.shape[0] // 10
-            y_shape = y.data.shape[1:]
-            y = reshape(y, (n, 10) + y_shape)
-            y = sum(y, axis=1) / 10
-        return y
+        outputs = []
+        for chunk in imgproc.iter_chunks(images, batchsize):
+            x = prepare_batch(chunk, size=(256, 256), n_threads=n_threads)
+            if oversample:
+                crops = imgproc.iter_oversample(x, crop_dims=(224, 224))
+            else:
+                crops = [x[:, :, 16:240, 16:240]]
+            y = None
+            for crop in crops:
+                # Set volatile option to ON to reduce memory consumption
+                crop = Variable(self.xp.asarray(numpy.ascontiguousarray(crop)),
+                                volatile=flag.ON)
+                prob = self(crop, layers=['prob'])['prob']
+                y = prob if y is None else y + prob
+            if oversample:
+                y = y / 10
+            outputs.append(y)
+        if len(outputs) == 1:
+            return outputs[0]
+        return concat(outputs, axis=0)
 
 
 def prepare(image, size=(224, 224)):
@@ -264,10 +283,50 @@ def prepare(image, size=(224, 224)):
 
     """
 
+    _check_available()
+    image = _to_rgb_array(image, size)
+    return imgproc.subtract_mean(image[None], _mean)[0]
+
+
+def prepare_batch(images, size=(224, 224), n_threads=None):
+    """Converts the given images to a batch array for VGG models.
+
+    It returns the same array as stacking the outputs of :func:`prepare`,
+    while the images are decoded and resized by a thread pool and written
+    directly into a preallocated batch, and the channel swap and the mean
+    subtraction are applied to the whole batch at once.
+
+    Args:
+        images (list of PIL.Image or numpy.ndarray): Input images. See
+            :func:`prepare` for the supported formats.
+        size (pair of ints): Size of converted images.
+            If ``None``, the given images are not resized, and all of them
+            must have the same resolution.
+        n_threads (int): Number of worker threads. See
+            :func:`chainer.utils.imgproc.load_images`.
+
+    Returns:
+        numpy.ndarray: The converted output array of shape ``(N, 3, H, W)``.
+
+    """
+
+    _check_available()
+    images = imgproc.load_images(
+        images, lambda image: _to_rgb_array(image, size), n_threads)
+    return imgproc.subtract_mean(images, _mean)
+
+
+_mean = numpy.array([103.939, 116.779, 123.68], dtype=numpy.float32)
+
+
+def _check_available():
     if not available:
         raise ImportError('PIL cannot be loaded. Install Pillow!\n'
                           'The actual import error is as follows:\n' +
                           str(_import_error))
+
+
+def _to_rgb_array(image, size):
     if isinstance(image, numpy.ndarray):
         if image.ndim == 3:
             if image.shape[0] == 1:
@@ -278,12 +337,14 @@ def prepare(image, size=(224, 224)):
     image = image.convert('RGB')
     if size:
         image = image.resize(size)
-    image = numpy.asarray(image, dtype=numpy.float32)
-    image = image[:, :, ::-1]
-    image -= numpy.array(
-        [103.939, 116.779, 123.68], dtype=numpy.float32)
-    image = image.transpose((2, 0, 1))
-    return image
+    return numpy.asarray(image, dtype=numpy.uint8)
+
+
+def _concat_outputs(outputs):
+    if len(outputs) == 1:
+        return outputs[0]
+    return dict((key, concat([out[key] for out in outputs], axis=0))
+                for key in outputs[0])
 
 
 def _max_pooling_2d(x):
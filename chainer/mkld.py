@@ -1,6 +1,9 @@
+import collections
+import functools
 import warnings
 import numpy
 import os
+import weakref
 
 avaiable = False
 mkldnn_enabled = False
@@ -21,6 +24,149 @@ if avaiable:
 if avaiable and not mkldnn_enabled:
     warnings.warn("WARNING: mkldnn acceleration is disabled!!")
 
+"""
+MKLDNN primitive cache
+"""
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'size', 'capacity'])
+
+
+def set_cache_capacity(capacity):
+    """Sets the maximum number of cached MKLDNN layers.
+
+    MKLDNN layers (primitives and their memories) are cached for each
+    combination of input shapes and layer parameters. When the number of
+    cached layers exceeds the capacity, the least recently used ones are
+    released. The capacity must be at least the number of distinct layers used
+    in one forward/backward pass, since the backward computation reuses the
+    layer created in the forward computation. If the layer has been released
+    in between, e.g. by an eviction or :func:`clear_cache`, the backward
+    computation raises :class:`RuntimeError`. The initial capacity is taken
+    from the ``CHAINER_MKLDNN_CACHE_CAPACITY`` environment variable.
+
+    Args:
+        capacity (int): Maximum number of cached layers. If it is ``0``, the
+            cache is unbounded.
+
+    """
+    if capacity < 0:
+        raise ValueError('capacity must be non-negative')
+    if avaiable:
+        mkldnn.set_layer_cache_capacity(capacity)
+
+
+def cache_info():
+    """Returns the statistics of the MKLDNN primitive cache.
+
+    Returns:
+        CacheInfo: Named tuple of the numbers of cache hits, misses and
+        evictions, the number of cached layers, and the capacity.
+
+    """
+    if not avaiable:
+        return CacheInfo(0, 0, 0, 0, 0)
+    return CacheInfo(
+        mkldnn.get_layer_cache_hits(), mkldnn.get_layer_cache_misses(),
+        mkldnn.get_layer_cache_evictions(), mkldnn.get_layer_cache_size(),
+        mkldnn.get_layer_cache_capacity())
+
+
+def clear_cache():
+    """Releases all the cached MKLDNN layers and resets the statistics."""
+    if avaiable:
+        mkldnn.clear_layer_cache()
+
+
+if avaiable:
+    set_cache_capacity(
+        int(os.environ.get('CHAINER_MKLDNN_CACHE_CAPACITY', '0')))
+
+"""
+MKLDNN layout cache
+"""
+LayoutCacheInfo = collections.namedtuple(
+    'LayoutCacheInfo', ['hits', 'misses', 'size'])
+
+layout_cache_enabled = False
+_layout_refs = {}
+
+
+def set_layout_cache_enabled(enabled):
+    """Enables or disables the MKLDNN layout cache.
+
+    MKLDNN layers compute in blocked memory formats and reorder their outputs
+    back to NCHW arrays. With the layout cache, the blocked output of a
+    convolution, pooling, local response normalization or batch normalization
+    is kept along with its NCHW array, and a following layer of these kinds
+    reads it directly instead of reordering the array again. The arrays stay
+    ordinary NumPy arrays, so any other function can consume them as usual.
+
+    Arrays returned by these functions must not be modified in place while
+    the cache is enabled. The initial state is taken from the
+    ``CHAINER_MKLDNN_LAYOUT_CACHE`` environment variable.
+
+    Args:
+        enabled (bool): If ``True``, the layout cache is enabled. Disabling it
+            drops all the cached layouts.
+
+    """
+    global layout_cache_enabled
+    if not avaiable:
+        return
+    layout_cache_enabled = bool(enabled)
+    mkldnn.set_layout_cache_enabled(layout_cache_enabled)
+    if not layout_cache_enabled:
+        _layout_refs.clear()
+
+
+def track_layout(y):
+    """Releases the cached layout of an output array when it is freed.
+
+    MKLDNN-backed functions call it for the output arrays written by the
+    layers that register their layouts to the cache.
+
+    Args:
+        y (numpy.ndarray): Output array.
+
+    """
+    if not layout_cache_enabled:
+        return
+    ptr = y.ctypes.data
+    _layout_refs[ptr] = weakref.ref(y, functools.partial(_release_layout, ptr))
+
+
+def _release_layout(ptr, ref):
+    if _layout_refs.get(ptr) is ref:
+        del _layout_refs[ptr]
+        mkldnn.release_layout(ptr)
+
+
+def layout_cache_info():
+    """Returns the statistics of the MKLDNN layout cache.
+
+    Returns:
+        LayoutCacheInfo: Named tuple of the numbers of cache hits and misses,
+        and the number of cached layouts.
+
+    """
+    if not avaiable:
+        return LayoutCacheInfo(0, 0, 0)
+    return LayoutCacheInfo(
+        mkldnn.get_layout_cache_hits(), mkldnn.get_layout_cache_misses(),
+        mkldnn.get_layout_cache_size())
+
+
+def clear_layout_cache():
+    """Drops all the cached layouts and resets the statistics."""
+    if avaiable:
+        mkldnn.clear_layout_cache()
+    _layout_refs.clear()
+
+
+if avaiable:
+    set_layout_cache_enabled(
+        int(os.environ.get('CHAINER_MKLDNN_LAYOUT_CACHE', '0')) != 0)
+
 """
 MKLDNN backend switch
 """
@@ -39,6 +185,10 @@ enable_batch_normalization = True
 enable_sgd = True
 cosim_enabled = False
 
+# Whether the last decision of the enable_*F functions chose MKLDNN. Function
+# hooks reset and read it to know which implementation a function ran.
+mkldnn_dispatched = None
+
 supportTypes = (numpy.float32,)
 
 
@@ -71,53 +221,59 @@ def enable_cosim():
     return mkldnn_enabled and cosim_enabled
 
 
+def _dispatch(tul, enabled):
+    global mkldnn_dispatched
+    mkldnn_dispatched = mkldnn_enabled and SupportedInput(tul) and enabled
+    return mkldnn_dispatched
+
+
 def enable_convF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_conv
+    return _dispatch(tul, enable_conv)
 
 
 def enable_deconvF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_deconv
+    return _dispatch(tul, enable_deconv)
 
 
 def enable_max_poolingF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_max_pooling
+    return _dispatch(tul, enable_max_pooling)
 
 
 def enable_avg_poolingF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_avg_pooling
+    return _dispatch(tul, enable_avg_pooling)
 
 
 def enable_lrnF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_lrn
+    return _dispatch(tul, enable_lrn)
 
 
 def enable_reluF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_relu
+    return _dispatch(tul, enable_relu)
 
 
 def enable_softmaxF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_softmax
+    return _dispatch(tul, enable_softmax)
 
 
 def enable_linearF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_linear
+    return _dispatch(tul, enable_linear)
 
 
 def enable_softmax_cross_entropyF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_softmax_cross_entropy
+    return _dispatch(tul, enable_softmax_cross_entropy)
 
 
 def enable_concatF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_concat
+    return _dispatch(tul, enable_concat)
 
 
 def enable_acc_gradF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_acc_grad
+    return _dispatch(tul, enable_acc_grad)
 
 
 def enable_batch_normalizationF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_batch_normalization
+    return _dispatch(tul, enable_batch_normalization)
 
 
 def enable_sgdF(tul):
-        return mkldnn_enabled and SupportedInput(tul) and enable_sgd
+    return _dispatch(tul, enable_sgd)
@@ -5,6 +5,7 @@ import six
 
 from chainer import cuda
 import chainer.link as link_module
+from chainer import serializer as serializer_module
 
 
 def _sum_sqnorm(arr):
@@ -27,6 +28,208 @@ def exponential_decay_noise(xp, shape, dtype, hook, opt):
     return xp.random.normal(0, std, shape).astype(dtype)
 
 
+def _merge_sparse_grad(param):
+    # Adds the row-sparse gradient to the dense one
+    sparse_grad = param.sparse_grad
+    if param.grad is None:
+        param.grad = sparse_grad.to_dense()
+    else:
+        sparse_grad.add_to(param.grad)
+    param.sparse_grad = None
+
+
+def _fused_group_key(param, state):
+    data = param.data
+    if not isinstance(data, (numpy.ndarray, cuda.ndarray)):
+        return None
+    for value in six.itervalues(state):
+        if (type(value) is not type(data) or value.shape != data.shape or
+                value.dtype != data.dtype):
+            return None
+    return (int(cuda.get_device(data)), data.dtype.str,
+            tuple(sorted(state)))
+
+
+def _address(a):
+    if isinstance(a, numpy.ndarray):
+        return a.ctypes.data
+    return a.data.ptr
+
+
+def _flat_buffer(arrays):
+    """Returns a flat view on which the arrays lie back to back, or None."""
+    first = arrays[0]
+    base = first.base
+    if (type(base) is not type(first) or base.dtype != first.dtype or
+            not base.flags.c_contiguous):
+        return None
+    itemsize = first.dtype.itemsize
+    start, rem = divmod(_address(first) - _address(base), itemsize)
+    if rem:
+        return None
+    end = start
+    for a in arrays:
+        if (a.base is not base or not a.flags.c_contiguous or
+                _address(a) != _address(base) + end * itemsize):
+            return None
+        end += a.size
+    return base.reshape(-1)[start:end]
+
+
+class _FusedParam(object):
+
+    """Pair of flat data and gradient buffers passed to update rules."""
+
+    def __init__(self, data, grad):
+        self.data = data
+        self.grad = grad
+
+
+class _FusedLayout(object):
+
+    """Packs parameters, gradients and states into flat buffers.
+
+    Parameters of the same device and dtype whose states consist of arrays of
+    their own shape form a group. The data, gradient and state arrays of the
+    members of a group are rebound to views of flat buffers of the group, so
+    that an elementwise update rule can be applied to all of them at once.
+    The other parameters are updated one by one.
+
+    If the data arrays of a group already lie back to back in one buffer,
+    e.g. in the shared memory of
+    :class:`~chainer.training.updater.CPUParallelUpdater`, the buffer is used
+    as it is. Otherwise, data arrays that are views of memory not owned by a
+    previous layout are left as they are and updated one by one, since
+    rebinding them would detach them from the memory they share.
+
+    """
+
+    def __init__(self, named_params, states, previous=None):
+        self.params = [param for _, param in named_params]
+        self.entries = []  # (param, data view, grad view) of each member
+        self.groups = []  # (fused param, flat states, state buffers)
+        self.unfused = []  # (param, state)
+
+        owned = set()
+        if previous is not None:
+            owned.update(id(fused.data) for fused, _, _ in previous.groups)
+
+        members = collections.OrderedDict()
+        for name, param in named_params:
+            state = states[name]
+            key = _fused_group_key(param, state)
+            if key is None:
+                self.unfused.append((param, state))
+            else:
+                members.setdefault(key, []).append((param, state))
+
+        for (_, _, keys), group in six.iteritems(members):
+            with cuda.get_device(group[0][0].data):
+                data = _flat_buffer([param.data for param, _ in group])
+                if data is None:
+                    movable = []
+                    for param, state in group:
+                        base = param.data.base
+                        if base is None or id(base) in owned:
+                            movable.append((param, state))
+                        else:
+                            self.unfused.append((param, state))
+                    group = movable
+                if group:
+                    self._pack(group, keys, data)
+
+    def _pack(self, group, keys, data=None):
+        first = group[0][0].data
+        xp = cuda.get_array_module(first)
+        total = sum(param.data.size for param, _ in group)
+        rebind = data is None
+        if rebind:
+            data = xp.empty(total, dtype=first.dtype)
+        grad = xp.empty(total, dtype=first.dtype)
+        buffers = dict((key, xp.empty(total, dtype=first.dtype))
+                       for key in keys)
+
+        offset = 0
+        for param, state in group:
+            shape = param.data.shape
+            end = offset + param.data.size
+            if rebind:
+                data[offset:end] = param.data.ravel()
+                param.data = data[offset:end].reshape(shape)
+            if param.grad is None:
+                grad[offset:end] = 0
+            else:
+                grad[offset:end] = param.grad.ravel()
+            param.grad = grad[offset:end].reshape(shape)
+            for key in keys:
+                buf = buffers[key]
+                buf[offset:end] = state[key].ravel()
+                state[key] = buf[offset:end].reshape(shape)
+            self.entries.append((param, param.data, param.grad))
+            offset = end
+
+        self.groups.append((_FusedParam(data, grad), dict(buffers), buffers))
+
+    def matches(self, named_params):
+        if len(named_params) != len(self.params):
+            return False
+        for (_, param), old in six.moves.zip(named_params, self.params):
+            if param is not old:
+                return False
+        for param, data, _ in self.entries:
+            if param.data is not data:
+                return False
+        return True
+
+    def zero_grads(self):
+        for param, _, grad in self.entries:
+            param._grad = grad
+            param.sparse_grad = None
+        for fused, _, _ in self.groups:
+            with cuda.get_device(fused.grad):
+                fused.grad.fill(0)
+        for param, _ in self.unfused:
+            param.cleargrad()
+
+    def collect_grads(self):
+        """Makes the gradient arrays views of the flat buffers again."""
+        for param, _, grad in self.entries:
+            g = param._grad
+            if g is not grad:
+                with cuda.get_device(grad):
+                    if g is None:
+                        grad.fill(0)
+                    else:
+                        grad[...] = g
+                param._grad = grad
+            if param.sparse_grad is not None:
+                _merge_sparse_grad(param)
+        for param, _ in self.unfused:
+            if param.sparse_grad is not None:
+                _merge_sparse_grad(param)
+            if param.grad is None:
+                with cuda.get_device(param.data):
+                    xp = cuda.get_array_module(param.data)
+                    param.grad = xp.zeros_like(param.data)
+
+    def hook_params(self):
+        return ([fused for fused, _, _ in self.groups] +
+                [param for param, _ in self.unfused])
+
+    def update(self, optimizer):
+        for fused, state, buffers in self.groups:
+            with cuda.get_device(fused.data):
+                optimizer.update_one(fused, state)
+                # Some update rules replace the state arrays
+                for key, buf in six.iteritems(buffers):
+                    if state[key] is not buf:
+                        buf[...] = state[key]
+                        state[key] = buf
+        for param, state in self.unfused:
+            with cuda.get_device(param.data):
+                optimizer._update_one_dense(param, state)
+
+
 class Optimizer(object):
     """Base class of all numerical optimizers.
 
@@ -78,6 +281,8 @@ class Optimizer(object):
         self.epoch = 0
         self._states = {}
         self._hooks = collections.OrderedDict()
+        self._fused_layout = None
+        self._hooked_params = None
 
         self.prepare()
 
@@ -241,6 +446,14 @@ class Optimizer(object):
         for hook in six.itervalues(self._hooks):
             hook(self)
 
+    def _hook_params(self):
+        # Parameters that the hook functions defined in this module process.
+        # They are the flat buffers during a fused update.
+        params = getattr(self, '_hooked_params', None)
+        if params is None:
+            return self.target.params()
+        return params
+
     def serialize(self, serializer):
         """Serializes or deserializes the optimizer.
 
@@ -259,10 +472,31 @@ class Optimizer(object):
         """
         self.t = serializer('t', self.t)
         self.epoch = serializer('epoch', self.epoch)
+        saving = isinstance(serializer, serializer_module.Serializer)
+        loaded_t_row = False
         for name, state in six.iteritems(self._states):
             s = serializer[name]
             for key, value in six.iteritems(state):
-                state[key] = s(key, value)
+                if key != 't_row':
+                    state[key] = s(key, value)
+            # 't_row' is created by the first lazy update, so either of the
+            # state and the snapshot may lack it.
+            if saving:
+                if 't_row' in state:
+                    state['t_row'] = s('t_row', state['t_row'])
+                continue
+            try:
+                t_row = s('t_row', None)
+            except KeyError:
+                t_row = None
+            if t_row is None:
+                state.pop('t_row', None)
+            else:
+                state['t_row'] = numpy.array(t_row, dtype=numpy.int64)
+                loaded_t_row = True
+        if loaded_t_row:
+            # Moves the loaded arrays to the devices of the parameters
+            self.prepare()
 
     def zero_grads(self):
         """Fills all gradient arrays by zeros.
@@ -385,19 +619,44 @@ class GradientMethod(Optimizer):
         :meth:`update_one_gpu`).
 
         """
+        fused = getattr(self, '_use_fused_update', False)
+        layout = None
         if lossfun is not None:
             use_cleargrads = getattr(self, '_use_cleargrads', False)
             loss = lossfun(*args, **kwds)
-            if use_cleargrads:
+            if fused:
+                layout = self._get_fused_layout()
+                layout.zero_grads()
+            elif use_cleargrads:
                 self.target.cleargrads()
             else:
                 self.target.zerograds()
             loss.backward()
             del loss
 
+        if fused:
+            if layout is None:
+                layout = self._get_fused_layout()
+            layout.collect_grads()
+            self._hooked_params = layout.hook_params()
+            try:
+                self.call_hooks()
+            finally:
+                self._hooked_params = None
+            self.t += 1
+            layout.update(self)
+            return
+
+        # Row-sparse gradients are kept as they are only if no hook function
+        # has to see the dense gradients.
+        keep_sparse = not self._hooks
         # TODO(unno): Some optimizers can skip this process if they does not
         # affect to a parameter when its gradient is zero.
         for name, param in self.target.namedparams():
+            if param.sparse_grad is not None:
+                if param.grad is None and keep_sparse:
+                    continue
+                _merge_sparse_grad(param)
             if param.grad is None:
                 with cuda.get_device(param.data):
                     xp = cuda.get_array_module(param.data)
@@ -410,7 +669,19 @@ class GradientMethod(Optimizer):
         states = self._states
         for name, param in self.target.namedparams():
             with cuda.get_device(param.data):
-                self.update_one(param, states[name])
+                if param.sparse_grad is not None:
+                    self.update_one_sparse(param, states[name])
+                else:
+                    self._update_one_dense(param, states[name])
+
+    def _get_fused_layout(self):
+        named_params = list(self.target.namedparams())
+        layout = getattr(self, '_fused_layout', None)
+        if layout is None or not layout.matches(named_params):
+            self.prepare()
+            layout = _FusedLayout(named_params, self._states, layout)
+            self._fused_layout = layout
+        return layout
 
     def update_one(self, param, state):
         """Updates a parameter based on the corresponding gradient and state.
@@ -428,6 +699,84 @@ class GradientMethod(Optimizer):
         else:
             self.update_one_gpu(param, state)
 
+    def update_one_sparse(self, param, state):
+        """Updates a parameter based on its row-sparse gradient.
+
+        This method is called instead of :meth:`update_one` for a parameter
+        whose gradient is only given by
+        :attr:`~chainer.Variable.sparse_grad`, which happens only if no hook
+        function is registered. The default implementation converts it to a
+        dense gradient and calls :meth:`update_one`. Optimizers can override
+        it to update only the rows of the gradient.
+
+        Args:
+            param (~chainer.Variable): Parameter variable.
+            state (dict): State dictionary.
+
+        """
+        _merge_sparse_grad(param)
+        self._update_one_dense(param, state)
+
+    def _update_one_dense(self, param, state):
+        t_row = state.get('t_row')
+        if t_row is None:
+            self.update_one(param, state)
+            return
+        # The rows left behind by the lazy update have to catch up before
+        # all of them are updated at once.
+        self.catch_up_one(param, state, self.t - 1)
+        self.update_one(param, state)
+        t_row.fill(self.t)
+
+    def _skipped_steps(self, param, state, rows, until):
+        """Returns the numbers of steps skipped by rows up to ``until``.
+
+        The rows are marked as updated at the current step. The step counts
+        are kept in the ``'t_row'`` entry of the state, which is created on
+        the first call.
+
+        """
+        t_row = state.get('t_row')
+        if t_row is None:
+            xp = cuda.get_array_module(param.data)
+            t_row = xp.full(len(param.data), self.t - 1, dtype=numpy.int64)
+            state['t_row'] = t_row
+        skipped = until - t_row[rows]
+        t_row[rows] = self.t
+        return skipped
+
+    def catch_up_one(self, param, state, until):
+        """Applies the updates skipped by the lazy update of a parameter.
+
+        It is called for a parameter updated by :meth:`update_one_sparse` in
+        the lazy mode (see :meth:`use_lazy_update`) to bring all of its rows
+        up to date. Optimizers supporting the lazy mode override it, while the
+        default implementation does nothing.
+
+        Args:
+            param (~chainer.Variable): Parameter variable.
+            state (dict): State dictionary.
+            until (int): Step count up to which the updates are applied.
+
+        """
+        pass
+
+    def catch_up(self):
+        """Brings all the rows of lazily updated parameters up to date.
+
+        It applies the updates that the lazy mode has postponed for the rows
+        not touched by recent gradients (see :meth:`use_lazy_update`). Call
+        it before evaluating or saving the target link to make it reflect
+        all the steps taken so far.
+
+        """
+        states = self._states
+        for name, param in self.target.namedparams():
+            state = states.get(name)
+            if state is not None and 't_row' in state:
+                with cuda.get_device(param.data):
+                    self.catch_up_one(param, state, self.t)
+
     def update_one_cpu(self, param, state):
         """Updates a parameter on CPU.
 
@@ -465,6 +814,88 @@ class GradientMethod(Optimizer):
         """
         self._use_cleargrads = use
 
+    def use_fused_update(self, use=True):
+        """Enables or disables the fused update over flat buffers.
+
+        In the fused mode, the optimizer packs the data, gradient and state
+        arrays of all parameters sharing a device and a dtype into contiguous
+        flat buffers, and the arrays of each parameter become views of them.
+        Data arrays that already lie back to back in one buffer, e.g. the
+        shared memory of :class:`~chainer.training.CPUParallelUpdater`, are
+        used in place, and the other views of foreign memory are not packed.
+        Then :meth:`update_one` is called once per buffer instead of once per
+        parameter, which removes the Python overhead of updating many small
+        parameters. The hook functions defined in :mod:`chainer.optimizer`
+        also process the flat buffers.
+
+        The buffers are rebuilt when the set of parameters changes or a data
+        array is replaced, e.g. by :meth:`~chainer.Link.to_gpu`. If
+        ``lossfun`` is given to :meth:`update`, the gradient buffers are
+        cleared in place instead of calling :meth:`~chainer.Link.cleargrads`,
+        so that the backward computation accumulates into them. Otherwise,
+        the gradient arrays that are not views of the buffers are copied into
+        them on each update.
+
+        Args:
+            use (bool): If ``True``, this function enables the fused update.
+
+        .. note::
+           It requires :meth:`update_one` to be an elementwise operation that
+           updates the arrays in place, which holds for all the built-in
+           optimizers. Parameters whose states are not arrays of their own
+           shape are updated one by one.
+
+        """
+        self._use_fused_update = use
+        if not use:
+            self._fused_layout = None
+
+    def use_lazy_update(self, use=True):
+        """Enables or disables the lazy update of row-sparse gradients.
+
+        A parameter is row-sparse on an update if its gradient is only given
+        by :attr:`~chainer.Variable.sparse_grad`, e.g. the weight of
+        :class:`~chainer.links.EmbedID` with ``sparse_grad=True``. By default,
+        the optimizers whose states decay on every step (e.g. momentum and
+        moving averages) still update all the rows of such a parameter, so
+        that the result equals the dense update. In the lazy mode,
+        :meth:`update_one_sparse` only touches the rows of the gradient, and
+        the cost of a step scales with the number of these rows instead of
+        the size of the parameter.
+
+        The step at which each row was last updated is kept in the
+        ``'t_row'`` entry of the state. When a row is touched again, the
+        steps it skipped are applied to it in closed form before the current
+        gradient. All the rows are also brought up to date before a dense
+        update of the parameter and by :meth:`catch_up`. The entry is saved
+        and restored by :meth:`serialize`, so that a resumed optimizer still
+        applies the postponed steps. The catch-up
+        semantics of the built-in optimizers are as follows.
+
+        - :class:`~chainer.optimizers.SGD`,
+          :class:`~chainer.optimizers.AdaGrad`: No step with zero gradient
+          changes a row, so the sparse update is always exact.
+        - :class:`~chainer.optimizers.MomentumSGD`,
+          :class:`~chainer.optimizers.RMSprop`: The skipped steps are applied
+          exactly (up to rounding errors), i.e. the velocity keeps moving a
+          row and decays, or the mean square decays.
+        - :class:`~chainer.optimizers.Adam`: The moment estimates are
+          decayed exactly, while the parameter updates of the skipped steps
+          are omitted. The result differs from the dense update in this
+          respect.
+
+        The other optimizers update the whole parameter densely.
+
+        Args:
+            use (bool): If ``True``, this function enables the lazy update.
+
+        .. note::
+           The rows not touched for a while are stale until they are caught
+           up. Call :meth:`catch_up` before evaluating the target link.
+
+        """
+        self._use_lazy_update = use
+
 
 class WeightDecay(object):
     """Optimizer hook function for weight decay regularization.
@@ -490,7 +921,7 @@ class WeightDecay(object):
 
     def __call__(self, opt):
         rate = self.rate
-        for param in opt.target.params():
+        for param in opt._hook_params():
             p, g = param.data, param.grad
             with cuda.get_device(p) as dev:
                 if int(dev) == -1:
@@ -523,7 +954,7 @@ class Lasso(object):
 
     def __call__(self, opt):
         rate = self.rate
-        for param in opt.target.params():
+        for param in opt._hook_params():
             p, g = param.data, param.grad
             xp = cuda.get_array_module(p)
             sign = xp.sign(p)
@@ -553,10 +984,11 @@ class GradientClipping(object):
         self.threshold = threshold
 
     def __call__(self, opt):
-        norm = numpy.sqrt(_sum_sqnorm([p.grad for p in opt.target.params()]))
+        params = list(opt._hook_params())
+        norm = numpy.sqrt(_sum_sqnorm([p.grad for p in params]))
         rate = self.threshold / norm
         if rate < 1:
-            for param in opt.target.params():
+            for param in params:
                 grad = param.grad
                 with cuda.get_device(grad):
                     grad *= rate
@@ -601,7 +1033,7 @@ class GradientNoise(object):
             'T noise', 'T g', 'g += noise', 'gradient_noise')
 
     def __call__(self, opt):
-        for param in opt.target.params():
+        for param in opt._hook_params():
             g = param.grad
             xp = cuda.get_array_module(g)
             with cuda.get_device(g) as dev:
@@ -635,7 +1067,7 @@ class GradientHardClipping(object):
 
     def __call__(self, opt):
         xp = opt.target.xp
-        for param in opt.target.params():
+        for param in opt._hook_params():
             grad = param.grad
             with cuda.get_device(grad):
                 xp.clip(grad, self.lower_bound, self.upper_bound, out=grad)
@@ -28,6 +28,15 @@ class AdaGrad(optimizer.GradientMethod):
         h += grad * grad
         param.data -= self.lr * grad / (numpy.sqrt(h) + self.eps)
 
+    def update_one_sparse(self, param, state):
+        # The rows with no gradient are not changed
+        grad = param.sparse_grad
+        rows, g = grad.indices, grad.values
+        h = state['h']
+        h_rows = h[rows] + g * g
+        h[rows] = h_rows
+        param.data[rows] -= self.lr * g / (numpy.sqrt(h_rows) + self.eps)
+
     def update_one_gpu(self, param, state):
         cuda.elementwise(
             'T grad, T lr, T eps',
@@ -34,6 +34,37 @@ class Adam(optimizer.GradientMethod):
         v += (1 - self.beta2) * (grad * grad - v)
         param.data -= self.lr * m / (numpy.sqrt(v) + self.eps)
 
+    def update_one_sparse(self, param, state):
+        if not getattr(self, '_use_lazy_update', False):
+            super(Adam, self).update_one_sparse(param, state)
+            return
+        grad = param.sparse_grad
+        rows, g = grad.indices, grad.values
+        m_rows, v_rows = self._catch_up_rows(param, state, rows, self.t - 1)
+        m_rows += (1 - self.beta1) * (g - m_rows)
+        v_rows += (1 - self.beta2) * (g * g - v_rows)
+        state['m'][rows] = m_rows
+        state['v'][rows] = v_rows
+        param.data[rows] -= self.lr * m_rows / (numpy.sqrt(v_rows) + self.eps)
+
+    def catch_up_one(self, param, state, until):
+        rows = slice(None)
+        m_rows, v_rows = self._catch_up_rows(param, state, rows, until)
+        state['m'][rows] = m_rows
+        state['v'][rows] = v_rows
+
+    def _catch_up_rows(self, param, state, rows, until):
+        # Only the moments decay; the skipped parameter updates are omitted
+        skipped = self._skipped_steps(param, state, rows, until)
+        m_rows, v_rows = state['m'][rows], state['v'][rows]
+        if skipped.any():
+            shape = (-1,) + (1,) * (m_rows.ndim - 1)
+            m_rows *= (self.beta1 ** skipped).astype(
+                m_rows.dtype).reshape(shape)
+            v_rows *= (self.beta2 ** skipped).astype(
+                v_rows.dtype).reshape(shape)
+        return m_rows, v_rows
+
     def update_one_gpu(self, param, state):
         cuda.elementwise(
             'T grad, T lr, T one_minus_beta1, T one_minus_beta2, T eps',
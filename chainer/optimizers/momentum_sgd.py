@@ -8,6 +8,13 @@ if mkld.mkldnn_enabled:
     mkldnn = mkld.mkldnn
 
 
+def _geometric_sum(ratio, n):
+    # ratio + ratio ** 2 + ... + ratio ** n for each element of n
+    if ratio == 1:
+        return n.astype(numpy.float64)
+    return ratio * (1 - ratio ** n) / (1 - ratio)
+
+
 class MomentumSGD(optimizer.GradientMethod):
 
     """Classical momentum SGD."""
@@ -53,6 +60,39 @@ class MomentumSGD(optimizer.GradientMethod):
             v -= self.lr * param.grad
             param.data += v
 
+    def update_one_sparse(self, param, state):
+        grad = param.sparse_grad
+        rows = grad.indices
+        if getattr(self, '_use_lazy_update', False):
+            v_rows = self._catch_up_rows(param, state, rows, self.t - 1)
+            v_rows *= self.momentum
+            v_rows -= self.lr * grad.values
+            state['v'][rows] = v_rows
+            param.data[rows] += v_rows
+        elif 't_row' in state:
+            super(MomentumSGD, self).update_one_sparse(param, state)
+        else:
+            v = state['v']
+            v *= self.momentum
+            v[rows] -= self.lr * grad.values
+            param.data += v
+
+    def catch_up_one(self, param, state, until):
+        rows = slice(None)
+        state['v'][rows] = self._catch_up_rows(param, state, rows, until)
+
+    def _catch_up_rows(self, param, state, rows, until):
+        # Each skipped step decays the velocity and adds it to the parameter
+        skipped = self._skipped_steps(param, state, rows, until)
+        v_rows = state['v'][rows]
+        if skipped.any():
+            shape = (-1,) + (1,) * (v_rows.ndim - 1)
+            drift = _geometric_sum(self.momentum, skipped).reshape(shape)
+            param.data[rows] += (v_rows * drift).astype(v_rows.dtype)
+            v_rows *= (self.momentum ** skipped).astype(
+                v_rows.dtype).reshape(shape)
+        return v_rows
+
     def update_one_gpu(self, param, state):
         cuda.elementwise(
             'T grad, T lr, T momentum',
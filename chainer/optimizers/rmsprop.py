@@ -26,6 +26,32 @@ class RMSprop(optimizer.GradientMethod):
         ms += (1 - self.alpha) * grad * grad
         param.data -= self.lr * grad / (numpy.sqrt(ms) + self.eps)
 
+    def update_one_sparse(self, param, state):
+        if not getattr(self, '_use_lazy_update', False):
+            super(RMSprop, self).update_one_sparse(param, state)
+            return
+        grad = param.sparse_grad
+        rows, g = grad.indices, grad.values
+        ms_rows = self._catch_up_rows(param, state, rows, self.t - 1)
+        ms_rows *= self.alpha
+        ms_rows += (1 - self.alpha) * g * g
+        state['ms'][rows] = ms_rows
+        param.data[rows] -= self.lr * g / (numpy.sqrt(ms_rows) + self.eps)
+
+    def catch_up_one(self, param, state, until):
+        rows = slice(None)
+        state['ms'][rows] = self._catch_up_rows(param, state, rows, until)
+
+    def _catch_up_rows(self, param, state, rows, until):
+        # A step with zero gradient only decays the mean square
+        skipped = self._skipped_steps(param, state, rows, until)
+        ms_rows = state['ms'][rows]
+        if skipped.any():
+            shape = (-1,) + (1,) * (ms_rows.ndim - 1)
+            ms_rows *= (self.alpha ** skipped).astype(
+                ms_rows.dtype).reshape(shape)
+        return ms_rows
+
     def update_one_gpu(self, param, state):
         cuda.elementwise(
             'T grad, T lr, T alpha, T eps',
@@ -40,6 +40,10 @@ class SGD(optimizer.GradientMethod):
         else:
             param.data -= self.lr * param.grad
 
+    def update_one_sparse(self, param, state):
+        grad = param.sparse_grad
+        param.data[grad.indices] -= self.lr * grad.values
+
     def update_one_gpu(self, param, state):
         cuda.elementwise('T grad, T lr', 'T param',
                          'param -= lr * grad',
@@ -0,0 +1,406 @@
+import collections
+import copy
+import sys
+import weakref
+
+import numpy
+import six
+
+import chainer
+from chainer import configuration
+from chainer import cuda
+from chainer import function
+from chainer import utils
+from chainer import variable
+
+
+def _is_array(x):
+    return isinstance(x, (numpy.ndarray, cuda.ndarray))
+
+
+def _arg_key(x):
+    if isinstance(x, variable.Variable):
+        return ('v', x.shape, x.dtype, str(x.volatile))
+    if _is_array(x):
+        return ('a', type(x), x.shape, x.dtype)
+    hash(x)
+    return ('o', type(x), x)
+
+
+def _is_unshared(buffers, index):
+    buf = buffers[index]
+    # The list entry, ``buf`` and the argument of getrefcount are the only
+    # references to the buffer when no view of it is alive.
+    return buf is not None and sys.getrefcount(buf) == 3
+
+
+class _Recorder(function.FunctionHook):
+
+    def __init__(self, name):
+        self.name = name
+        self.functions = []
+        self.initial_states = {}
+
+    def forward_preprocess(self, function, in_data):
+        self.initial_states[id(function)] = dict(function.__dict__)
+
+    def forward_postprocess(self, function, in_data):
+        self.functions.append(function)
+
+
+class _Trace(object):
+
+    """Flat program of a function application recorded on the first call.
+
+    The values of a replay are kept in a single list. The first ``n_in``
+    entries are the inputs of the trace, and the outputs of each step are
+    stored in the consecutive entries following them.
+
+    """
+
+    def __init__(self, steps, initial_states, n_in, n_values, out_indices,
+                 consts, out_type):
+        self.steps = steps
+        self.initial_states = initial_states
+        self.n_in = n_in
+        self.n_values = n_values
+        self.out_indices = out_indices
+        self.consts = consts
+        self.out_type = out_type
+        self.grad_buffers = [None] * n_values
+
+
+class _StaticGraphFunction(function.Function):
+
+    def __init__(self, trace):
+        self.trace = trace
+        self._values = None
+
+    @property
+    def label(self):
+        return 'StaticGraph'
+
+    def forward(self, inputs):
+        trace = self.trace
+        values = list(inputs)
+        values.extend([None] * (trace.n_values - trace.n_in))
+        for (func, in_indices, out_start, _), initial_state in six.moves.zip(
+                trace.steps, trace.initial_states):
+            # Drops the state left by the previous call, e.g. dropout masks
+            # and negative samples, which forward would reuse otherwise.
+            attrs = func.__dict__
+            attrs.clear()
+            attrs.update(initial_state)
+            func.mkldnn_opt = False
+            outputs = func.forward(tuple([values[i] for i in in_indices]))
+            values[out_start:out_start + len(outputs)] = outputs
+        self._values = values
+        return tuple([values[i] for i in trace.out_indices])
+
+    def backward(self, inputs, grad_outputs):
+        trace = self.trace
+        values = self._values
+        n_in = trace.n_in
+        grads = [None] * trace.n_values
+        buffers = trace.grad_buffers
+        need_copy = set()
+        for i, gy in zip(trace.out_indices, grad_outputs):
+            grads[i] = gy
+
+        conv = chainer.functions.connection.convolution_2d
+        for func, in_indices, out_start, n_out in reversed(trace.steps):
+            out_end = out_start + n_out
+            out_grad = tuple(grads[out_start:out_end])
+            if all(gy is None for gy in out_grad):
+                continue
+            grads[out_start:out_end] = [None] * (out_end - out_start)
+
+            if isinstance(func, conv.Convolution2DFunction):
+                x = in_indices[0]
+                if (x < n_in and self.inputs[x].creator is None and
+                        func.in_chain is True):
+                    func.mkldnn_opt = True
+
+            in_data = tuple([values[i] for i in in_indices])
+            gxs = func.backward(in_data, out_grad)
+            assert len(gxs) == len(in_indices)
+            for i, gx in zip(in_indices, gxs):
+                if gx is None:
+                    continue
+                if grads[i] is None:  # 1st visit
+                    grads[i] = gx
+                    need_copy.add(i)
+                elif i in need_copy:  # 2nd visit
+                    buf = None
+                    if i >= n_in and _is_unshared(buffers, i):
+                        buf = buffers[i]
+                    if (buf is not None and buf.shape == gx.shape and
+                            buf.dtype == gx.dtype and
+                            type(buf) is type(gx)):
+                        cuda.get_array_module(gx).add(grads[i], gx, out=buf)
+                    else:
+                        buf = utils.force_array(grads[i] + gx)
+                        if i >= n_in:
+                            buffers[i] = buf
+                    grads[i] = buf
+                    need_copy.remove(i)
+                else:  # 3rd or later visit
+                    grads[i] += gx
+            del gxs
+
+        self._values = None
+        return tuple(grads[:n_in])
+
+
+class StaticGraph(object):
+
+    """Callable that replays the computational graph of a fixed network.
+
+    This is a wrapper of a callable (typically a :class:`~chainer.Link`) that
+    applies :class:`~chainer.Function` objects to its arguments. On the first
+    call with a given *signature*, the callable is run in the usual
+    define-by-run manner, and the sequence of functions applied in it is
+    recorded. Later calls with the same signature skip the callable entirely:
+    the recorded functions are executed as a flat list of
+    :meth:`~chainer.Function.forward` calls, and the whole trace is put into
+    the computational graph as a single function whose backward runs the
+    recorded :meth:`~chainer.Function.backward` calls in reverse order. It
+    removes the overhead of creating variables, checking types and ordering
+    the graph on every iteration of a training loop of fixed shape.
+
+    The signature consists of the shapes, dtypes and volatile flags of the
+    array and variable arguments, the values of the other arguments, and the
+    ``train`` and ``enable_backprop`` configurations. Any change of them
+    causes a new trace to be recorded. The callable is always run in the
+    define-by-run manner in the following cases.
+
+    - An argument is not hashable.
+    - The callable returns something other than a variable or a tuple or list
+      of variables, or it does not build a computational graph.
+    - A function object is applied twice in the callable.
+    - The debug mode is on.
+    - The output of the previous replay is still waiting for its backward
+      computation.
+
+    Inputs that are neither arguments nor outputs of the recorded functions,
+    e.g. parameters of links, are captured by reference on recording, and
+    their current :data:`~chainer.Variable.data` is used on each replay. On
+    the other hand, control flow that depends on anything other than the
+    signature (e.g. values of the input arrays) is *not* detected, and Python
+    side effects of the callable such as :func:`chainer.report` are not
+    replayed. The arguments must only be consumed through functions, as
+    arrays derived from them outside of functions are treated as constants.
+    Function hooks see a replay as one function labeled ``StaticGraph``.
+
+    Args:
+        func (callable): Callable to wrap.
+        max_graphs (int): Maximum number of signatures whose traces are
+            kept. The least recently used one is discarded when it is
+            exceeded. ``None`` means unlimited.
+
+    .. admonition:: Example
+
+       >>> model = L.Linear(3, 2)
+       >>> forward = chainer.static_graph(model)
+       >>> x = numpy.ones((4, 3), 'f')
+       >>> t = numpy.zeros(4, 'i')
+       >>> for _ in range(2):
+       ...     model.cleargrads()
+       ...     loss = F.softmax_cross_entropy(forward(x), t)
+       ...     loss.backward()
+
+    .. seealso:: :func:`static_graph`
+
+    """
+
+    def __init__(self, func, max_graphs=8):
+        self.func = func
+        self.max_graphs = max_graphs
+        self._traces = collections.OrderedDict()
+        self._active = None
+        self._bound = weakref.WeakKeyDictionary()
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        graph = self._bound.get(instance)
+        if graph is None:
+            graph = StaticGraph(self.func.__get__(instance, owner),
+                                self.max_graphs)
+            self._bound[instance] = graph
+        return graph
+
+    def __call__(self, *args, **kwargs):
+        key = self._get_key(args, kwargs)
+        if key is None or chainer.is_debug() or self._is_busy():
+            return self.func(*args, **kwargs)
+
+        if key in self._traces:
+            trace = self._traces[key]
+            self._traces.pop(key)
+            self._traces[key] = trace
+            if trace is None:
+                return self.func(*args, **kwargs)
+            return self._replay(trace, args, kwargs)
+
+        trace, outputs = self._record(args, kwargs)
+        self._traces[key] = trace
+        if (self.max_graphs is not None and
+                len(self._traces) > self.max_graphs):
+            self._traces.popitem(last=False)
+        return outputs
+
+    def clear(self):
+        """Discards all recorded traces."""
+        self._traces.clear()
+        self._active = None
+        self._bound.clear()
+
+    def _get_key(self, args, kwargs):
+        config = configuration.config
+        try:
+            return (tuple([_arg_key(x) for x in args]),
+                    tuple(sorted((k, _arg_key(v))
+                                 for k, v in six.iteritems(kwargs))),
+                    bool(config.train), bool(config.enable_backprop))
+        except TypeError:
+            return None
+
+    def _is_busy(self):
+        if self._active is None:
+            return False
+        active = self._active()
+        return active is not None and active._values is not None
+
+    def _record(self, args, kwargs):
+        recorder = _Recorder('StaticGraphRecorder-%d' % id(self))
+        with recorder:
+            outputs = self.func(*args, **kwargs)
+        trace = self._build_trace(
+            recorder.functions, recorder.initial_states, args, outputs)
+        return trace, outputs
+
+    def _build_trace(self, functions, initial_states, args, outputs):
+        if isinstance(outputs, variable.Variable):
+            out_vars = (outputs,)
+        elif (isinstance(outputs, (tuple, list)) and outputs and
+              all(isinstance(y, variable.Variable) for y in outputs)):
+            out_vars = tuple(outputs)
+        else:
+            return None
+
+        recorded = set(id(f) for f in functions)
+        if len(recorded) != len(functions):
+            return None
+
+        # Find the recorded functions reachable from the outputs
+        needed = set()
+        stack = [y.creator for y in out_vars]
+        while stack:
+            f = stack.pop()
+            if f is None or id(f) not in recorded or id(f) in needed:
+                continue
+            if not hasattr(f, 'inputs'):
+                return None
+            needed.add(id(f))
+            stack.extend(x.creator for x in f.inputs)
+
+        indices = {}
+        n_args = 0
+        for x in args:
+            if isinstance(x, variable.Variable) or _is_array(x):
+                indices[id(x)] = n_args
+                n_args += 1
+
+        def arg_index(x):
+            if id(x) in indices:
+                return indices[id(x)]
+            if x.creator is None and id(x.data) in indices:
+                return indices[id(x.data)]
+            return None
+
+        # Inputs from outside of the trace are placed after the arguments
+        functions = [f for f in functions if id(f) in needed]
+        consts = []
+        for f in functions:
+            for x in f.inputs:
+                if (arg_index(x) is None and
+                        (x.creator is None or id(x.creator) not in needed) and
+                        id(x) not in indices):
+                    indices[id(x)] = n_args + len(consts)
+                    consts.append(x)
+        n_in = n_args + len(consts)
+
+        steps = []
+        states = []  # attributes of each step before the recorded forward
+        outs = []  # keeps the outputs alive so that their ids are unique
+        n_values = n_in
+        for f in functions:
+            in_indices = []
+            for x in f.inputs:
+                i = arg_index(x)
+                if i is None:
+                    i = indices[id(x)]
+                in_indices.append(i)
+            ys = [y() for y in f.outputs]
+            for j, y in enumerate(ys):
+                if y is not None:
+                    indices[id(y)] = n_values + j
+                    outs.append(y)
+            step = copy.copy(f)
+            for attr in ('inputs', 'outputs', 'rank'):
+                step.__dict__.pop(attr, None)
+            steps.append((step, tuple(in_indices), n_values, len(ys)))
+            states.append(initial_states[id(f)])
+            n_values += len(ys)
+
+        out_indices = []
+        for y in out_vars:
+            i = indices.get(id(y))
+            if i is None or i < n_in or i in out_indices:
+                return None
+            out_indices.append(i)
+        return _Trace(steps, states, n_in, n_values, tuple(out_indices),
+                      tuple(consts), type(outputs))
+
+    def _replay(self, trace, args, kwargs):
+        inputs = [x for x in args
+                  if isinstance(x, variable.Variable) or _is_array(x)]
+        inputs.extend(trace.consts)
+        func = _StaticGraphFunction(trace)
+        outputs = func(*inputs)
+        if func._values is not None:
+            self._active = weakref.ref(func)
+        if trace.out_type is variable.Variable:
+            return outputs
+        if isinstance(outputs, variable.Variable):
+            outputs = (outputs,)
+        return trace.out_type(outputs)
+
+
+def static_graph(func, max_graphs=8):
+    """Wraps a callable to replay its computational graph.
+
+    This is a shortcut of :class:`StaticGraph`. It can also be used as a
+    decorator of a function or a method.
+
+    .. admonition:: Example
+
+       >>> class MLP(chainer.Chain):
+       ...     def __init__(self):
+       ...         super(MLP, self).__init__(l1=L.Linear(3, 4),
+       ...                                   l2=L.Linear(4, 2))
+       ...
+       ...     @chainer.static_graph
+       ...     def __call__(self, x):
+       ...         return self.l2(F.relu(self.l1(x)))
+
+    Args:
+        func (callable): Callable to wrap.
+        max_graphs (int): Maximum number of signatures whose traces are kept.
+
+    Returns:
+        StaticGraph: The wrapped callable.
+
+    """
+    return StaticGraph(func, max_graphs)
@@ -11,6 +11,7 @@ from chainer.training.extensions import value_observation  # NOQA
 
 
 # import class and function
+from chainer.training.extensions._snapshot import AsyncSnapshotWriter  # NOQA
 from chainer.training.extensions._snapshot import snapshot  # NOQA
 from chainer.training.extensions._snapshot import snapshot_object  # NOQA
 from chainer.training.extensions.computational_graph import dump_graph  # NOQA
@@ -1,12 +1,17 @@
+import collections
 import os
 import shutil
 import tempfile
+import threading
+
+import numpy
+import six
 
 from chainer.serializers import npz
 from chainer.training import extension
 
 
-def snapshot_object(target, filename, savefun=npz.save_npz):
+def snapshot_object(target, filename, savefun=npz.save_npz, writer=None):
     """Returns a trainer extension to take snapshots of a given object.
 
     This extension serializes the given object and saves it to the output
@@ -29,20 +34,25 @@ def snapshot_object(target, filename, savefun=npz.save_npz):
             ``'snapshot_10000'`` at the 10,000th iteration.
         savefun: Function to save the object. It takes two arguments: the
             output file path and the object to serialize.
+        writer (AsyncSnapshotWriter): Writer to save the object in the
+            background. If it is given, ``savefun`` is not used and the object
+            is saved in the NPZ format by the writer.
 
     Returns:
         An extension function.
 
     """
-    @extension.make_extension(trigger=(1, 'epoch'), priority=-100)
+    @extension.make_extension(trigger=(1, 'epoch'), priority=-100,
+                              finalizer=_get_finalizer(writer))
     def snapshot_object(trainer):
-        _snapshot_object(trainer, target, filename.format(trainer), savefun)
+        _snapshot_object(trainer, target, filename.format(trainer), savefun,
+                         writer)
 
     return snapshot_object
 
 
 def snapshot(savefun=npz.save_npz,
-             filename='snapshot_iter_{.updater.iteration}'):
+             filename='snapshot_iter_{.updater.iteration}', writer=None):
     """Returns a trainer extension to take snapshots of the trainer.
 
     This extension serializes the trainer object and saves it to the output
@@ -69,17 +79,140 @@ def snapshot(savefun=npz.save_npz,
         filename (str): Name of the file into which the trainer is serialized.
             It can be a format string, where the trainer object is passed to
             the :meth:`str.format` method.
+        writer (AsyncSnapshotWriter): Writer to save the trainer in the
+            background. If it is given, ``savefun`` is not used and the
+            trainer is saved in the NPZ format by the writer.
 
     """
-    @extension.make_extension(trigger=(1, 'epoch'), priority=-100)
+    @extension.make_extension(trigger=(1, 'epoch'), priority=-100,
+                              finalizer=_get_finalizer(writer))
     def snapshot(trainer):
-        _snapshot_object(trainer, trainer, filename.format(trainer), savefun)
+        _snapshot_object(trainer, trainer, filename.format(trainer), savefun,
+                         writer)
 
     return snapshot
 
 
-def _snapshot_object(trainer, target, filename, savefun):
+class AsyncSnapshotWriter(object):
+
+    """Writer of snapshots running in a background thread.
+
+    This writer takes a snapshot of an object in two steps. The object is
+    first serialized into host arrays copied from the current parameters and
+    states, which is done in the training loop. The arrays are then saved in
+    the NPZ format to a temporary file, which is renamed to the target file,
+    by a background thread. Since the compression in the second step releases
+    the GIL, it runs in parallel to the training loop.
+
+    The snapshots waiting for being written are held in a bounded queue. When
+    the queue is full, a new snapshot blocks the training loop until a slot is
+    freed, which bounds the host memory used for the copies.
+
+    The writer is passed to :func:`snapshot` or :func:`snapshot_object`, which
+    call :meth:`finalize` at the end of the training loop. An error raised in
+    the background thread is re-raised at the next snapshot or at
+    :meth:`finalize`.
+
+    Args:
+        compression (bool): If ``True``, compression in the resulting zip file
+            is enabled.
+        n_retains (int): Number of latest snapshots written by this writer to
+            keep. Older ones are removed after a new one is written. If it is
+            ``None``, all snapshots are kept.
+        max_queue (int): Maximum number of snapshots waiting for being
+            written.
+
+    """
+
+    def __init__(self, compression=True, n_retains=None, max_queue=1):
+        self.compression = compression
+        self.n_retains = n_retains
+        self._queue = six.moves.queue.Queue(max_queue)
+        self._written = collections.deque()
+        self._thread = None
+        self._error = None
+
+    def __call__(self, outdir, filename, target):
+        """Takes a snapshot of an object and enqueues it to be written.
+
+        Args:
+            outdir (str): Output directory.
+            filename (str): Name of the snapshot file.
+            target: Object to serialize.
+
+        """
+        self._check_error()
+        s = npz.DictionarySerializer()
+        s.save(target)
+        # copy the arrays so that the training loop can update them while
+        # they are being written
+        arrays = {k: numpy.array(v) for k, v in six.iteritems(s.target)}
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+        self._queue.put((outdir, filename, arrays))
+
+    def finalize(self):
+        """Waits for all the pending snapshots to be written."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._check_error()
+
+    def _check_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue  # drop the pending snapshots after an error
+            try:
+                self._write(*item)
+            except Exception as e:
+                self._error = e
+
+    def _write(self, outdir, filename, arrays):
+        fd, tmppath = tempfile.mkstemp(prefix='tmp' + filename, dir=outdir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if self.compression:
+                    numpy.savez_compressed(f, **arrays)
+                else:
+                    numpy.savez(f, **arrays)
+        except Exception:
+            os.remove(tmppath)
+            raise
+        path = os.path.join(outdir, filename)
+        shutil.move(tmppath, path)
+
+        if path in self._written:
+            self._written.remove(path)
+        self._written.append(path)
+        if self.n_retains is not None:
+            while len(self._written) > self.n_retains:
+                old = self._written.popleft()
+                if os.path.exists(old):
+                    os.remove(old)
+
+
+def _get_finalizer(writer):
+    if writer is None:
+        return None
+    return writer.finalize
+
+
+def _snapshot_object(trainer, target, filename, savefun, writer=None):
     fn = filename.format(trainer)
+    if writer is not None:
+        writer(trainer.out, fn, target)
+        return
     prefix = 'tmp' + fn
     fd, tmppath = tempfile.mkstemp(prefix=prefix, dir=trainer.out)
     try:
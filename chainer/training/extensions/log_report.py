@@ -51,16 +51,25 @@ class LogReport(extension.Extension):
             formatting. For example, users can use '{iteration}' to separate
             the log files for different iterations. If the log name is None, it
             does not output the log to any file.
+        json_lines (bool): If ``True``, the log file is written in the
+            JSON-lines format, i.e., one JSON object per line. Each new result
+            is then appended to the file with a single write instead of
+            rewriting the whole log, so that the cost of an output does not
+            grow with the length of the training. The file can be read
+            incrementally with
+            :func:`~chainer.training.extensions.log_report.read_json_lines`.
 
     """
 
     def __init__(self, keys=None, trigger=(1, 'epoch'), postprocess=None,
-                 log_name='log'):
+                 log_name='log', json_lines=False):
         self._keys = keys
         self._trigger = trigger_module.get_trigger(trigger)
         self._postprocess = postprocess
         self._log_name = log_name
+        self._json_lines = json_lines
         self._log = []
+        self._stream_path = None  # the file the log is appended to
 
         self._init_summary()
 
@@ -95,12 +104,25 @@ class LogReport(extension.Extension):
             # write to the log file
             if self._log_name is not None:
                 log_name = self._log_name.format(**stats_cpu)
-                fd, path = tempfile.mkstemp(prefix=log_name, dir=trainer.out)
-                with os.fdopen(fd, 'w') as f:
-                    json.dump(self._log, f, indent=4)
-
                 new_path = os.path.join(trainer.out, log_name)
-                shutil.move(path, new_path)
+                if not self._json_lines:
+                    fd, path = tempfile.mkstemp(
+                        prefix=log_name, dir=trainer.out)
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(self._log, f, indent=4)
+                    shutil.move(path, new_path)
+                elif new_path == self._stream_path:
+                    _append_json_line(new_path, stats_cpu)
+                else:
+                    # The first output to this file (including one just after
+                    # resuming) writes the whole log, which is then appended.
+                    fd, path = tempfile.mkstemp(
+                        prefix=log_name, dir=trainer.out)
+                    with os.fdopen(fd, 'w') as f:
+                        for entry in self._log:
+                            f.write(json.dumps(entry) + '\n')
+                    shutil.move(path, new_path)
+                    self._stream_path = new_path
 
             # reset the summary for the next output
             self._init_summary()
@@ -119,6 +141,44 @@ class LogReport(extension.Extension):
         else:
             log = serializer('_log', '')
             self._log = json.loads(log)
+            self._stream_path = None
 
     def _init_summary(self):
         self._summary = reporter.DictSummary()
+
+
+def _append_json_line(path, entry):
+    line = (json.dumps(entry) + '\n').encode('utf-8')
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_json_lines(path, offset=0):
+    """Reads the entries appended to a JSON-lines log file.
+
+    This function reads the log written by :class:`LogReport` with
+    ``json_lines=True`` starting from the given byte offset. It returns the
+    new offset as well, so that a reader can follow the log by passing it to
+    the next call and parse only the newly appended entries. An incomplete
+    last line, e.g. one that is being written, is left for the next call.
+
+    Args:
+        path (str): Path to the log file.
+        offset (int): Byte offset to start reading from.
+
+    Returns:
+        tuple: A list of the observation dictionaries read from the file and
+        the offset just after the last complete line.
+
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    entries = [json.loads(line.decode('utf-8'))
+               for line in data[:end].splitlines() if line.strip()]
+    return entries, offset + end
@@ -1,4 +1,10 @@
 import copy
+import multiprocessing
+from multiprocessing import sharedctypes
+import os
+import traceback
+
+import numpy
 import six
 
 from chainer.dataset import convert
@@ -327,3 +333,236 @@ class ParallelUpdater(StandardUpdater):
 
         for model in six.itervalues(models_others):
             model.copyparams(model_main)
+
+
+class CPUParallelUpdater(StandardUpdater):
+
+    """Implementation of a multi-process data-parallel CPU Updater.
+
+    This is an implementation of :class:`Updater` that parallelizes the
+    gradient computation over worker processes on one machine. It behaves
+    similarly to :class:`~chainer.training.ParallelUpdater`: each mini-batch
+    is split into ``n_processes`` sub-batches ``batch[i::n_processes]``, the
+    gradients of the losses of all the sub-batches are summed up, and the
+    parameters are updated only in the main process.
+
+    The main process computes the first sub-batch by itself, and the others
+    are computed by worker processes forked at the first update. Before
+    forking, the parameter arrays of the target link are moved to shared
+    memory, so that the updates done by the main process are seen by the
+    workers without any copy. Each worker writes its gradients to its own
+    slot of a shared buffer laid out in the order of
+    :meth:`~chainer.Link.namedparams`, from which the main process reduces
+    them.
+
+    .. note::
+       This updater relies on the ``fork`` start method of
+       :mod:`multiprocessing`, so it is only available on Unix. It uses
+       ``fork`` regardless of the default start method, and raises
+       :class:`RuntimeError` on the platforms not supporting it. The values
+       reported by the workers are discarded; only the observations of the
+       main process are reported.
+
+    Args:
+        iterator: Dataset iterator for the training dataset. It can also be a
+            dictionary of iterators. If this is just an iterator, then the
+            iterator is registered by the name ``'main'``.
+        optimizer: Optimizer to update parameters. It can also be a dictionary
+            of optimizers. If this is just an optimizer, then the optimizer is
+            registered by the name ``'main'``.
+        converter: Converter function to build input arrays. Each sub-batch
+            is passed to this function in the process computing it.
+            :func:`~chainer.dataset.concat_examples` is used by default.
+        n_processes (int): Number of processes computing the gradients,
+            including the main process. The number of CPUs is used by
+            default. If a mini-batch has fewer examples, the workers left
+            without any example are idle on that update.
+        loss_func: Loss function. The target link of the main optimizer is
+            used by default.
+        pin_cores (bool): If ``True``, the CPUs available to this process are
+            split evenly among the processes and each process is pinned to its
+            own subset. It is only supported on Linux.
+
+    """
+
+    def __init__(self, iterator, optimizer, converter=convert.concat_examples,
+                 n_processes=None, loss_func=None, pin_cores=False):
+        super(CPUParallelUpdater, self).__init__(
+            iterator=iterator,
+            optimizer=optimizer,
+            converter=converter,
+            loss_func=loss_func,
+        )
+        self.n_processes = n_processes or multiprocessing.cpu_count()
+        if self.n_processes < 1:
+            raise ValueError('n_processes must be positive')
+        self._context = _fork_context()
+        if pin_cores and not hasattr(os, 'sched_setaffinity'):
+            raise RuntimeError('pin_cores is not supported on this platform')
+        self._pin_cores = pin_cores
+        self._workers = None
+
+    def finalize(self):
+        super(CPUParallelUpdater, self).finalize()
+        if self._workers is None:
+            return
+        for conn in self._pipes:
+            conn.send(None)  # termination signal
+        for worker in self._workers:
+            worker.join()
+        self._workers = None
+
+    def update_core(self):
+        optimizer = self.get_optimizer('main')
+        model = optimizer.target
+        loss_func = self.loss_func or model
+        batch = self.get_iterator('main').next()
+        n = self.n_processes
+        # The workers whose sub-batches would be empty are left idle.
+        n_active = max(min(n, len(batch)) - 1, 0)
+
+        if self._workers is not None:
+            for i, conn in enumerate(self._pipes[:n_active]):
+                conn.send(batch[i + 1::n])
+
+        model.cleargrads()
+        loss = _compute_loss(loss_func, self.converter(batch[::n], -1))
+
+        if self._workers is None:
+            # Parameters are initialized by the first forward computation.
+            self._start_workers(model)
+            for i, conn in enumerate(self._pipes[:n_active]):
+                conn.send(batch[i + 1::n])
+
+        loss.backward()
+
+        for conn in self._pipes[:n_active]:
+            error = conn.recv()
+            if error is not None:
+                raise RuntimeError(
+                    'an error occurred in a worker process:\n' + error)
+
+        if n_active:
+            summed = {dtype: buf[:n_active].sum(axis=0)
+                      for dtype, buf in six.iteritems(self._grad_bufs)}
+            for param, (dtype, begin, end) in six.moves.zip(
+                    self._params, self._layout):
+                g = summed[dtype][begin:end].reshape(param.data.shape)
+                if param.grad is None:
+                    param.grad = g
+                else:
+                    param.grad += g
+
+        optimizer.update()
+
+    def _start_workers(self, model):
+        params = [param for _, param in model.namedparams()]
+        sizes = {}
+        layout = []
+        for param in params:
+            dtype = param.data.dtype
+            begin = sizes.get(dtype, 0)
+            sizes[dtype] = begin + param.data.size
+            layout.append((dtype, begin, begin + param.data.size))
+
+        n_workers = self.n_processes - 1
+        param_bufs = {}
+        grad_bufs = {}
+        for dtype, size in six.iteritems(sizes):
+            param_bufs[dtype] = _shared_array(dtype, (size,))
+            grad_bufs[dtype] = _shared_array(dtype, (n_workers, size))
+
+        # Move the parameters to shared memory before forking, so that the
+        # workers share them with the main process.
+        for param, (dtype, begin, end) in six.moves.zip(params, layout):
+            view = param_bufs[dtype][begin:end].reshape(param.data.shape)
+            view[...] = param.data
+            param.data = view
+
+        cores = [None] * self.n_processes
+        if self._pin_cores:
+            cpus = sorted(os.sched_getaffinity(0))
+            cores = [cpus[i::self.n_processes]
+                     for i in six.moves.range(self.n_processes)]
+            os.sched_setaffinity(0, cores[0])
+
+        self._params = params
+        self._layout = layout
+        self._grad_bufs = grad_bufs
+        self._pipes = []
+        self._workers = []
+        for i in six.moves.range(n_workers):
+            grads = {dtype: buf[i] for dtype, buf in six.iteritems(grad_bufs)}
+            conn, worker_conn = self._context.Pipe()
+            args = (worker_conn, self.loss_func or model, self.converter,
+                    params, layout, grads, cores[i + 1])
+            worker = self._context.Process(target=_cpu_worker, args=args)
+            worker.daemon = True
+            worker.start()
+            self._pipes.append(conn)
+            self._workers.append(worker)
+
+
+def _fork_context():
+    # The workers have to inherit the parameters in shared memory, which
+    # the other start methods would pickle as copies.
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        # Python 2 always forks on POSIX
+        if os.name == 'posix':
+            return multiprocessing
+    else:
+        try:
+            return get_context('fork')
+        except ValueError:
+            pass
+    raise RuntimeError(
+        'CPUParallelUpdater requires the fork start method of '
+        'multiprocessing, which is not available on this platform')
+
+
+def _shared_array(dtype, shape):
+    dtype = numpy.dtype(dtype)
+    size = int(numpy.prod(shape))
+    mem = sharedctypes.RawArray('b', size * dtype.itemsize)
+    return numpy.frombuffer(mem, dtype, size).reshape(shape)
+
+
+def _compute_loss(loss_func, in_arrays):
+    if isinstance(in_arrays, tuple):
+        in_vars = tuple(variable.Variable(x) for x in in_arrays)
+        return loss_func(*in_vars)
+    elif isinstance(in_arrays, dict):
+        in_vars = {key: variable.Variable(x)
+                   for key, x in six.iteritems(in_arrays)}
+        return loss_func(**in_vars)
+    else:
+        return loss_func(variable.Variable(in_arrays))
+
+
+def _cpu_worker(conn, loss_func, converter, params, layout, grads, cores):
+    if cores is not None:
+        os.sched_setaffinity(0, cores)
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            break
+        try:
+            for param in params:
+                param.cleargrad()
+            loss = _compute_loss(loss_func, converter(batch, -1))
+            loss.backward()
+            del loss
+            for param, (dtype, begin, end) in six.moves.zip(params, layout):
+                grad = grads[dtype][begin:end].reshape(param.data.shape)
+                if param.grad is None:
+                    grad[...] = 0
+                else:
+                    grad[...] = param.grad
+                if param.sparse_grad is not None:
+                    param.sparse_grad.add_to(grad)
+        except Exception:
+            conn.send(traceback.format_exc())
+        else:
+            conn.send(None)
+    conn.close()
@@ -16,3 +16,104 @@ def empty_like(x):
         return cuda.cupy.empty_like(x)
     else:
         return numpy.empty_like(x)
+
+
+def scatter_add_rows(dst, indices, values):
+    """Adds rows of ``values`` to ``dst[indices]`` with duplicate indices.
+
+    This is equivalent to ``numpy.add.at(dst, indices, values)`` but runs as a
+    sort followed by segment sums, which is much faster than ``numpy.add.at``
+    on older versions of NumPy. Only NumPy arrays are supported.
+
+    Args:
+        dst (numpy.ndarray): Destination array updated in place.
+        indices (numpy.ndarray): Integer array of row indices of ``dst``.
+        values (numpy.ndarray): Array of shape
+            ``indices.shape + dst.shape[1:]``.
+
+    """
+    indices = indices.ravel()
+    if len(indices) == 0:
+        return
+    values = values.reshape((len(indices),) + dst.shape[1:])
+    rows, sums = sum_rows_by_index(indices, values)
+    dst[rows] += sums
+
+
+def sum_rows_by_index(indices, values):
+    """Sums up rows of an array that share the same index.
+
+    Args:
+        indices (numpy.ndarray): 1-D integer array of row indices.
+        values (numpy.ndarray): Array whose first axis corresponds to
+            ``indices``.
+
+    Returns:
+        tuple: The sorted unique indices and the array of the sums of the
+        rows of ``values`` for each of them.
+
+    """
+    if len(indices) == 0:
+        return indices, values
+    order = numpy.argsort(indices, kind='mergesort')
+    sorted_indices = indices[order]
+    head = numpy.empty(len(sorted_indices), dtype=bool)
+    head[0] = True
+    numpy.not_equal(sorted_indices[1:], sorted_indices[:-1], out=head[1:])
+    starts = numpy.flatnonzero(head)
+    return sorted_indices[starts], numpy.add.reduceat(
+        values[order], starts, axis=0)
+
+
+class RowSparseGrad(object):
+
+    """Gradient of a matrix that is nonzero only in some of its rows.
+
+    It represents a gradient array of shape ``shape`` by the indices of the
+    nonzero rows and their values. It is set to
+    :attr:`~chainer.Variable.sparse_grad` by functions like
+    :func:`~chainer.functions.embed_id` to avoid materializing a dense
+    gradient array, and optimizers that support it update only the given
+    rows. Only NumPy arrays are supported.
+
+    Args:
+        indices (numpy.ndarray): Integer array of row indices. They may be
+            duplicated.
+        values (numpy.ndarray): Array of shape
+            ``indices.shape + shape[1:]``.
+        shape (tuple of ints): Shape of the dense gradient.
+
+    Attributes:
+        indices (numpy.ndarray): Sorted 1-D array of the unique row indices.
+        values (numpy.ndarray): Array of the sums of the rows for each index.
+        shape (tuple of ints): Shape of the dense gradient.
+
+    """
+
+    def __init__(self, indices, values, shape):
+        indices = indices.ravel()
+        values = values.reshape((len(indices),) + tuple(shape[1:]))
+        self.indices, self.values = sum_rows_by_index(indices, values)
+        self.shape = tuple(shape)
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    def __add__(self, other):
+        if self.shape != other.shape:
+            raise ValueError('shape mismatch: {} != {}'.format(
+                self.shape, other.shape))
+        return RowSparseGrad(
+            numpy.concatenate((self.indices, other.indices)),
+            numpy.concatenate((self.values, other.values)), self.shape)
+
+    def add_to(self, dst):
+        """Adds the gradient to a dense array in place."""
+        dst[self.indices] += self.values
+
+    def to_dense(self):
+        """Returns the gradient as a dense array."""
+        dense = numpy.zeros(self.shape, dtype=self.values.dtype)
+        dense[self.indices] = self.values
+        return dense
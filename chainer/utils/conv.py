@@ -1,6 +1,11 @@
+import os
+
+from multiprocessing import pool
 import numpy
 import six
 
+from chainer import configuration
+from chainer import cpu_memory
 from chainer import cuda
 
 
@@ -30,7 +35,7 @@ def im2col_cpu(
     img = numpy.pad(img,
                     ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
                     mode='constant', constant_values=(pval,))
-    col = numpy.ndarray((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
+    col = cpu_memory.empty((n, c, kh, kw, out_h, out_w), dtype=img.dtype)
 
     for j in six.moves.range(kh):
         jdy = j * dy
@@ -121,3 +126,212 @@ def col2im_gpu(col, sy, sx, ph, pw, h, w, dy=1, dx=1):
         'col2im')(col.reduced_view(),
                   h, w, out_h, out_w, kh, kw, sy, sx, ph, pw, dx, dy, img)
     return img
+
+
+_thread_pools = {}
+
+
+def _get_thread_pool(n_threads):
+    # Pools are not inherited by forked processes
+    key = (os.getpid(), n_threads)
+    thread_pool = _thread_pools.get(key)
+    if thread_pool is None:
+        thread_pool = pool.ThreadPool(n_threads)
+        _thread_pools[key] = thread_pool
+    return thread_pool
+
+
+def _split_batch(n, sample_size):
+    """Splits a batch into chunks whose buffers fit in the workspace.
+
+    It returns the list of slices of the chunks and the number of threads
+    processing them.
+
+    """
+    config = configuration.config
+    n_threads = max(1, config.cpu_conv_threads)
+    budget = config.cpu_conv_workspace_size // n_threads
+    size = max(1, min(budget // max(1, sample_size), -(-n // n_threads)))
+    chunks = [slice(i, min(i + size, n))
+              for i in six.moves.range(0, n, size)] or [slice(0, 0)]
+    return chunks, min(n_threads, len(chunks))
+
+
+def _map_chunks(func, chunks, n_threads):
+    if n_threads <= 1:
+        return [func(chunk) for chunk in chunks]
+    return _get_thread_pool(n_threads).map(func, chunks)
+
+
+def _im2col_rows(img, kh, kw, sy, sx, ph, pw, out_h, out_w, dy, dx, col):
+    # Unlike im2col_cpu, it writes the patches to col of the shape
+    # (n, out_h, out_w, c, kh, kw), whose rows are the operands of a GEMM.
+    img = numpy.pad(img,
+                    ((0, 0), (0, 0), (ph, ph + sy - 1), (pw, pw + sx - 1)),
+                    mode='constant')
+    img = numpy.ascontiguousarray(img.transpose(0, 2, 3, 1))
+    for j in six.moves.range(kh):
+        jdy = j * dy
+        j_lim = jdy + sy * out_h
+        for i in six.moves.range(kw):
+            idx = i * dx
+            i_lim = idx + sx * out_w
+            col[:, :, :, :, j, i] = img[:, jdy:j_lim:sy, idx:i_lim:sx]
+    return col
+
+
+def conv_forward_cpu(x, W, sy, sx, ph, pw, cover_all=False, dy=1, dx=1,
+                     keep_col=False):
+    """Computes a two-dimensional convolution by im2col and GEMM in chunks.
+
+    It is equivalent to ``numpy.tensordot(im2col_cpu(x, ...), W, ((1, 2,
+    3), (1, 2, 3)))`` with the channel axis moved to the second position,
+    without the bias term. The batch is split into chunks so that the column
+    buffer of each chunk fits in ``chainer.config.cpu_conv_workspace_size``,
+    and the chunks are processed by ``chainer.config.cpu_conv_threads``
+    threads with column buffers allocated from the CPU memory pool (see
+    :mod:`chainer.cpu_memory`). The result is the same as the one computed at
+    once.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, h, w)``.
+        W (numpy.ndarray): Filter of shape ``(out_c, c, kh, kw)``.
+        sy, sx, ph, pw, cover_all, dy, dx: Same as :func:`im2col_cpu`.
+        keep_col (bool): If ``True``, the column array is returned to be
+            reused by :func:`conv_backward_filter_cpu` when the whole batch
+            fits in a single chunk.
+
+    Returns:
+        tuple: The output of shape ``(n, out_c, out_h, out_w)`` and the
+        column array, which is ``None`` unless ``keep_col`` is ``True`` and
+        the batch is not split.
+
+    """
+    n, c, h, w = x.shape
+    out_c, _, kh, kw = W.shape
+    out_h = get_conv_outsize(h, kh, sy, ph, cover_all, dy)
+    assert out_h > 0, 'Height in the output should be positive.'
+    out_w = get_conv_outsize(w, kw, sx, pw, cover_all, dx)
+    assert out_w > 0, 'Width in the output should be positive.'
+
+    col_shape = (out_h, out_w, c, kh, kw)
+    chunks, n_threads = _split_batch(
+        n, int(numpy.prod(col_shape)) * x.dtype.itemsize)
+    keep_col = keep_col and len(chunks) == 1
+    y = numpy.empty((n, out_c, out_h, out_w), dtype=x.dtype)
+
+    def forward_chunk(chunk):
+        nb = chunk.stop - chunk.start
+        if keep_col:
+            col = numpy.empty((nb,) + col_shape, dtype=x.dtype)
+        else:
+            col = cpu_memory.empty((nb,) + col_shape, x.dtype)
+        _im2col_rows(x[chunk], kh, kw, sy, sx, ph, pw, out_h, out_w, dy, dx,
+                     col)
+        y_chunk = numpy.tensordot(col, W, ((3, 4, 5), (1, 2, 3)))
+        y[chunk] = y_chunk.transpose(0, 3, 1, 2)
+        return col
+
+    cols = _map_chunks(forward_chunk, chunks, n_threads)
+    return y, cols[0] if keep_col else None
+
+
+def conv_backward_filter_cpu(x, gy, kh, kw, sy, sx, ph, pw, cover_all=False,
+                             dy=1, dx=1, col=None):
+    """Computes the gradient of the filter of a convolution in chunks.
+
+    It is equivalent to ``numpy.tensordot(gy, im2col_cpu(x, ...), ((0, 2,
+    3), (0, 4, 5)))``. The column array is computed chunk by chunk as
+    :func:`conv_forward_cpu` does, and the gradients of the chunks are summed
+    up in order. Therefore, the rounding errors depend on the number of
+    chunks, while the result is deterministic for a fixed configuration.
+
+    Args:
+        x (numpy.ndarray): Input of shape ``(n, c, h, w)``.
+        gy (numpy.ndarray): Gradient of the output of shape
+            ``(n, out_c, out_h, out_w)``.
+        kh, kw, sy, sx, ph, pw, cover_all, dy, dx: Same as
+            :func:`im2col_cpu`.
+        col (numpy.ndarray): Column array returned by
+            :func:`conv_forward_cpu`. If it is given, it is used instead of
+            computing the columns again.
+
+    Returns:
+        numpy.ndarray: Gradient of the filter of shape ``(out_c, c, kh, kw)``.
+
+    """
+    if col is not None:
+        return numpy.tensordot(gy, col, ((0, 2, 3), (0, 1, 2)))
+
+    n, c, h, w = x.shape
+    out_h, out_w = gy.shape[2:]
+    col_shape = (out_h, out_w, c, kh, kw)
+    chunks, n_threads = _split_batch(
+        n, int(numpy.prod(col_shape)) * x.dtype.itemsize)
+
+    def backward_chunk(chunk):
+        col = cpu_memory.empty(
+            (chunk.stop - chunk.start,) + col_shape, x.dtype)
+        _im2col_rows(x[chunk], kh, kw, sy, sx, ph, pw, out_h, out_w, dy, dx,
+                     col)
+        return numpy.tensordot(gy[chunk], col, ((0, 2, 3), (0, 1, 2)))
+
+    gWs = _map_chunks(backward_chunk, chunks, n_threads)
+    gW = gWs[0]
+    for gW_chunk in gWs[1:]:
+        gW += gW_chunk
+    return gW
+
+
+def conv_backward_data_cpu(W, gy, sy, sx, ph, pw, h, w, dy=1, dx=1,
+                           dtype=None):
+    """Computes the gradient of the input of a convolution in chunks.
+
+    It is equivalent to ``col2im_cpu(numpy.rollaxis(numpy.tensordot(W, gy,
+    (0, 1)), 3), ...)``, which is also the forward computation of a
+    deconvolution. The column array of each chunk is computed into a buffer
+    from the CPU memory pool as :func:`conv_forward_cpu` does, and the result
+    is the same as the one computed at once.
+
+    Args:
+        W (numpy.ndarray): Filter of shape ``(out_c, c, kh, kw)``.
+        gy (numpy.ndarray): Gradient of the output of shape
+            ``(n, out_c, out_h, out_w)``.
+        sy, sx, ph, pw, h, w, dy, dx: Same as :func:`col2im_cpu`.
+        dtype: Data type of the columns and the result. If it is ``None``,
+            the result type of ``W`` and ``gy`` is used.
+
+    Returns:
+        numpy.ndarray: Gradient of the input of shape ``(n, c, h, w)``.
+
+    """
+    n, out_c, out_h, out_w = gy.shape
+    _, c, kh, kw = W.shape
+    mat_dtype = numpy.result_type(W, gy)
+    dtype = mat_dtype if dtype is None else numpy.dtype(dtype)
+    col_size = c * kh * kw * out_h * out_w
+    chunks, n_threads = _split_batch(n, col_size * mat_dtype.itemsize)
+    # Same operand as the one numpy.tensordot makes from W
+    W_mat = W.transpose(1, 2, 3, 0).reshape(c * kh * kw, out_c)
+    gx = None
+
+    def backward_chunk(chunk):
+        nb = chunk.stop - chunk.start
+        gy_mat = gy[chunk].transpose(1, 0, 2, 3).reshape(out_c, -1)
+        gcol = cpu_memory.empty((c * kh * kw, nb * out_h * out_w),
+                                mat_dtype)
+        numpy.dot(W_mat, gy_mat, out=gcol)
+        gcol = gcol.reshape(c, kh, kw, nb, out_h, out_w).astype(
+            dtype, copy=False)
+        return col2im_cpu(numpy.rollaxis(gcol, 3), sy, sx, ph, pw, h, w,
+                          dy, dx)
+
+    if len(chunks) == 1:
+        return backward_chunk(chunks[0])
+    gx = numpy.empty((n, c, h, w), dtype=dtype)
+
+    def store_chunk(chunk):
+        gx[chunk] = backward_chunk(chunk)
+
+    _map_chunks(store_chunk, chunks, n_threads)
+    return gx
@@ -1,31 +1,161 @@
-import numpy
+import itertools
+import multiprocessing
+from multiprocessing import pool
 
+import numpy
+import six
 
-def oversample(images, crop_dims):
-    """Crop an image into center, corners, and mirror images."""
 
-    # Dimensions and center.
-    channels, src_h, src_w = images[0].shape
+def _crop_slices(src_h, src_w, crop_dims):
+    # Top-left, top-right, bottom-left, bottom-right and center
     cy, cx = src_h / 2.0, src_w / 2.0
     dst_h, dst_w = crop_dims
+    origins = [
+        (0, 0),
+        (0, src_w - dst_w),
+        (src_h - dst_h, 0),
+        (src_h - dst_h, src_w - dst_w),
+        (int(cy - dst_h / 2.0), int(cx - dst_w / 2.0)),
+    ]
+    return [(slice(y, y + dst_h), slice(x, x + dst_w)) for y, x in origins]
+
+
+def iter_oversample(images, crop_dims):
+    """Iterates over the center, corner and mirror crops of a batch of images.
+
+    It yields ten views of ``images`` without copying them: the four corner
+    crops and the center crop, followed by their horizontal mirrors. It is
+    useful to process the crops one by one instead of materializing all of
+    them at once.
+
+    Args:
+        images (numpy.ndarray): Batch of images of shape ``(N, C, H, W)``.
+        crop_dims (pair of ints): Height and width of the crops.
+
+    Returns:
+        Iterator of arrays of shape ``(N, C) + crop_dims``.
 
-    # Make crop coordinates
-    crops_ix = numpy.empty((5, 4), dtype=int)
-    crops_ix[0, :2] = [0, 0]
-    crops_ix[1, :2] = [0, src_w - dst_w]
-    crops_ix[2, :2] = [src_h - dst_h, 0]
-    crops_ix[3, :2] = [src_h - dst_h, src_w - dst_w]
-    crops_ix[4, :2] = [int(cy - dst_h / 2.0), int(cx - dst_w / 2.0)]
-    crops_ix[:, 2] = crops_ix[:, 0] + dst_h
-    crops_ix[:, 3] = crops_ix[:, 1] + dst_w
+    """
+    slices = _crop_slices(images.shape[2], images.shape[3], crop_dims)
+    for ys, xs in slices:
+        yield images[:, :, ys, xs]
+    for ys, xs in slices:
+        yield images[:, :, ys, xs][:, :, :, ::-1]
 
+
+def oversample(images, crop_dims):
+    """Crop an image into center, corners, and mirror images.
+
+    The ten crops of each image are consecutive in the output. Use
+    :func:`iter_oversample` to avoid allocating all of them at once.
+
+    """
+    if not isinstance(images, numpy.ndarray):
+        images = numpy.asarray(images)
+    n, channels = images.shape[:2]
     crops = numpy.empty(
-        (10 * len(images), channels, dst_h, dst_w), dtype=images[0].dtype)
-    ix = 0
-    for img in images:
-        for crop in crops_ix:
-            crops[ix] = img[:, crop[0]:crop[2], crop[1]:crop[3]]
-            ix += 1
-        crops[ix:ix + 5] = crops[ix - 5:ix, :, :, ::-1]
-        ix += 5
-    return crops
+        (n, 10, channels) + tuple(crop_dims), dtype=images.dtype)
+    for i, crop in enumerate(iter_oversample(images, crop_dims)):
+        crops[:, i] = crop
+    return crops.reshape((10 * n, channels) + tuple(crop_dims))
+
+
+def iter_chunks(iterable, size):
+    """Splits an iterable into lists of a fixed size.
+
+    It consumes the iterable lazily, so it can be used for streams of
+    arbitrary length. At least one (possibly empty) list is yielded.
+
+    Args:
+        iterable: Iterable to split.
+        size (int): Length of each list. The last one may be shorter. If it
+            is ``None``, the whole iterable is yielded as one list.
+
+    Returns:
+        Iterator of lists.
+
+    """
+    if size is None:
+        yield list(iterable)
+        return
+    if size <= 0:
+        raise ValueError('size must be positive: {}'.format(size))
+    it = iter(iterable)
+    chunk = list(itertools.islice(it, size))
+    yield chunk
+    while len(chunk) == size:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            break
+        yield chunk
+
+
+def load_images(images, load, n_threads=None):
+    """Loads images into a preallocated batch array with a thread pool.
+
+    ``load`` is applied to each image in worker threads, and its outputs are
+    written into a single array as soon as they are ready. Image libraries
+    like Pillow release the GIL while decoding and resizing, so the images
+    are processed in parallel.
+
+    Args:
+        images (list): Images to load.
+        load (callable): Function that converts an image to an array. All
+            the outputs must have the same shape and dtype.
+        n_threads (int): Number of worker threads. If it is ``None``, the
+            number of CPUs is used. If it is ``1`` or less, the images are
+            loaded in the calling thread.
+
+    Returns:
+        numpy.ndarray: Array of the stacked outputs of ``load``.
+
+    """
+    if len(images) == 0:
+        raise ValueError('images is empty')
+    if n_threads is None:
+        n_threads = multiprocessing.cpu_count()
+    n_threads = min(n_threads, len(images))
+
+    first = load(images[0])
+    batch = numpy.empty((len(images),) + first.shape, dtype=first.dtype)
+    batch[0] = first
+    if n_threads <= 1:
+        for i in six.moves.range(1, len(images)):
+            batch[i] = load(images[i])
+        return batch
+
+    thread_pool = pool.ThreadPool(n_threads)
+    try:
+        for i, image in enumerate(thread_pool.imap(load, images[1:]), 1):
+            batch[i] = image
+    finally:
+        thread_pool.terminate()
+    return batch
+
+
+def subtract_mean(images, mean, dtype=numpy.float32, out=None):
+    """Converts a batch of RGB images to mean-subtracted BGR arrays.
+
+    It swaps the channel order, moves the channel axis in front of the
+    spatial ones and subtracts the mean pixel in one vectorized operation
+    that writes directly to the output array.
+
+    Args:
+        images (numpy.ndarray): Batch of RGB images of shape
+            ``(N, H, W, 3)``.
+        mean (numpy.ndarray): Mean pixel in the BGR order.
+        dtype: Data type of the output.
+        out (numpy.ndarray): Output array of shape ``(N, 3, H, W)``. If it is
+            ``None``, a new array is allocated.
+
+    Returns:
+        numpy.ndarray: Array of shape ``(N, 3, H, W)``.
+
+    """
+    n, h, w, c = images.shape
+    if out is None:
+        out = numpy.empty((n, c, h, w), dtype=dtype)
+    mean = numpy.asarray(mean, dtype=out.dtype).reshape(c, 1, 1)
+    bgr = images[:, :, :, ::-1].transpose(0, 3, 1, 2)
+    numpy.subtract(bgr, mean, out=out)
+    return out
@@ -7,6 +7,7 @@ import numpy
 import six
 
 import chainer
+from chainer import cpu_memory
 from chainer import cuda
 from chainer import flag
 from chainer import utils
@@ -86,6 +87,10 @@ class Variable(object):
         data: Data array of type either :class:`numpy.ndarray` or
             :class:`cupy.ndarray`.
         grad: Gradient array.
+        sparse_grad (~chainer.utils.array.RowSparseGrad): Gradient given in
+            the row-sparse form. Some functions like
+            :func:`~chainer.functions.embed_id` set it instead of
+            :attr:`grad` on request. It is ``None`` by default.
         creator: The function who creates this variable. It is ``None`` if the
             variable is not created by any function.
         volatile: Ternary :class:`~chainer.Flag` object. If ``'ON'``, the
@@ -105,6 +110,7 @@ Actual: {0}'''.format(type(data))
         self._volatile = flag.Flag(volatile)
 
         self._grad = grad
+        self.sparse_grad = None
         self.creator = None
 
         self.name = name
@@ -239,6 +245,7 @@ Actual: {0}'''.format(type(data))
     def cleargrad(self):
         """Clears the gradient array."""
         self._grad = None
+        self.sparse_grad = None
 
     def zerograd(self):
         """Initializes the gradient array by zeros.
@@ -256,6 +263,7 @@ Actual: {0}'''.format(type(data))
                 self._grad = xp.zeros_like(self.data)
             else:
                 self._grad.fill(0)
+        self.sparse_grad = None
 
     def copydata(self, var):
         """Copies the data array from given source variable.
@@ -284,6 +292,8 @@ Actual: {0}'''.format(type(data))
 
         This method just runs ``self.grad += var.grad``, except that the
         accumulation is even done across the host and different devices.
+        The row-sparse gradient of ``var`` (see :attr:`sparse_grad`) is also
+        accumulated into the dense gradient.
 
         Args:
             var (Variable): Source variable.
@@ -291,6 +301,13 @@ Actual: {0}'''.format(type(data))
         """
         src = var._grad
         dst = self._grad
+        sparse_grad = var.sparse_grad
+        if sparse_grad is not None:
+            if src is None:
+                src = sparse_grad.to_dense()
+            else:
+                src = src.copy()
+                sparse_grad.add_to(src)
         if src is None:
             return
 
@@ -409,7 +426,8 @@ Actual: {0}'''.format(type(data))
                         acc_grad's length is not 0, means need to do grad accumulate
                         call native MKLDNN sum primitive
                         """
-                        y = numpy.empty((grad_tmp.shape), dtype=grad_tmp.dtype)
+                        y = cpu_memory.empty(
+                            grad_tmp.shape, dtype=grad_tmp.dtype)
                         acc_grad += (grad_tmp,)
                         mkldnn_sum = mkldnn.Sum_F32()
                         mkldnn_sum.sum4d_gx(acc_grad, y)
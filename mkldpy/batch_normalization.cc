@@ -66,6 +66,7 @@
 #include "common.h"
 #include "mkldnn.hpp"
 #include "batch_normalization.h"
+#include "layout_cache.h"
 #include "utils.h"
 
 using namespace mkldnn;
@@ -189,6 +190,11 @@ void BatchNormalization<T>::forward_setup(
     if (reorder_dst_p)
         this->fwd_primitives_.push_back(*reorder_dst_);
     fwd_stream_.reset(new stream(stream::kind::eager));
+
+    /* same primitives without the src reorder, for src in the layout cache */
+    fwd_cached_src_net_.push_back(*batch_normalization_fwd_);
+    if (reorder_dst_p)
+        fwd_cached_src_net_.push_back(*reorder_dst_);
 }
 
 template<typename T>
@@ -220,8 +226,18 @@ void BatchNormalization<T>::forward(
         fwd_stream_->submit(fwd_primitives_).wait();
     } else {
         fwd_reset_mem(x, y, W, mean, var);
-        fwd_stream_->rerun().wait();
+        std::shared_ptr<memory> cached_src;
+        if (src_mem_ != user_src_mem_)
+            cached_src = LayoutCache::get_instance().get(
+                    x, src_mem_->get_primitive_desc());
+        if (cached_src
+                && cached_src->get_data_handle() != dst_mem_->get_data_handle())
+            fwd_cached_src_net_.run(*src_mem_, *cached_src);
+        else
+            fwd_stream_->rerun().wait();
     }
+    if (dst_mem_ != user_dst_mem_)
+        LayoutCache::get_instance().put(y, dst_mem_);
 }
 
 template<typename T>
@@ -382,7 +398,7 @@ BatchNormalization<T>* BatchNormalization<T>::get_backward_object(
         LayerFactory<T>::get_instance().get_batch_normalization_layer(
             x_d1, x_d2, x_d3, x_d4, W_d1, W_d2, mean_d1, eps,
             is_training, has_weights, fixed_mean_var));
-    assert (batch_normalization_backward != NULL);  // already done forward before
+    check_backward_layer(batch_normalization_backward);
     return batch_normalization_backward;
 }
 
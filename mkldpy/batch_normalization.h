@@ -71,6 +71,7 @@
 #include <memory>
 #include "layer.h"
 #include "layer_factory.h"
+#include "layout_cache.h"
 
 template <typename T>
 class BatchNormalization : public Layer<T>
@@ -188,6 +189,7 @@ private:
     std::unique_ptr<mkldnn::primitive> reorder_src_, reorder_dst_, reorder_diff_src_,
         reorder_bwd_src_, reorder_diff_dst_;
     std::vector<mkldnn::primitive> fwd_primitives_, bwd_primitives_;
+    CachedSrcNet fwd_cached_src_net_;
     std::shared_ptr<mkldnn::stream> fwd_stream_, bwd_stream_;
 
     std::shared_ptr<mkldnn::engine> eng_;
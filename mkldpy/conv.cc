@@ -66,6 +66,7 @@
 #include "common.h"
 #include "mkldnn.hpp"
 #include "conv.h"
+#include "layout_cache.h"
 #include "utils.h"
 
 using namespace mkldnn;
@@ -194,6 +195,15 @@ void Convolution2D<T>::forward_setup(T* x, int x_d1, int x_d2, int x_d3, int x_d
     if (fwd_reorder_conv_dst_){
         fwd_primitives_.push_back(conv_reorder_dst_);
     }
+
+    //same primitives without the src reorder, for src in the layout cache
+    if (fwd_reorder_conv_weights_){
+        fwd_cached_src_net_.push_back(conv_reorder_weights_);
+    }
+    fwd_cached_src_net_.push_back(*conv_fwd_);
+    if (fwd_reorder_conv_dst_){
+        fwd_cached_src_net_.push_back(conv_reorder_dst_);
+    }
     return;
 }
 
@@ -225,12 +235,22 @@ int Convolution2D<T>::forward(T* x, int x_d1, int x_d2, int x_d3, int x_d4,
         user_bias_mem_->set_data_handle(b);
     }
     user_dst_mem_->set_data_handle(y);
+
+    std::shared_ptr<memory> cached_src;
+    if (!fwd_first_run_ && fwd_reorder_conv_src_)
+        cached_src = LayoutCache::get_instance().get(
+                x, src_mem_->get_primitive_desc());
     if (fwd_first_run_) {
         fwd_stream_->submit(fwd_primitives_).wait();
         fwd_first_run_ = false;
+    } else if (cached_src
+            && cached_src->get_data_handle() != dst_mem_->get_data_handle()) {
+        fwd_cached_src_net_.run(*src_mem_, *cached_src);
     } else {
         fwd_stream_->rerun().wait();
     }
+    if (fwd_reorder_conv_dst_)
+        LayoutCache::get_instance().put(y, dst_mem_);
 
     return 0;
 }
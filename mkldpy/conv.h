@@ -69,6 +69,7 @@
 #include <memory>
 #include "layer.h"
 #include "layer_factory.h"
+#include "layout_cache.h"
 
 template <typename T>
 class Convolution2D : public Layer<T>
@@ -131,7 +132,7 @@ static Convolution2D<T>* get_backward_object(
                          pad_l_h, pad_l_w,
                          pad_r_h, pad_r_w));
 
-    assert(conv2d_backward != NULL); // we must have already done forward before
+    check_backward_layer(conv2d_backward);
 
     return conv2d_backward;
 
@@ -370,6 +371,7 @@ private:
     //stream
     std::shared_ptr<mkldnn::stream> fwd_stream_;
     std::vector<mkldnn::primitive> fwd_primitives_;
+    CachedSrcNet fwd_cached_src_net_;
     std::shared_ptr<mkldnn::stream> bwd_weights_stream_;
     std::vector<mkldnn::primitive> bwd_weights_primitives_;
     std::shared_ptr<mkldnn::stream> bwd_data_stream_;
@@ -130,7 +130,7 @@ static DeConvolution2D<T>* get_backward_object(
                          pad_l_h, pad_l_w,
                          pad_r_h, pad_r_w));
 
-    assert(deconv2d_backward != NULL); // we must have already done forward before
+    check_backward_layer(deconv2d_backward);
 
     return deconv2d_backward;
 
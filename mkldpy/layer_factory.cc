@@ -117,9 +117,13 @@ Layer<T>* LayerFactory<T>::get_layer(std::string key)
 {
     auto stream_iter = map_.find(key);
     if (stream_iter == map_.end()) {
+        misses_++;
         return NULL;
     } else {
-        return stream_iter->second;
+        hits_++;
+        // move to the front of the LRU list
+        lru_.splice(lru_.begin(), lru_, stream_iter->second);
+        return stream_iter->second->second;
     }
 }
 
@@ -128,12 +132,46 @@ void LayerFactory<T>::set_layer(std::string key, Layer<T>* layer)
 {
     auto stream_iter = map_.find(key);
     if (stream_iter == map_.end()) {
-        map_[key]=layer;
+        lru_.push_front(std::make_pair(key, layer));
+        map_[key] = lru_.begin();
+        evict();
     } else {
-        throw new std::invalid_argument("cannot set same key to a new stream");
+        throw std::invalid_argument("cannot set same key to a new stream");
     }
 }
 
+template<typename T>
+void LayerFactory<T>::evict()
+{
+    while (capacity_ > 0 && map_.size() > capacity_) {
+        auto& victim = lru_.back();
+        map_.erase(victim.first);
+        delete victim.second;
+        lru_.pop_back();
+        evictions_++;
+    }
+}
+
+template<typename T>
+void LayerFactory<T>::set_capacity(std::size_t capacity)
+{
+    capacity_ = capacity;
+    evict();
+}
+
+template<typename T>
+void LayerFactory<T>::clear()
+{
+    for (auto& entry : lru_) {
+        delete entry.second;
+    }
+    lru_.clear();
+    map_.clear();
+    hits_ = 0;
+    misses_ = 0;
+    evictions_ = 0;
+}
+
 #define RELU_PREFIX "relu_"
 
 template<typename T>
@@ -648,5 +686,40 @@ void LayerFactory<T>::set_batch_normalization_layer(
 
 template class LayerFactory<float>;
 
+void set_layer_cache_capacity(std::size_t capacity)
+{
+    LayerFactory<float>::get_instance().set_capacity(capacity);
+}
+
+std::size_t get_layer_cache_capacity()
+{
+    return LayerFactory<float>::get_instance().get_capacity();
+}
+
+std::size_t get_layer_cache_size()
+{
+    return LayerFactory<float>::get_instance().size();
+}
+
+unsigned long get_layer_cache_hits()
+{
+    return LayerFactory<float>::get_instance().hits();
+}
+
+unsigned long get_layer_cache_misses()
+{
+    return LayerFactory<float>::get_instance().misses();
+}
+
+unsigned long get_layer_cache_evictions()
+{
+    return LayerFactory<float>::get_instance().evictions();
+}
+
+void clear_layer_cache()
+{
+    LayerFactory<float>::get_instance().clear();
+}
+
 
 // vim: et ts=4 sw=4 cindent cino^=l0,\:0,N-s
@@ -64,6 +64,9 @@
 #ifndef _STREAM_FACTORY_
 #define _STREAM_FACTORY_
 #include <mkldnn.hpp>
+#include <cstddef>
+#include <list>
+#include <stdexcept>
 #include <string>
 #include "layer.h"
 #include <unordered_map>
@@ -73,6 +76,39 @@
 // LayerFactory::get_instance().setRELUFwdLayer(<input pointer>, <layer>)
 // then when forward is needed, call
 // layer = LayerFactory::get_instance().getRELUFwdLayer(<input pointer>)
+//
+// The layers are cached in LRU order. When a capacity is set, the least
+// recently used layers are deleted once the number of cached layers exceeds
+// it. The capacity must be at least the number of distinct layers used in one
+// forward/backward pass, since backward reuses the layer created by forward.
+// A capacity of 0 (default) means the cache is unbounded. If the layer of a
+// forward computation has been released before its backward computation,
+// the backward computation throws std::runtime_error (see
+// check_backward_layer), which is raised as RuntimeError in Python.
+
+// Returns the layer looked up by a backward computation, or throws if the
+// layer created by the forward computation is no longer cached.
+template <typename L>
+inline L* check_backward_layer(L* layer)
+{
+    if (layer == NULL) {
+        throw std::runtime_error(
+            "MKLDNN layer of the forward computation was released before "
+            "the backward computation; the layer cache capacity must be at "
+            "least the number of layers used in one forward/backward pass, "
+            "and the cache must not be cleared in between");
+    }
+    return layer;
+}
+
+// Primitive cache control, exposed to Python
+void          set_layer_cache_capacity(std::size_t capacity);
+std::size_t   get_layer_cache_capacity();
+std::size_t   get_layer_cache_size();
+unsigned long get_layer_cache_hits();
+unsigned long get_layer_cache_misses();
+unsigned long get_layer_cache_evictions();
+void          clear_layer_cache();
 
 template <typename T>
 class LayerFactory {
@@ -89,8 +125,18 @@ private:
     Layer<T>* get_layer(std::string      key);
     void      set_layer(std::string      key,
                         Layer<T>*        layer);
+    void      evict();
 
 public:
+    // cache management
+    void          set_capacity(std::size_t capacity);
+    std::size_t   get_capacity() const { return capacity_; }
+    std::size_t   size() const { return map_.size(); }
+    unsigned long hits() const { return hits_; }
+    unsigned long misses() const { return misses_; }
+    unsigned long evictions() const { return evictions_; }
+    void          clear();
+
     // relu stream
     Layer<T>* get_relu_layer(int          size);
     void      set_relu_layer(int          size,
@@ -321,7 +367,13 @@ public:
 private:
     //LayerFactory(LayerFactory const&);
     //void operator=(LayerFactory const&);
-    std::unordered_map<std::string, Layer<T>*> map_;
+    typedef std::list<std::pair<std::string, Layer<T>*> > lru_list;
+    lru_list lru_;  // most recently used first
+    std::unordered_map<std::string, typename lru_list::iterator> map_;
+    std::size_t capacity_ = 0;
+    unsigned long hits_ = 0;
+    unsigned long misses_ = 0;
+    unsigned long evictions_ = 0;
 };
 
 #endif // _STREAM_FACTORY_
@@ -0,0 +1,182 @@
+/*
+ *COPYRIGHT
+ *All modification made by Intel Corporation: © 2017 Intel Corporation.
+ *Copyright (c) 2015 Preferred Infrastructure, Inc.
+ *Copyright (c) 2015 Preferred Networks, Inc.
+ *
+ *Permission is hereby granted, free of charge, to any person obtaining a copy
+ *of this software and associated documentation files (the "Software"), to deal
+ *in the Software without restriction, including without limitation the rights
+ *to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *copies of the Software, and to permit persons to whom the Software is
+ *furnished to do so, subject to the following conditions:
+ *
+ *The above copyright notice and this permission notice shall be included in
+ *all copies or substantial portions of the Software.
+ *
+ *THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *THE SOFTWARE.
+ *
+ *
+ *######################################################################
+ *# The CuPy is designed based on NumPy's API.
+ *# CuPy's source code and documents contain the original NumPy ones.
+ *######################################################################
+ *Copyright (c) 2005-2016, NumPy Developers.
+ *All rights reserved.
+ *
+ *Redistribution and use in source and binary forms, with or without
+ *modification, are permitted provided that the following conditions are
+ *met:
+ *
+ *    * Redistributions of source code must retain the above copyright
+ *       notice, this list of conditions and the following disclaimer.
+ *
+ *    * Redistributions in binary form must reproduce the above
+ *       copyright notice, this list of conditions and the following
+ *       disclaimer in the documentation and/or other materials provided
+ *       with the distribution.
+ *
+ *    * Neither the name of the NumPy Developers nor the names of any
+ *       contributors may be used to endorse or promote products derived
+ *       from this software without specific prior written permission.
+ *
+ *THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ *"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ *LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ *A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ *OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ *SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ *LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ *DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ *THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ *(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ *OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *######################################################################
+ */
+
+
+
+#include <glog/logging.h>
+#include "mkldnn.hpp"
+#include "layout_cache.h"
+
+using namespace mkldnn;
+
+void LayoutCache::put(void* data, std::shared_ptr<memory> mem)
+{
+    if (!enabled_)
+        return;
+
+    // the memory now holds the data of ``data`` only
+    auto owner = owner_.find(mem.get());
+    if (owner != owner_.end()) {
+        map_.erase(owner->second);
+        owner_.erase(owner);
+    }
+    release(data);
+
+    map_[data] = mem;
+    owner_[mem.get()] = data;
+}
+
+std::shared_ptr<memory> LayoutCache::get(
+        void* data, const memory::primitive_desc& pd)
+{
+    if (!enabled_)
+        return nullptr;
+
+    auto it = map_.find(data);
+    if (it == map_.end() || it->second->get_primitive_desc() != pd) {
+        misses_++;
+        return nullptr;
+    }
+    hits_++;
+    return it->second;
+}
+
+void LayoutCache::release(void* data)
+{
+    auto it = map_.find(data);
+    if (it == map_.end())
+        return;
+    owner_.erase(it->second.get());
+    map_.erase(it);
+}
+
+void LayoutCache::clear()
+{
+    map_.clear();
+    owner_.clear();
+    hits_ = 0;
+    misses_ = 0;
+}
+
+void LayoutCache::set_enabled(bool enabled)
+{
+    LOG(INFO) << "Layout cache enabled: " << enabled;
+    enabled_ = enabled;
+    if (!enabled_)
+        clear();
+}
+
+void CachedSrcNet::run(const memory& src, const memory& cached)
+{
+    void* own = src.get_data_handle();
+    src.set_data_handle(cached.get_data_handle());
+    try {
+        if (!stream_) {
+            stream_.reset(new stream(stream::kind::eager));
+            stream_->submit(primitives_).wait();
+        } else {
+            stream_->rerun().wait();
+        }
+    } catch (...) {
+        src.set_data_handle(own);
+        throw;
+    }
+    src.set_data_handle(own);
+}
+
+void set_layout_cache_enabled(bool enabled)
+{
+    LayoutCache::get_instance().set_enabled(enabled);
+}
+
+bool get_layout_cache_enabled()
+{
+    return LayoutCache::get_instance().enabled();
+}
+
+std::size_t get_layout_cache_size()
+{
+    return LayoutCache::get_instance().size();
+}
+
+unsigned long get_layout_cache_hits()
+{
+    return LayoutCache::get_instance().hits();
+}
+
+unsigned long get_layout_cache_misses()
+{
+    return LayoutCache::get_instance().misses();
+}
+
+void release_layout(std::size_t data)
+{
+    LayoutCache::get_instance().release(reinterpret_cast<void*>(data));
+}
+
+void clear_layout_cache()
+{
+    LayoutCache::get_instance().clear();
+}
+
+
+// vim: et ts=4 sw=4 cindent cino^=l0,\:0,N-s
@@ -0,0 +1,151 @@
+/*
+ *COPYRIGHT
+ *All modification made by Intel Corporation: © 2017 Intel Corporation.
+ *Copyright (c) 2015 Preferred Infrastructure, Inc.
+ *Copyright (c) 2015 Preferred Networks, Inc.
+ *
+ *Permission is hereby granted, free of charge, to any person obtaining a copy
+ *of this software and associated documentation files (the "Software"), to deal
+ *in the Software without restriction, including without limitation the rights
+ *to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ *copies of the Software, and to permit persons to whom the Software is
+ *furnished to do so, subject to the following conditions:
+ *
+ *The above copyright notice and this permission notice shall be included in
+ *all copies or substantial portions of the Software.
+ *
+ *THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ *IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ *FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ *AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ *LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ *OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ *THE SOFTWARE.
+ *
+ *
+ *######################################################################
+ *# The CuPy is designed based on NumPy's API.
+ *# CuPy's source code and documents contain the original NumPy ones.
+ *######################################################################
+ *Copyright (c) 2005-2016, NumPy Developers.
+ *All rights reserved.
+ *
+ *Redistribution and use in source and binary forms, with or without
+ *modification, are permitted provided that the following conditions are
+ *met:
+ *
+ *    * Redistributions of source code must retain the above copyright
+ *       notice, this list of conditions and the following disclaimer.
+ *
+ *    * Redistributions in binary form must reproduce the above
+ *       copyright notice, this list of conditions and the following
+ *       disclaimer in the documentation and/or other materials provided
+ *       with the distribution.
+ *
+ *    * Neither the name of the NumPy Developers nor the names of any
+ *       contributors may be used to endorse or promote products derived
+ *       from this software without specific prior written permission.
+ *
+ *THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS
+ *"AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT
+ *LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR
+ *A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT
+ *OWNER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+ *SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT
+ *LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+ *DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+ *THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+ *(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+ *OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+ *######################################################################
+ */
+
+
+
+#ifndef _LAYOUT_CACHE_H_
+#define _LAYOUT_CACHE_H_
+#include <mkldnn.hpp>
+#include <cstddef>
+#include <memory>
+#include <unordered_map>
+#include <vector>
+
+// Layers compute in the blocked memory formats preferred by MKLDNN (e.g.
+// nChw8c) and reorder their outputs back to the nchw arrays owned by Python.
+// When the layout cache is enabled, a layer registers its blocked output
+// memory under the data pointer of the nchw array it has written:
+//   LayoutCache::get_instance().put(<output pointer>, <blocked memory>)
+// A following layer reading that array looks the pointer up:
+//   LayoutCache::get_instance().get(<input pointer>, <wanted layout>)
+// and, if the blocked memory has the layout it wants, reads it directly
+// instead of reordering the nchw input again.
+//
+// A blocked memory is registered for at most one array at a time, so an
+// entry is dropped as soon as the layer overwrites the memory for another
+// output. Python releases the entry of an array when the array is freed.
+// Arrays must not be modified in place while their entry is alive.
+
+// Layout cache control, exposed to Python
+void          set_layout_cache_enabled(bool enabled);
+bool          get_layout_cache_enabled();
+std::size_t   get_layout_cache_size();
+unsigned long get_layout_cache_hits();
+unsigned long get_layout_cache_misses();
+void          release_layout(std::size_t data);
+void          clear_layout_cache();
+
+#ifndef SWIG
+class LayoutCache {
+private:
+    LayoutCache() {}
+
+public:
+    static LayoutCache& get_instance() {
+        static LayoutCache instance_;
+        return instance_;
+    }
+
+    void put(void* data, std::shared_ptr<mkldnn::memory> mem);
+    std::shared_ptr<mkldnn::memory> get(
+            void* data, const mkldnn::memory::primitive_desc& pd);
+    void release(void* data);
+    void clear();
+
+    void          set_enabled(bool enabled);
+    bool          enabled() const { return enabled_; }
+    std::size_t   size() const { return map_.size(); }
+    unsigned long hits() const { return hits_; }
+    unsigned long misses() const { return misses_; }
+
+    LayoutCache(LayoutCache const&)    = delete;
+    void operator=(LayoutCache const&) = delete;
+
+private:
+    bool enabled_ = false;
+    // nchw data pointer -> blocked memory, and its inverse
+    std::unordered_map<void*, std::shared_ptr<mkldnn::memory> > map_;
+    std::unordered_map<mkldnn::memory*, void*> owner_;
+    unsigned long hits_ = 0;
+    unsigned long misses_ = 0;
+};
+
+// Primitives of a layer without the reorder of its source, run when the
+// source is found in the layout cache.
+class CachedSrcNet {
+public:
+    void push_back(const mkldnn::primitive& p) { primitives_.push_back(p); }
+
+    // Runs the primitives with ``src`` temporarily reading the data of
+    // ``cached``.
+    void run(const mkldnn::memory& src, const mkldnn::memory& cached);
+
+private:
+    std::vector<mkldnn::primitive> primitives_;
+    std::shared_ptr<mkldnn::stream> stream_;
+};
+#endif // SWIG
+
+#endif // _LAYOUT_CACHE_H_
+
+
+// vim: et ts=4 sw=4 cindent cino^=l0,\:0,N-s
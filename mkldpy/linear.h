@@ -106,7 +106,7 @@ private:
                                 x_d1, x_d2,
                                 W_d1, W_d2,
                                 b_d1));
-        assert(linear_backward != NULL);//We must have already done backward before
+        check_backward_layer(linear_backward);
         return linear_backward;
     }
 
@@ -66,6 +66,7 @@
 #include "common.h"
 #include "mkldnn.hpp"
 #include "lrn.h"
+#include "layout_cache.h"
 #include "utils.h"
 
 using namespace mkldnn;
@@ -185,6 +186,10 @@ int LocalResponseNormalization<T>::forward_setup(
     if (reorder_y_p) this->fwd_primitives_.push_back(reorder_y_);
     fwd_stream_.reset(new stream(stream::kind::eager));
 
+    // same primitives without the x reorder, for x in the layout cache
+    fwd_cached_src_net_.push_back(*lrn_fwd_);
+    if (reorder_y_p) fwd_cached_src_net_.push_back(reorder_y_);
+
     return workspace_size;
 }
 
@@ -230,8 +235,18 @@ int LocalResponseNormalization<T>::forward(
         fwd_stream_->submit(fwd_primitives_).wait();
     } else {
         fwd_reset_mem(x, y, ws);
-        fwd_stream_->rerun().wait();
+        std::shared_ptr<memory> cached_x;
+        if (x_mem_ != user_x_mem_)
+            cached_x = LayoutCache::get_instance().get(
+                    x, x_mem_->get_primitive_desc());
+        if (cached_x
+                && cached_x->get_data_handle() != y_mem_->get_data_handle())
+            fwd_cached_src_net_.run(*x_mem_, *cached_x);
+        else
+            fwd_stream_->rerun().wait();
     }
+    if (y_mem_ != user_y_mem_)
+        LayoutCache::get_instance().put(y, y_mem_);
     return 0;
 }
 
@@ -375,7 +390,7 @@ LocalResponseNormalization<T>* LocalResponseNormalization<T>::get_backward_objec
 {
     auto lrn_backward = dynamic_cast<LocalResponseNormalization<T>*>(
         LayerFactory<T>::get_instance().get_lrn_layer(x_d1,x_d2,x_d3,x_d4,n,k,alpha,beta));
-    assert (lrn_backward != NULL);  // we must have already done forward before
+    check_backward_layer(lrn_backward);
     return lrn_backward;
 }
 
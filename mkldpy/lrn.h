@@ -71,6 +71,7 @@
 #include <memory>
 #include "layer.h"
 #include "layer_factory.h"
+#include "layout_cache.h"
 
 template <typename T>
 class LocalResponseNormalization : public Layer<T>
@@ -192,6 +193,7 @@ private:
     std::shared_ptr<mkldnn::lrn_forward> lrn_fwd_;
     std::shared_ptr<mkldnn::stream> fwd_stream_;
     std::vector<mkldnn::primitive> fwd_primitives_;
+    CachedSrcNet fwd_cached_src_net_;
 
     //backward
     std::shared_ptr<mkldnn::memory> lrn_bwd_user_src_mem_, lrn_diff_src_mem_, lrn_diff_dst_mem_;
@@ -4,6 +4,7 @@
     #define SWIG_FILE_WITH_INIT
     #include "common.h"
     #include "layer_factory.h"
+    #include "layout_cache.h"
     #include "layer.h"
     #include "linear.h"
     #include "pooling.h"
@@ -22,6 +23,17 @@
 %}
 
 %include "numpy.i"
+%include "exception.i"
+
+/* C++ exceptions, e.g. a layer released before its backward computation,
+   are raised as RuntimeError instead of terminating the process */
+%exception {
+    try {
+        $action
+    } catch (const std::exception& e) {
+        SWIG_exception(SWIG_RuntimeError, e.what());
+    }
+}
 
 %init %{
     import_array();
@@ -92,6 +104,7 @@
 
 %include "common.h"
 %include "layer_factory.h"
+%include "layout_cache.h"
 %include "layer.h"
 %include "linear.h"
 %include "pooling.h"
@@ -66,6 +66,7 @@
 #include "common.h"
 #include "mkldnn.hpp"
 #include "pooling.h"
+#include "layout_cache.h"
 #include "utils.h"
 
 using namespace mkldnn;
@@ -182,6 +183,10 @@ int Pooling<T>::forward_setup(int x_d1, int x_d2, int x_d3, int x_d4,
     if (reorder_y_p) this->forward_primitives_.push_back(reorder_y_);
     this->forward_stream_ = new stream(stream::kind::eager);
 
+    // same primitives without the x reorder, for x in the layout cache
+    fwd_cached_src_net_.push_back(*fwd_);
+    if (reorder_y_p) fwd_cached_src_net_.push_back(reorder_y_);
+
     x_d1_     = x_d1;
     x_d2_     = x_d2;
     x_d3_     = x_d3;
@@ -345,12 +350,21 @@ int Pooling<T>::forward(T*   x,  int x_d1,  int x_d2,  int x_d3,  int x_d4,
     user_y_mem_->set_data_handle(y);
     if (ws != NULL)
         workspace_mem_->set_data_handle(ws);
+    std::shared_ptr<memory> cached_x;
+    if (!this->forward_first_use_ && x_mem_ != user_x_mem_)
+        cached_x = LayoutCache::get_instance().get(
+                x, x_mem_->get_primitive_desc());
     if (this->forward_first_use_) {
         this->forward_stream_->submit(this->forward_primitives_).wait();
         this->forward_first_use_ = false;
+    } else if (cached_x
+            && cached_x->get_data_handle() != y_mem_->get_data_handle()) {
+        fwd_cached_src_net_.run(*x_mem_, *cached_x);
     } else {
         this->forward_stream_->rerun().wait();
     }
+    if (y_mem_ != user_y_mem_)
+        LayoutCache::get_instance().put(y, y_mem_);
     LOG(INFO) << "    y={" << y[0] << "," << y[1] << ","
                            << y[2] << "," << y[3] << "}";
     return 0;
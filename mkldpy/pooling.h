@@ -71,6 +71,7 @@
 #include <vector>
 #include "layer.h"
 #include "layer_factory.h"
+#include "layout_cache.h"
 
 template <typename T>
 class Pooling: public Layer<T>{
@@ -157,8 +158,7 @@ protected:
                                 (x_d1, x_d2, x_d3, x_d4,
                                  s_y, s_x, ker_h, ker_w, p_u, p_d, p_l, p_r));
         }
-        assert (pooling_backward != NULL);  // we must have already done forward
-                                            // before
+        check_backward_layer(pooling_backward);
         if (pooling_backward->backward_first_setup_ == true) {
             pooling_backward->backward_setup(x_d1, x_d2, x_d3, x_d4,
                                        s_y, s_x, p_u, p_d, p_l, p_r,
@@ -268,6 +268,7 @@ private:
     mkldnn::primitive                         reorder_y_;
     mkldnn::primitive                         reorder_gx_;
     mkldnn::primitive                         reorder_gy_;
+    CachedSrcNet                              fwd_cached_src_net_;
 };
 
 #endif // _POOLING_H_
@@ -106,8 +106,7 @@ public:
         Relu<T>* relu_backward = NULL;
             relu_backward = dynamic_cast<Relu<T>*>(
                                 LayerFactory<T>::get_instance().get_relu_layer(x_d1));
-        assert (relu_backward != NULL);  // we must have already done forward
-                                            // before
+        check_backward_layer(relu_backward);
         return relu_backward;
     }
 
@@ -115,8 +115,7 @@ public:
             relu4d_backward = dynamic_cast<Relu4D<T>*>(
                                 LayerFactory<T>::get_instance().get_relu4d_layer
                                 (x_d1, x_d2, x_d3, x_d4));
-        assert (relu4d_backward != NULL);  // we must have already done forward
-                                            // before
+        check_backward_layer(relu4d_backward);
         if (relu4d_backward->backward_first_setup_ == true) {
 #if 0
             relu4d_backward->backward_setup(x, x_d1, x_d2, x_d3, x_d4,
@@ -42,6 +42,7 @@ extensions = [
                 "mkldpy/common.cc",
                 "mkldpy/cpu_info.cc",
                 "mkldpy/layer_factory.cc",
+                "mkldpy/layout_cache.cc",
                 "mkldpy/linear.cc",
                 "mkldpy/lrn.cc",
                 "mkldpy/pooling.cc",
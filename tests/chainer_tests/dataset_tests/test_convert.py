@@ -273,4 +273,69 @@ class TestToDeviceMultiGPU(unittest.TestCase):
         self.assertEqual(int(y.device), self.device)
 
 
+class TestConcatenatedBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.rand(5, 2, 3)
+        self.t = numpy.arange(5, dtype=numpy.int32)
+
+    def test_tuple(self):
+        batch = dataset.ConcatenatedBatch((self.x, self.t))
+        self.assertEqual(len(batch), 5)
+        x, t = batch[2]
+        numpy.testing.assert_array_equal(x, self.x[2])
+        self.assertEqual(t, 2)
+
+        x, t = dataset.concat_examples(batch)
+        self.assertIs(x, self.x)
+        self.assertIs(t, self.t)
+
+    def test_dict(self):
+        batch = dataset.ConcatenatedBatch({'x': self.x, 't': self.t})
+        self.assertEqual(len(batch), 5)
+        self.assertEqual([e['t'] for e in batch], list(range(5)))
+        arrays = dataset.concat_examples(batch)
+        self.assertIs(arrays['x'], self.x)
+
+    def test_slice(self):
+        batch = dataset.ConcatenatedBatch(self.x)[1::2]
+        self.assertIsInstance(batch, dataset.ConcatenatedBatch)
+        numpy.testing.assert_array_equal(
+            dataset.concat_examples(batch), self.x[1::2])
+
+
+class TestGetBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.rand(5, 2, 3)
+        self.indices = numpy.array([3, 1, 3])
+
+    def check_array(self, x):
+        batch = dataset.get_batch(x, self.indices)
+        self.assertIsInstance(batch, dataset.ConcatenatedBatch)
+        numpy.testing.assert_array_equal(
+            cuda.to_cpu(batch.arrays), self.x[self.indices])
+
+    def test_array_cpu(self):
+        self.check_array(self.x)
+
+    @attr.gpu
+    def test_array_gpu(self):
+        self.check_array(cuda.to_gpu(self.x))
+
+    def test_method(self):
+        x = self.x
+
+        class Dataset(object):
+
+            def get_batch(self, indices):
+                return dataset.ConcatenatedBatch(x[indices] * 2)
+
+        batch = dataset.get_batch(Dataset(), self.indices)
+        numpy.testing.assert_array_equal(batch.arrays, x[self.indices] * 2)
+
+    def test_unsupported(self):
+        self.assertIsNone(dataset.get_batch(list(self.x), self.indices))
+
+
 testing.run_module(__name__, __file__)
@@ -1,6 +1,10 @@
 import os
+import shutil
+import tempfile
 import unittest
 
+import numpy
+
 from chainer import dataset
 from chainer import testing
 
@@ -25,4 +29,47 @@ class TestGetDatasetDirectory(unittest.TestCase):
         self.assertEqual(path, os.path.join(root, 'test'))
 
 
+class TestCacheOrLoadArrays(unittest.TestCase):
+
+    def setUp(self):
+        self.orig_root = dataset.get_dataset_root()
+        self.root = tempfile.mkdtemp()
+        dataset.set_dataset_root(self.root)
+        self.path = os.path.join(self.root, 'arrays')
+        self.x = numpy.arange(12, dtype=numpy.float32).reshape(3, 4)
+        self.y = numpy.array([1, 2, 3], dtype=numpy.uint8)
+        self.n_calls = 0
+
+    def tearDown(self):
+        dataset.set_dataset_root(self.orig_root)
+        shutil.rmtree(self.root)
+
+    def creator(self):
+        self.n_calls += 1
+        return {'x': self.x, 'y': self.y}
+
+    def test_cache_or_load_arrays(self):
+        arrays = dataset.cache_or_load_arrays(self.path, self.creator)
+        self.assertIs(arrays['x'], self.x)
+        self.assertEqual(sorted(os.listdir(self.path)), ['x.npy', 'y.npy'])
+
+        arrays = dataset.cache_or_load_arrays(self.path, self.creator)
+        self.assertEqual(self.n_calls, 1)
+        self.assertEqual(sorted(arrays), ['x', 'y'])
+        self.assertIs(type(arrays['x']), numpy.ndarray)
+        self.assertIsInstance(arrays['x'].base, numpy.memmap)
+        self.assertFalse(arrays['x'].flags.writeable)
+        numpy.testing.assert_array_equal(arrays['x'], self.x)
+        numpy.testing.assert_array_equal(arrays['y'], self.y)
+        self.assertEqual(arrays['y'].dtype, numpy.uint8)
+
+    def test_copy_on_write(self):
+        dataset.cache_or_load_arrays(self.path, self.creator)
+        arrays = dataset.cache_or_load_arrays(
+            self.path, self.creator, mmap_mode='c')
+        arrays['x'][...] = 0
+        arrays = dataset.cache_or_load_arrays(self.path, self.creator)
+        numpy.testing.assert_array_equal(arrays['x'], self.x)
+
+
 testing.run_module(__name__, __file__)
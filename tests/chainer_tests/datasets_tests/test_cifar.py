@@ -1,4 +1,5 @@
 import os
+import shutil
 import unittest
 
 import mock
@@ -25,15 +26,15 @@ class TestCifar(unittest.TestCase):
 
     def tearDown(self):
         if hasattr(self, 'cached_file') and os.path.exists(self.cached_file):
-            os.remove(self.cached_file)
+            shutil.rmtree(self.cached_file)
 
     @attr.slow
     def test_get_cifar10(self):
-        self.check_retrieval_once('cifar-10.npz', get_cifar10)
+        self.check_retrieval_once('cifar-10', get_cifar10)
 
     @attr.slow
     def test_get_cifar100(self):
-        self.check_retrieval_once('cifar-100.npz', get_cifar100)
+        self.check_retrieval_once('cifar-100', get_cifar100)
 
     def check_retrieval_once(self, name, retrieval_func):
         self.cached_file = os.path.join(self.root, name)
@@ -59,24 +60,24 @@ class TestCifar(unittest.TestCase):
     # test caching - call twice
     @attr.slow
     def test_get_cifar10_cached(self):
-        self.check_retrieval_twice('cifar-10.npz', get_cifar10)
+        self.check_retrieval_twice('cifar-10', get_cifar10)
 
     @attr.slow
     def test_get_cifar100_cached(self):
-        self.check_retrieval_twice('cifar-100.npz', get_cifar100)
+        self.check_retrieval_twice('cifar-100', get_cifar100)
 
     def check_retrieval_twice(self, name, retrieval_func):
         self.cached_file = os.path.join(self.root, name)
         train, test = retrieval_func(withlabel=self.withlabel, ndim=self.ndim,
                                      scale=self.scale)
 
-        with mock.patch('chainer.datasets.cifar.numpy', autospec=True) as \
+        with mock.patch('chainer.dataset.download.numpy', autospec=True) as \
                 mnumpy:
             train, test = retrieval_func(withlabel=self.withlabel,
                                          ndim=self.ndim,
                                          scale=self.scale)
-        mnumpy.savez_compressed.assert_not_called()  # creator() not called
-        self.assertEqual(mnumpy.load.call_count, 1)
+        mnumpy.save.assert_not_called()  # creator() not called
+        self.assertEqual(mnumpy.load.call_count, 4)
 
 
 testing.run_module(__name__, __file__)
@@ -45,5 +45,17 @@ class TestDictDataset(unittest.TestCase):
         with self.assertRaises(IndexError):
             dd[3]
 
+    def test_get_batch(self):
+        dd = datasets.DictDataset(x=self.x, y=self.y)
+        indices = numpy.array([1, 2])
+        batch = dd.get_batch(indices)
+        self.assertEqual(sorted(batch.arrays), ['x', 'y'])
+        numpy.testing.assert_array_equal(batch.arrays['x'], self.x[indices])
+        numpy.testing.assert_array_equal(batch.arrays['y'], self.y[indices])
+
+    def test_get_batch_list(self):
+        dd = datasets.DictDataset(x=self.x, y=list(self.y))
+        self.assertIsNone(dd.get_batch(numpy.array([1, 2])))
+
 
 testing.run_module(__name__, __file__)
@@ -0,0 +1,86 @@
+import gzip
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import mock
+import numpy
+
+from chainer import dataset
+from chainer.datasets import mnist
+from chainer.datasets import tuple_dataset
+from chainer import testing
+
+
+def _write_idx(path, array):
+    with gzip.open(path, 'wb') as f:
+        f.write(struct.pack('>i', 0x0800 + array.ndim))
+        for n in array.shape:
+            f.write(struct.pack('>i', n))
+        f.write(array.tobytes())
+
+
+@testing.parameterize(*testing.product({
+    'withlabel': [True, False],
+    'ndim': [1, 3],
+}))
+class TestMnist(unittest.TestCase):
+
+    def setUp(self):
+        self.orig_root = dataset.get_dataset_root()
+        self.root = tempfile.mkdtemp()
+        dataset.set_dataset_root(self.root)
+
+        self.x = numpy.random.randint(
+            0, 256, (5, 28, 28)).astype(numpy.uint8)
+        self.y = numpy.random.randint(0, 10, 5).astype(numpy.uint8)
+        self.x_path = os.path.join(self.root, 'x.gz')
+        self.y_path = os.path.join(self.root, 'y.gz')
+        _write_idx(self.x_path, self.x)
+        _write_idx(self.y_path, self.y)
+
+    def tearDown(self):
+        dataset.set_dataset_root(self.orig_root)
+        shutil.rmtree(self.root)
+
+    def cached_download(self, url):
+        return self.x_path if 'images' in url else self.y_path
+
+    def check_dataset(self, ds):
+        if self.withlabel:
+            self.assertIsInstance(ds, tuple_dataset.TupleDataset)
+            images, labels = ds._datasets
+            self.assertEqual(labels.dtype, numpy.int32)
+            numpy.testing.assert_array_equal(labels, self.y)
+        else:
+            images = ds
+        self.assertIsInstance(images, numpy.ndarray)
+        self.assertEqual(images.dtype, numpy.float32)
+        self.assertEqual(images.shape[1:],
+                         (784,) if self.ndim == 1 else (1, 28, 28))
+        numpy.testing.assert_allclose(
+            images.reshape(5, 28, 28) * 255., self.x, rtol=1e-5)
+
+    def test_get_mnist(self):
+        with mock.patch('chainer.dataset.download.cached_download',
+                        self.cached_download):
+            for _ in range(2):  # creates and loads the cache
+                train, test = mnist.get_mnist(
+                    withlabel=self.withlabel, ndim=self.ndim)
+                self.check_dataset(train)
+                self.check_dataset(test)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.root, 'pfnet/chainer/mnist'))),
+            ['test', 'train'])
+
+    def test_wrong_pair(self):
+        _write_idx(self.y_path, self.y[:4])
+        with mock.patch('chainer.dataset.download.cached_download',
+                        self.cached_download):
+            with self.assertRaises(RuntimeError):
+                mnist.get_mnist()
+
+
+testing.run_module(__name__, __file__)
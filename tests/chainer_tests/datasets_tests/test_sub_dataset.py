@@ -1,5 +1,7 @@
 import unittest
 
+import numpy
+
 from chainer import datasets
 from chainer import testing
 
@@ -33,6 +35,30 @@ class TestSubDataset(unittest.TestCase):
         with self.assertRaises(ValueError):
             datasets.SubDataset(original, 1, 4, [2, 0, 3, 1])
 
+    def test_get_batch(self):
+        original = numpy.arange(5) * 10
+        subset = datasets.SubDataset(original, 1, 4)
+        batch = subset.get_batch(numpy.array([2, 0, -1]))
+        numpy.testing.assert_array_equal(batch.arrays, [30, 10, 30])
+
+    def test_permuted_get_batch(self):
+        original = numpy.arange(5) * 10
+        subset = datasets.SubDataset(original, 1, 4, [2, 0, 3, 1, 4])
+        batch = subset.get_batch(numpy.array([0, 1, 2]))
+        numpy.testing.assert_array_equal(
+            batch.arrays, [subset[i] for i in range(3)])
+
+    def test_get_batch_overrun(self):
+        subset = datasets.SubDataset(numpy.arange(5), 1, 4)
+        with self.assertRaises(IndexError):
+            subset.get_batch(numpy.array([0, 3]))
+        with self.assertRaises(IndexError):
+            subset.get_batch(numpy.array([-4]))
+
+    def test_get_batch_list(self):
+        subset = datasets.SubDataset([1, 2, 3, 4, 5], 1, 4)
+        self.assertIsNone(subset.get_batch(numpy.array([0, 1])))
+
 
 class TestSplitDataset(unittest.TestCase):
 
@@ -44,5 +44,34 @@ class TestTupleDataset(unittest.TestCase):
         with self.assertRaises(IndexError):
             td[3]
 
+    def check_get_batch(self, x0, x1):
+        td = datasets.TupleDataset(x0, x1)
+        indices = numpy.array([2, 0, 2])
+        batch = td.get_batch(indices)
+        self.assertIsInstance(batch.arrays, tuple)
+        self.assertEqual(len(batch), 3)
+        numpy.testing.assert_array_equal(
+            cuda.to_cpu(batch.arrays[0]), cuda.to_cpu(x0)[indices])
+        numpy.testing.assert_array_equal(
+            cuda.to_cpu(batch.arrays[1]), cuda.to_cpu(x1)[indices])
+
+    def test_get_batch_cpu(self):
+        self.check_get_batch(self.x0, self.x1)
+
+    @attr.gpu
+    def test_get_batch_gpu(self):
+        self.check_get_batch(cuda.to_gpu(self.x0), cuda.to_gpu(self.x1))
+
+    def test_get_batch_nested(self):
+        td = datasets.TupleDataset(
+            datasets.SubDataset(self.x0, 0, 3, [1, 2, 0]), self.x1)
+        batch = td.get_batch(numpy.array([0, 1]))
+        numpy.testing.assert_array_equal(batch.arrays[0], self.x0[[1, 2]])
+        numpy.testing.assert_array_equal(batch.arrays[1], self.x1[[0, 1]])
+
+    def test_get_batch_list(self):
+        td = datasets.TupleDataset(self.x0, list(self.x1))
+        self.assertIsNone(td.get_batch(numpy.array([0, 1])))
+
 
 testing.run_module(__name__, __file__)
@@ -1,6 +1,10 @@
+import json
+import random
 import unittest
 
+import mock
 import numpy
+import six
 
 import chainer
 from chainer import cuda
@@ -99,4 +103,161 @@ class TestTimerHookToFunction(unittest.TestCase):
         self.check_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.gy))
 
 
+class _MKLDNNDispatch(chainer.Function):
+
+    def forward(self, inputs):
+        chainer.mkld.enable_reluF(inputs)
+        return inputs[0] * 2,
+
+
+class TestProfileHook(unittest.TestCase):
+
+    def setUp(self):
+        self.h = function_hooks.ProfileHook()
+        self.l = links.Linear(5, 5)
+        self.x = numpy.random.uniform(-0.1, 0.1, (3, 5)).astype(numpy.float32)
+        self.gy = numpy.random.uniform(-0.1, 0.1, (3, 5)).astype(numpy.float32)
+
+    def test_name(self):
+        self.assertEqual(self.h.name, 'ProfileHook')
+
+    def forward_backward(self, x, gy):
+        with self.h:
+            y = functions.exp(self.l(chainer.Variable(x)))
+            y.grad = gy
+            y.backward()
+
+    def check_summary(self, x, gy, path):
+        for _ in range(3):
+            self.forward_backward(x, gy)
+        summary = self.h.summary()
+        self.assertEqual(len(summary), 4)
+        self.assertEqual(
+            sorted((e['key'], e['phase']) for e in summary),
+            [('Exp', 'backward'), ('Exp', 'forward'),
+             ('LinearFunction', 'backward'), ('LinearFunction', 'forward')])
+        totals = [e['total'] for e in summary]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+        for entry in summary:
+            self.assertEqual(entry['count'], 3)
+            self.assertLessEqual(entry['min'], entry['percentiles'][50])
+            self.assertLessEqual(entry['percentiles'][99], entry['max'])
+            self.assertAlmostEqual(entry['mean'] * 3, entry['total'])
+            if entry['key'] == 'Exp':
+                self.assertEqual(entry['path'], path)
+            if entry['key'] == 'LinearFunction' and \
+                    entry['phase'] == 'forward':
+                self.assertEqual(entry['shapes'],
+                                 {((3, 5), (5, 5), (5,)): 3})
+        self.assertAlmostEqual(self.h.total_time(),
+                               sum(e['total'] for e in summary))
+
+    def test_summary_cpu(self):
+        self.check_summary(self.x, self.gy, 'numpy')
+
+    @attr.gpu
+    def test_summary_gpu(self):
+        self.l.to_gpu()
+        self.check_summary(cuda.to_gpu(self.x), cuda.to_gpu(self.gy), 'cupy')
+
+    def test_mkldnn_path(self):
+        with mock.patch('chainer.mkld.mkldnn_enabled', True), \
+                mock.patch('chainer.mkld.enable_linear', False):
+            self.forward_backward(self.x, self.gy)
+        # Exp does not ask for MKLDNN, and Linear is not allowed to use it
+        self.assertEqual(set(e['path'] for e in self.h.summary()),
+                         {'numpy'})
+
+        self.h.clear()
+        with mock.patch('chainer.mkld.mkldnn_enabled', True), self.h:
+            _MKLDNNDispatch()(self.x)
+        self.assertEqual(self.h.summary()[0]['path'], 'mkldnn')
+
+    def test_allocated_bytes(self):
+        f = functions.Exp()
+        self.h.forward_preprocess(f, (self.x,))
+        chainer.cpu_memory.empty((100,), numpy.float32)
+        self.h.forward_postprocess(f, (self.x,))
+        self.assertEqual(self.h.summary()[0]['allocated_bytes'], 400)
+
+    def test_bounded(self):
+        h = function_hooks.ProfileHook(sample_size=5, max_shapes=2)
+        with h:
+            for n in six.moves.range(1, 21):
+                functions.exp(numpy.zeros((n,), numpy.float32))
+        stats, = h._stats.values()
+        self.assertEqual(stats.count, 20)
+        self.assertEqual(len(stats.samples), 5)
+        self.assertEqual(h.summary()[0]['shapes'], {((1,),): 1, ((2,),): 1})
+
+    def test_keeps_global_random_state(self):
+        h = function_hooks.ProfileHook(sample_size=1)
+        state = random.getstate()
+        with h:
+            for _ in six.moves.range(5):
+                functions.exp(numpy.zeros((1,), numpy.float32))
+        self.assertEqual(random.getstate(), state)
+
+    def test_group_by_label(self):
+        h = function_hooks.ProfileHook(group_by='label')
+        with h:
+            functions.exp(self.x)
+        self.assertEqual(h.summary()[0]['key'], functions.Exp().label)
+
+    def test_group_by_callable(self):
+        h = function_hooks.ProfileHook(group_by=lambda f: 'all')
+        with h:
+            functions.exp(functions.exp(self.x))
+        self.assertEqual([e['key'] for e in h.summary()], ['all'])
+        self.assertEqual(h.summary()[0]['count'], 2)
+
+    def test_group_by_call_site(self):
+        h = function_hooks.ProfileHook(group_by='call_site')
+        with h:
+            y = functions.exp(chainer.Variable(self.x))
+            y.grad = self.gy
+            y.backward()
+        keys = set(e['key'] for e in h.summary())
+        self.assertEqual(len(keys), 1)
+        key, = keys
+        self.assertTrue(key.startswith(__file__.rstrip('c')), key)
+
+    def test_invalid_group_by(self):
+        with self.assertRaises(ValueError):
+            function_hooks.ProfileHook(group_by='unknown')
+
+    def test_chrome_trace(self):
+        self.forward_backward(self.x, self.gy)
+        self.h.start_trace(max_events=3)
+        self.forward_backward(self.x, self.gy)
+        self.h.stop_trace()
+        self.forward_backward(self.x, self.gy)
+
+        f = six.StringIO()
+        self.h.export_chrome_trace(f)
+        events = json.loads(f.getvalue())['traceEvents']
+        # The last three calls of the window
+        self.assertEqual([(e['name'], e['cat']) for e in events],
+                         [('Exp', 'forward'), ('Exp', 'backward'),
+                          ('LinearFunction', 'backward')])
+        for e in events:
+            self.assertEqual(e['ph'], 'X')
+            self.assertGreaterEqual(e['dur'], 0)
+        self.assertLessEqual(events[0]['ts'], events[1]['ts'])
+
+    def test_print_report(self):
+        self.forward_backward(self.x, self.gy)
+        f = six.StringIO()
+        self.h.print_report(f)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(lines[0].startswith('key'))
+
+    def test_does_not_keep_functions(self):
+        with self.h:
+            functions.exp(self.x)
+        self.assertEqual(self.h._running, [])
+        self.assertEqual(list(self.h._stats), [('Exp', 'forward', 'numpy')])
+
+
 testing.run_module(__name__, __file__)
@@ -7,6 +7,7 @@ import chainer
 from chainer import cuda
 from chainer import functions
 from chainer import gradient_check
+from chainer.functions.connection import n_step_lstm
 from chainer import testing
 from chainer.testing import attr
 
@@ -166,6 +167,186 @@ class TestNStepLSTM(unittest.TestCase):
                             [cuda.to_gpu(dy) for dy in self.dys])
 
 
+def _fixed_dropout_mask(shape, ratio, dtype):
+    # The same mask for the same shape, so that the function is deterministic
+    rs = numpy.random.RandomState(sum(shape))
+    return (rs.rand(*shape) >= ratio).astype(dtype) / dtype.type(1 - ratio)
+
+
+def _reference(hx, cx, xs, ws, bs, masks=None):
+    hy = hx.copy()
+    cy = cx.copy()
+    ys = []
+    for ind, x in enumerate(xs):
+        batch = x.shape[0]
+        for layer in range(len(ws)):
+            w = ws[layer]
+            b = bs[layer]
+            h_prev = hy[layer, :batch]
+            if masks is not None:
+                x_mask, h_mask = masks[layer]
+                x = x * x_mask[ind]
+                h_prev = h_prev * h_mask[ind]
+            c_prev = cy[layer, :batch]
+            i = sigmoid(x.dot(w[0].T) + h_prev.dot(w[4].T) + b[0] + b[4])
+            f = sigmoid(x.dot(w[1].T) + h_prev.dot(w[5].T) + b[1] + b[5])
+            c_bar = numpy.tanh(
+                x.dot(w[2].T) + h_prev.dot(w[6].T) + b[2] + b[6])
+            o = sigmoid(x.dot(w[3].T) + h_prev.dot(w[7].T) + b[3] + b[7])
+            c = f * c_prev + i * c_bar
+            x = o * numpy.tanh(c)
+            hy[layer, :batch] = x
+            cy[layer, :batch] = c
+        ys.append(x)
+    return hy, cy, ys
+
+
+class TestNStepLSTMCPU(unittest.TestCase):
+
+    batches = [4, 4, 2, 1]
+    in_size = 3
+    out_size = 5
+    n_layers = 2
+    dropout = 0.5
+
+    def setUp(self):
+        self.xs = [numpy.random.uniform(-1, 1, (b, self.in_size)).astype('f')
+                   for b in self.batches]
+        # The initial states may have more sequences than the inputs
+        h_shape = (self.n_layers, self.batches[0] + 1, self.out_size)
+        self.hx = numpy.random.uniform(-1, 1, h_shape).astype('f')
+        self.cx = numpy.random.uniform(-1, 1, h_shape).astype('f')
+        self.ws = []
+        self.bs = []
+        for i in range(self.n_layers):
+            in_size = self.in_size if i == 0 else self.out_size
+            self.ws.append([numpy.random.uniform(
+                -1, 1, (self.out_size, in_size if j < 4 else self.out_size)
+            ).astype('f') for j in range(8)])
+            self.bs.append([numpy.random.uniform(
+                -1, 1, (self.out_size,)).astype('f') for j in range(8)])
+        self.dys = [numpy.random.uniform(-1, 1, (b, self.out_size)).astype('f')
+                    for b in self.batches]
+        self.dhy = numpy.random.uniform(-1, 1, h_shape).astype('f')
+        self.dcy = numpy.random.uniform(-1, 1, h_shape).astype('f')
+
+    def call(self, hx, cx, ws, bs, xs):
+        return functions.n_step_lstm(
+            self.n_layers, self.dropout, hx, cx, ws, bs, xs)
+
+    def test_single_node(self):
+        hy, cy, ys = self.call(self.hx, self.cx, self.ws, self.bs, self.xs)
+        self.assertIsInstance(hy.creator, n_step_lstm.NStepLSTMCPU)
+        for v in (cy,) + ys:
+            self.assertIs(v.creator, hy.creator)
+
+    def test_forward_test_mode(self):
+        with chainer.using_config('train', False):
+            hy, cy, ys = self.call(
+                self.hx, self.cx, self.ws, self.bs, self.xs)
+        e_hy, e_cy, e_ys = _reference(
+            self.hx, self.cx, self.xs, self.ws, self.bs)
+        testing.assert_allclose(hy.data, e_hy, rtol=1e-4, atol=1e-4)
+        testing.assert_allclose(cy.data, e_cy, rtol=1e-4, atol=1e-4)
+        for y, e_y in zip(ys, e_ys):
+            testing.assert_allclose(y.data, e_y, rtol=1e-4, atol=1e-4)
+
+    @mock.patch('chainer.functions.connection.n_step_lstm._dropout_mask',
+                _fixed_dropout_mask)
+    def test_forward_dropout(self):
+        hy, cy, ys = self.call(self.hx, self.cx, self.ws, self.bs, self.xs)
+
+        n_rows = sum(self.batches)
+        sections = numpy.cumsum(self.batches)[:-1]
+        masks = []
+        for layer in range(self.n_layers):
+            in_size = self.in_size if layer == 0 else self.out_size
+            x_mask = _fixed_dropout_mask(
+                (n_rows, in_size), self.dropout, numpy.dtype('f'))
+            h_mask = _fixed_dropout_mask(
+                (n_rows, self.out_size), self.dropout, numpy.dtype('f'))
+            masks.append((numpy.split(x_mask, sections),
+                          numpy.split(h_mask, sections)))
+        e_hy, e_cy, e_ys = _reference(
+            self.hx, self.cx, self.xs, self.ws, self.bs, masks)
+        testing.assert_allclose(hy.data, e_hy, rtol=1e-4, atol=1e-4)
+        testing.assert_allclose(cy.data, e_cy, rtol=1e-4, atol=1e-4)
+        for y, e_y in zip(ys, e_ys):
+            testing.assert_allclose(y.data, e_y, rtol=1e-4, atol=1e-4)
+
+    @mock.patch('chainer.functions.connection.n_step_lstm._dropout_mask',
+                _fixed_dropout_mask)
+    def test_backward_dropout(self):
+        args = tuple([self.hx, self.cx] + sum(self.ws, []) +
+                     sum(self.bs, []) + self.xs)
+        grads = tuple([self.dhy, self.dcy] + self.dys)
+
+        def f(*inputs):
+            (hx, cx), inputs = _split(inputs, 2)
+            ws, inputs = _split(inputs, 8 * self.n_layers)
+            bs, xs = _split(inputs, 8 * self.n_layers)
+            hy, cy, ys = self.call(
+                hx, cx, [ws[:8], ws[8:]], [bs[:8], bs[8:]], xs)
+            return (hy, cy) + ys
+
+        gradient_check.check_backward(
+            f, args, grads, eps=1e-2, rtol=1e-3, atol=1e-3)
+
+    def check_forward_lean_dropout(self, mask_mode):
+        numpy.random.seed(0)
+        with chainer.using_config('dropout_mask', mask_mode):
+            hy, cy, ys = self.call(
+                self.hx, self.cx, self.ws, self.bs, self.xs)
+        for _, x_drop, _, h_drops, _, _, _, _, _ in hy.creator.layers:
+            for drop in [x_drop] + h_drops:
+                self.assertEqual(drop.mask_mode, mask_mode)
+                self.assertFalse(hasattr(drop, 'mask'))
+        return hy, cy, ys
+
+    def test_forward_lean_dropout(self):
+        # Both modes draw the same masks from the same seeds
+        hy1, cy1, ys1 = self.check_forward_lean_dropout('packed')
+        hy2, cy2, ys2 = self.check_forward_lean_dropout('seed')
+        testing.assert_allclose(hy1.data, hy2.data)
+        testing.assert_allclose(cy1.data, cy2.data)
+        for y1, y2 in zip(ys1, ys2):
+            testing.assert_allclose(y1.data, y2.data)
+
+    def check_backward_lean_dropout(self, mask_mode):
+        args = tuple([self.hx, self.cx] + sum(self.ws, []) +
+                     sum(self.bs, []) + self.xs)
+        grads = tuple([self.dhy, self.dcy] + self.dys)
+
+        def f(*inputs):
+            (hx, cx), inputs = _split(inputs, 2)
+            ws, inputs = _split(inputs, 8 * self.n_layers)
+            bs, xs = _split(inputs, 8 * self.n_layers)
+            # The same seeds are drawn for every evaluation
+            numpy.random.seed(0)
+            hy, cy, ys = self.call(
+                hx, cx, [ws[:8], ws[8:]], [bs[:8], bs[8:]], xs)
+            return (hy, cy) + ys
+
+        with chainer.using_config('dropout_mask', mask_mode):
+            gradient_check.check_backward(
+                f, args, grads, eps=1e-2, rtol=1e-3, atol=1e-3)
+
+    def test_backward_packed_dropout(self):
+        self.check_backward_lean_dropout('packed')
+
+    def test_backward_seed_dropout(self):
+        self.check_backward_lean_dropout('seed')
+
+    def test_backward_partial_grads(self):
+        hy, cy, ys = self.call(self.hx, self.cx, self.ws, self.bs, self.xs)
+        gxs = hy.creator.backward(
+            tuple(x.data for x in hy.creator.inputs),
+            (None, None, self.dys[0]) + (None,) * (len(ys) - 1))
+        # Only the first step contributes to the gradients of the inputs
+        for gx in gxs[2 + 16 * self.n_layers + 1:]:
+            testing.assert_allclose(gx, numpy.zeros_like(gx))
+
+
 @testing.parameterize(*testing.product({
     'use_cudnn': [True, False],
 }))
@@ -131,6 +131,46 @@ class TestCTCWithAllPadding(TestCTC):
         self.l_length[...] = 1
 
 
+class TestCTCWithMixedPadding(TestCTC):
+
+    def setUp(self):
+        super(TestCTCWithMixedPadding, self).setUp()
+        self.x_length[0] = 2
+        self.l_length[0] = 1
+
+
+class TestCTCRepeatedLabel(TestCTC):
+
+    def setUp(self):
+        super(TestCTCRepeatedLabel, self).setUp()
+        # A blank is required between the repeated labels
+        self.t = numpy.array([[0, 0], [1, 0]]).astype(numpy.int32)
+        self.l = numpy.array([[2, 0, 2, 0, 2],
+                              [2, 1, 2, 0, 2]]).astype(numpy.int32)
+
+
+class TestCTCRecurrenceRelation(unittest.TestCase):
+
+    def check_recurrence_relation(self, xp):
+        f = functions.ConnectionistTemporalClassification(2)
+        path = xp.array([[2, 0, 2, 0, 2], [2, 1, 2, 0, 2]], dtype=numpy.int32)
+        path_length = xp.array([5, 5], dtype=numpy.int32)
+        rr = cuda.to_cpu(
+            f.recurrence_relation(path, path_length, 5, numpy.float32, xp))
+        # The skip from the first label to the second one
+        self.assertEqual(rr[0, 1, 3], f.zero_padding)
+        self.assertEqual(rr[1, 1, 3], 0)
+        # Blanks cannot be skipped over
+        self.assertEqual(rr[1, 0, 2], f.zero_padding)
+
+    def test_recurrence_relation_cpu(self):
+        self.check_recurrence_relation(numpy)
+
+    @attr.gpu
+    def test_recurrence_relation_gpu(self):
+        self.check_recurrence_relation(cuda.cupy)
+
+
 class TestCTCBlankSymbol(TestCTC):
 
     def setUp(self):
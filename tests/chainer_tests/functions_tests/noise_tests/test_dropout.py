@@ -5,6 +5,7 @@ import numpy
 import chainer
 from chainer import cuda
 from chainer import functions
+from chainer.functions.noise import dropout
 from chainer import gradient_check
 from chainer import testing
 from chainer.testing import attr
@@ -12,15 +13,24 @@ from chainer.testing import condition
 
 
 def _dropout(x, creator):
-    return x * creator.mask
-
-
-@testing.parameterize(
-    {'dtype': numpy.float16, 'ratio': 0.1},
-    {'dtype': numpy.float32, 'ratio': 0.3},
-    {'dtype': numpy.float64, 'ratio': 0.5},
-    {'dtype': numpy.float64, 'ratio': 0.0},
-)
+    if hasattr(creator, 'mask'):
+        return x * creator.mask
+    return creator._apply_mask(x)
+
+
+@testing.parameterize(*testing.product_dict(
+    [
+        {'dtype': numpy.float16, 'ratio': 0.1},
+        {'dtype': numpy.float32, 'ratio': 0.3},
+        {'dtype': numpy.float64, 'ratio': 0.5},
+        {'dtype': numpy.float64, 'ratio': 0.0},
+    ],
+    [
+        {'mask_mode': 'dense'},
+        {'mask_mode': 'packed'},
+        {'mask_mode': 'seed'},
+    ]
+))
 class TestDropout(unittest.TestCase):
 
     def setUp(self):
@@ -39,7 +49,7 @@ class TestDropout(unittest.TestCase):
 
     def check_forward(self, x_data):
         x = chainer.Variable(x_data)
-        y = functions.dropout(x, self.ratio)
+        y = functions.dropout(x, self.ratio, self.mask_mode)
         if self.ratio == 0.0:
             y_expect = x_data
         else:
@@ -48,7 +58,7 @@ class TestDropout(unittest.TestCase):
 
     def check_backward(self, x_data, y_grad):
         x = chainer.Variable(x_data)
-        y = functions.dropout(x, self.ratio)
+        y = functions.dropout(x, self.ratio, self.mask_mode)
         creator = y.creator
         y.grad = y_grad
         y.backward()
@@ -84,7 +94,7 @@ class TestDropout(unittest.TestCase):
                             cuda.to_gpu(self.gy))
 
     def check_immutable(self, x_data):
-        d = functions.Dropout(0.5)
+        d = functions.Dropout(0.5, self.mask_mode)
         y1 = d(chainer.Variable(x_data))
         y2 = d(chainer.Variable(x_data))
         testing.assert_allclose(y1.data, y2.data)
@@ -97,4 +107,43 @@ class TestDropout(unittest.TestCase):
         self.check_immutable(cuda.to_gpu(self.x))
 
 
+class TestDropoutMaskMode(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(
+            -1, 1, (3, dropout._chunk_size // 2 + 3)).astype(numpy.float32)
+        self.gy = numpy.random.uniform(-1, 1, self.x.shape).astype(
+            numpy.float32)
+
+    def check_mask_mode(self, mask_mode):
+        x = chainer.Variable(self.x)
+        y = functions.dropout(x, 0.3, mask_mode)
+        y.grad = self.gy
+        y.backward()
+
+        mask = y.data != 0
+        self.assertAlmostEqual(mask.mean(), 0.7, delta=0.01)
+        testing.assert_allclose(y.data[mask], self.x[mask] / 0.7)
+        testing.assert_allclose(x.grad[mask], self.gy[mask] / 0.7)
+        self.assertTrue((x.grad[~mask] == 0).all())
+        self.assertFalse(hasattr(y.creator, 'mask'))
+        return y.creator
+
+    def test_packed(self):
+        creator = self.check_mask_mode('packed')
+        self.assertEqual(creator.packed_mask.nbytes, (self.x.size + 7) // 8)
+
+    def test_seed(self):
+        self.check_mask_mode('seed')
+
+    def test_config(self):
+        with chainer.using_config('dropout_mask', 'seed'):
+            y = functions.dropout(self.x)
+        self.assertEqual(y.creator.mask_mode, 'seed')
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            functions.Dropout(0.5, 'bits')
+
+
 testing.run_module(__name__, __file__)
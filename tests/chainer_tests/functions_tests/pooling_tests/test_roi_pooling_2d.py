@@ -1,6 +1,7 @@
 import unittest
 
 import numpy
+import six
 
 import chainer
 from chainer import cuda
@@ -90,4 +91,95 @@ class TestROIPooling2D(unittest.TestCase):
                             cuda.to_gpu(self.gy))
 
 
+def _round(x):
+    return numpy.sign(x) * numpy.floor(numpy.abs(x) + 0.5)
+
+
+def _roi_pooling_2d_reference(x, rois, outh, outw, spatial_scale):
+    # Transcription of the GPU kernels
+    _, channels, height, width = x.shape
+    n_rois = rois.shape[0]
+    y = numpy.empty((n_rois, channels, outh, outw), dtype=numpy.float32)
+    argmax = numpy.empty(y.shape, dtype=numpy.int32)
+    gx_map = {}
+    scale = numpy.float32(spatial_scale)
+    for i in six.moves.range(n_rois):
+        idx = int(rois[i, 0])
+        start_w, start_h, end_w, end_h = [
+            int(_round(v * scale)) for v in rois[i, 1:]]
+        roi_w = numpy.float32(max(end_w - start_w + 1, 1))
+        roi_h = numpy.float32(max(end_h - start_h + 1, 1))
+        bin_h = roi_h / numpy.float32(outh)
+        bin_w = roi_w / numpy.float32(outw)
+        for c in six.moves.range(channels):
+            for ph in six.moves.range(outh):
+                for pw in six.moves.range(outw):
+                    hs = int(numpy.floor(numpy.float32(ph) * bin_h))
+                    he = int(numpy.ceil(numpy.float32(ph + 1) * bin_h))
+                    ws = int(numpy.floor(numpy.float32(pw) * bin_w))
+                    we = int(numpy.ceil(numpy.float32(pw + 1) * bin_w))
+                    hs = min(max(hs + start_h, 0), height)
+                    he = min(max(he + start_h, 0), height)
+                    ws = min(max(ws + start_w, 0), width)
+                    we = min(max(we + start_w, 0), width)
+                    empty = he <= hs or we <= ws
+                    maxval = 0 if empty else numpy.float32(-1E+37)
+                    maxidx = -1
+                    for h in six.moves.range(hs, he):
+                        for w in six.moves.range(ws, we):
+                            if x[idx, c, h, w] > maxval:
+                                maxval = x[idx, c, h, w]
+                                maxidx = h * width + w
+                    y[i, c, ph, pw] = maxval
+                    argmax[i, c, ph, pw] = maxidx
+                    if (maxidx >= 0 and
+                            start_h <= maxidx // width <= end_h and
+                            start_w <= maxidx % width <= end_w):
+                        gx_map.setdefault((idx, c, maxidx), []).append(
+                            (i, ph, pw))
+    return y, argmax, gx_map
+
+
+@testing.parameterize(*testing.product({
+    'spatial_scale': [0.6, 0.5, 1.0],
+    'outhw': [(5, 7), (3, 3)],
+}))
+class TestROIPooling2DCPUReference(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(
+            -1, 1, (2, 3, 12, 8)).astype(numpy.float32)
+        # ties, a point RoI, a malformed RoI and RoIs out of the image
+        self.x[0, :, 2:4, 1:3] = 2
+        self.rois = numpy.array([
+            [0, 1, 1, 6, 6],
+            [1, 6, 2, 7, 11],
+            [1, 3, 1, 5, 10],
+            [0, 3, 3, 3, 3],
+            [0, 5, 7, 1, 2],
+            [1, -4, -3, 20, 30],
+            [0, 15, 20, 25, 30],
+        ], dtype=numpy.float32)
+        self.outh, self.outw = self.outhw
+        self.gy = numpy.random.uniform(
+            -1, 1, (len(self.rois), 3, self.outh, self.outw)
+        ).astype(numpy.float32)
+
+    def test_forward_backward(self):
+        f = functions.ROIPooling2D(self.outh, self.outw, self.spatial_scale)
+        y, = f.forward_cpu((self.x, self.rois))
+        gx, _ = f.backward_cpu((self.x, self.rois), (self.gy,))
+
+        y_expect, argmax_expect, gx_map = _roi_pooling_2d_reference(
+            self.x, self.rois, self.outh, self.outw, self.spatial_scale)
+        numpy.testing.assert_array_equal(y, y_expect)
+        numpy.testing.assert_array_equal(f.argmax_data, argmax_expect)
+
+        gx_expect = numpy.zeros_like(self.x)
+        for (idx, c, pos), units in gx_map.items():
+            gx_expect[idx, c, pos // 8, pos % 8] = sum(
+                self.gy[i, c, ph, pw] for i, ph, pw in units)
+        testing.assert_allclose(gx, gx_expect)
+
+
 testing.run_module(__name__, __file__)
@@ -1,9 +1,11 @@
 import copy
 import unittest
+import warnings
 
 import numpy
 import six
 
+from chainer import dataset as dataset_module
 from chainer import iterators
 from chainer import testing
 
@@ -167,4 +169,81 @@ class TestMultiprocessIterator(unittest.TestCase):
         for _ in range(2):
             self.assertRaises(StopIteration, copy_it.next)
 
+
+@testing.parameterize(*testing.product({
+    'n_prefetch': [1, 2],
+    'repeat': [True, False],
+}))
+class TestMultiprocessIteratorZeroCopy(unittest.TestCase):
+
+    def setUp(self):
+        self.options = {'n_processes': 2, 'n_prefetch': self.n_prefetch,
+                        'repeat': self.repeat, 'zero_copy': True}
+
+    def check_epoch(self, it, dataset, n_batches, to_key):
+        seen = []
+        for j in range(n_batches):
+            batch = it.next()
+            self.assertIsInstance(batch, dataset_module.ConcatenatedBatch)
+            self.assertEqual(it.is_new_epoch, j == n_batches - 1)
+            for example in batch:
+                seen.append(to_key(example))
+        self.assertEqual(sorted(seen), list(range(len(dataset))))
+
+    def test_tuple(self):
+        dataset = [(numpy.full((2, 3), i, numpy.float32), numpy.int32(i))
+                   for i in range(6)]
+        it = iterators.MultiprocessIterator(dataset, 2, **self.options)
+        for i in range(1 if not self.repeat else 3):
+            self.assertEqual(it.epoch, i)
+            self.check_epoch(it, dataset, 3, lambda e: int(e[1]))
+        if not self.repeat:
+            self.assertRaises(StopIteration, it.next)
+        it.finalize()
+
+    def test_dict(self):
+        dataset = [{'x': numpy.full((3,), i, numpy.float32),
+                    'y': numpy.int32(i)} for i in range(5)]
+        it = iterators.MultiprocessIterator(dataset, 2, **self.options)
+        batches = [it.next() for _ in range(3)]
+        self.assertEqual([len(b) for b in batches],
+                         [2, 2, 2 if self.repeat else 1])
+        it.finalize()
+
+    def test_array(self):
+        dataset = numpy.arange(12, dtype=numpy.float32).reshape(6, 2)
+        it = iterators.MultiprocessIterator(dataset, 3, **self.options)
+        batch = it.next()
+        x = dataset_module.concat_examples(batch)
+        # concat_examples does not copy the arrays
+        self.assertIs(x, batch.arrays)
+        x = x.copy()
+        y = dataset_module.concat_examples(it.next())
+        self.assertEqual(x.shape, (3, 2))
+        self.assertEqual(y.shape, (3, 2))
+        numpy.testing.assert_array_equal(
+            numpy.sort(numpy.concatenate([x, y]), axis=0), dataset)
+        it.finalize()
+
+    def test_fallback(self):
+        dataset = [numpy.zeros((2,), numpy.float32),
+                   numpy.zeros((3,), numpy.float32)]
+        it = iterators.MultiprocessIterator(
+            dataset, 2, shuffle=False, **self.options)
+        batch = it.next()
+        self.assertIsInstance(batch, list)
+        self.assertEqual([len(x) for x in batch], [2, 3])
+        it.finalize()
+
+    def test_not_array(self):
+        dataset = [1, 2, 3, 4]
+        it = iterators.MultiprocessIterator(dataset, 2, **self.options)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            batch = it.next()
+        self.assertTrue(any(x.category is UserWarning for x in w))
+        self.assertIsInstance(batch, list)
+        it.finalize()
+
+
 testing.run_module(__name__, __file__)
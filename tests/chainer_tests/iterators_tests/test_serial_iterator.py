@@ -1,5 +1,9 @@
 import unittest
 
+import numpy
+
+from chainer import dataset as dataset_module
+from chainer import datasets
 from chainer import iterators
 from chainer import testing
 
@@ -120,4 +124,51 @@ class TestSerialIteratorShuffled(unittest.TestCase):
         self.assertNotEqual(out[0:10], out[10:20])
 
 
+@testing.parameterize(*testing.product({
+    'shuffle': [True, False],
+    'repeat': [True, False],
+}))
+class TestSerialIteratorGetBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.arange(5, dtype=numpy.float32) * 2
+        self.t = numpy.arange(5, dtype=numpy.int32)
+
+    def check_batches(self, dataset, unpack):
+        it = iterators.SerialIterator(
+            dataset, 2, repeat=self.repeat, shuffle=self.shuffle)
+        n_batches = 5 if self.repeat else 3
+        xs, ts = [], []
+        for _ in range(n_batches):
+            batch = it.next()
+            self.assertIsInstance(batch, dataset_module.ConcatenatedBatch)
+            x, t = unpack(dataset_module.concat_examples(batch))
+            xs.append(x)
+            ts.append(t)
+        if not self.repeat:
+            self.assertRaises(StopIteration, it.next)
+        x = numpy.concatenate(xs)
+        t = numpy.concatenate(ts)
+        numpy.testing.assert_array_equal(x, t * 2)
+        self.assertEqual(sorted(t[:5]), list(range(5)))
+        if self.repeat:
+            self.assertEqual(sorted(t[5:]), list(range(5)))
+        if not self.shuffle:
+            numpy.testing.assert_array_equal(t, numpy.arange(len(t)) % 5)
+
+    def test_tuple_dataset(self):
+        self.check_batches(
+            datasets.TupleDataset(self.x, self.t), lambda arrays: arrays)
+
+    def test_dict_dataset(self):
+        self.check_batches(
+            datasets.DictDataset(x=self.x, t=self.t),
+            lambda arrays: (arrays['x'], arrays['t']))
+
+    def test_array(self):
+        self.check_batches(
+            numpy.stack((self.x, self.t), axis=1),
+            lambda arrays: (arrays[:, 0], arrays[:, 1]))
+
+
 testing.run_module(__name__, __file__)
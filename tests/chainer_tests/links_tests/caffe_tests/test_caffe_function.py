@@ -1197,6 +1197,167 @@ class TestSplit(TestCaffeFunctionBase):
         self.assertEqual(self.func.split_map, {'y': 'x', 'z': 'x'})
 
 
+class TestExecutionPlan(TestCaffeFunctionBase):
+
+    data = {
+        'layer': [
+            {
+                'name': 'l1',
+                'type': 'ReLU',
+                'bottom': ['x'],
+                'top': ['y'],
+            },
+            {
+                'name': 'l2',
+                'type': 'ReLU',
+                'bottom': ['y'],
+                'top': ['y'],
+            },
+            {
+                'name': 'l3',
+                'type': 'Softmax',
+                'bottom': ['y'],
+                'top': ['z'],
+            },
+            {
+                'name': 'l4',
+                'type': 'Softmax',
+                'bottom': ['x'],
+                'top': ['w'],
+            },
+        ]
+    }
+
+    def setUp(self):
+        super(TestExecutionPlan, self).setUp()
+        self.init_func()
+        self.x = numpy.random.uniform(-1, 1, (2, 3)).astype(numpy.float32)
+
+    def test_outputs(self):
+        y, z = self.func(inputs={'x': self.x}, outputs=['y', 'z'])
+        y_expect = numpy.maximum(self.x, 0)
+        z_expect = numpy.exp(y_expect)
+        z_expect /= z_expect.sum(axis=1, keepdims=True)
+        testing.assert_allclose(y.data, y_expect)
+        testing.assert_allclose(z.data, z_expect)
+        self.assertEqual(sorted(self.func.variables), ['y', 'z'])
+
+    def test_unneeded_layers(self):
+        self.func.forwards['l3'] = mock.MagicMock()
+        self.func.forwards['l4'] = mock.MagicMock()
+        y, = self.func(inputs={'x': self.x}, outputs=['y'])
+        testing.assert_allclose(y.data, numpy.maximum(self.x, 0))
+        self.assertEqual(self.func.forwards['l3'].call_count, 0)
+        self.assertEqual(self.func.forwards['l4'].call_count, 0)
+
+    def test_disable(self):
+        self.func.forwards['l2'] = mock.MagicMock()
+        self.func(inputs={'x': self.x}, outputs=['y'], disable=['l2'])
+        self.assertEqual(self.func.forwards['l2'].call_count, 0)
+
+    def test_plan(self):
+        plan, dead_inputs = caffe.caffe_function._make_plan(
+            self.func.layers, self.func.forwards, {'x'}, ('z',), ())
+        self.assertEqual(plan, [
+            ('l1', ['x'], ['y'], ('x',)),
+            ('l2', ['y'], ['y'], ()),
+            ('l3', ['y'], ['z'], ('y',)),
+        ])
+        self.assertEqual(dead_inputs, ())
+
+    def test_dead_inputs(self):
+        _, dead_inputs = caffe.caffe_function._make_plan(
+            self.func.layers, self.func.forwards, {'x', 'v'}, ('w',), ())
+        self.assertEqual(dead_inputs, ('v',))
+
+
+class TestFoldBatchNormalization(TestCaffeFunctionBase):
+
+    data = {
+        'layer': [
+            {
+                'name': 'conv',
+                'type': 'Convolution',
+                'bottom': ['x'],
+                'top': ['h'],
+                'convolution_param': {
+                    'kernel_size': [2],
+                    'bias_term': False,
+                },
+                'blobs': [
+                    {
+                        'num': 3,
+                        'channels': 2,
+                        'data': list(numpy.linspace(-1, 1, 24)),
+                    },
+                ]
+            },
+            {
+                'name': 'bn',
+                'type': 'BatchNorm',
+                'bottom': ['h'],
+                'top': ['h'],
+                'blobs': [
+                    {
+                        'shape': {'dim': [3]},
+                        'data': [0.1, -0.2, 0.3],
+                    },
+                    {
+                        'shape': {'dim': [3]},
+                        'data': [0.5, 1, 2],
+                    },
+                ],
+                'batch_norm_param': {
+                    'use_global_stats': True,
+                }
+            },
+            {
+                'name': 'scale',
+                'type': 'Scale',
+                'bottom': ['h'],
+                'top': ['h'],
+                'blobs': [
+                    {
+                        'shape': {'dim': [3]},
+                        'data': [1.5, -0.5, 1],
+                    },
+                    {
+                        'shape': {'dim': [3]},
+                        'data': [0.2, 0.1, -0.3],
+                    }
+                ],
+                'scale_param': {
+                    'axis': 1,
+                    'bias_term': True,
+                }
+            },
+            {
+                'name': 'relu',
+                'type': 'ReLU',
+                'bottom': ['h'],
+                'top': ['y'],
+            },
+        ]
+    }
+
+    def test_fold(self):
+        self.init_func()
+        x = numpy.random.uniform(-1, 1, (2, 2, 4, 4)).astype(numpy.float32)
+        with chainer.using_config('train', False):
+            y_expect, = self.func(inputs={'x': x}, outputs=['y'])
+            self.assertIs(self.func.fold_batch_normalization(), self.func)
+            y, = self.func(inputs={'x': x}, outputs=['y'])
+
+        testing.assert_allclose(y.data, y_expect.data, atol=1e-5, rtol=1e-4)
+        self.assertEqual(
+            self.func.layers,
+            [('conv', ['x'], ['h']), ('relu', ['h'], ['y'])])
+        self.assertEqual(sorted(self.func.forwards), ['conv', 'relu'])
+        self.assertFalse(hasattr(self.func, 'bn'))
+        self.assertFalse(hasattr(self.func, 'scale'))
+        self.assertIsNotNone(self.func.conv.b)
+
+
 class TestCaffeFunctionAvailable(unittest.TestCase):
 
     @unittest.skipUnless(six.PY2, 'Only for Py2')
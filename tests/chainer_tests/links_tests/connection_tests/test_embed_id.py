@@ -68,6 +68,51 @@ class TestEmbedID(unittest.TestCase):
         self.check_backward(cuda.to_gpu(self.x), cuda.to_gpu(self.gy))
 
 
+@testing.parameterize(
+    {'x_data': [0, 1, 0], 'ignore_label': None},
+    {'x_data': [[0, 1, 0], [1, 0, 1]], 'ignore_label': None},
+    {'x_data': [[0, 1, -1], [-1, 0, 1]], 'ignore_label': -1},
+    {'x_data': [-1, -1], 'ignore_label': -1},
+)
+class TestEmbedIDSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.link = links.EmbedID(4, 2, ignore_label=self.ignore_label)
+        self.link.cleargrads()
+        self.x = numpy.array(self.x_data, dtype=numpy.int32)
+        y_shape = self.x.shape + (2,)
+        self.gy = numpy.random.uniform(-1, 1, y_shape).astype(numpy.float32)
+
+    def backward(self, n_calls):
+        for _ in range(n_calls):
+            y = self.link(self.x)
+            y.grad = self.gy
+            y.backward()
+
+    def check_sparse_grad(self, n_calls):
+        self.backward(n_calls)
+        expect = self.link.W.grad.copy()
+        self.link.cleargrads()
+        self.link.sparse_grad = True
+        self.backward(n_calls)
+
+        self.assertIsNone(self.link.W.grad)
+        grad = self.link.W.sparse_grad
+        self.assertEqual(grad.shape, (4, 2))
+        numpy.testing.assert_array_equal(
+            grad.indices, numpy.unique(self.x[self.x != -1]))
+        testing.assert_allclose(grad.to_dense(), expect)
+
+        self.link.cleargrads()
+        self.assertIsNone(self.link.W.sparse_grad)
+
+    def test_sparse_grad(self):
+        self.check_sparse_grad(1)
+
+    def test_sparse_grad_accumulate(self):
+        self.check_sparse_grad(2)
+
+
 @testing.parameterize(
     {'t_value': -1, 'valid': False, 'ignore_label': None},
     {'t_value': 3,  'valid': False, 'ignore_label': None},
@@ -115,5 +160,15 @@ class TestEmbedIDUnpickleOldFile(unittest.TestCase):
         y = embed(x)
         self.assertEqual(y.data.shape, (2, 4))
 
+    def test_old_unpickle_sparse_grad(self):
+        embed = links.EmbedID(3, 4)
+        # To emulate an old pickled file
+        delattr(embed, 'sparse_grad')
+        x = chainer.Variable(numpy.arange(2, dtype=numpy.int32))
+        y = embed(x)
+        y.grad = numpy.ones_like(y.data)
+        y.backward()
+        self.assertIsNone(embed.W.sparse_grad)
+
 
 testing.run_module(__name__, __file__)
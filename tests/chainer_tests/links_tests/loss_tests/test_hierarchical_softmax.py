@@ -108,4 +108,34 @@ class TestBinaryHierarchicalSoftmax(unittest.TestCase):
         self.assertTrue((f.codes == g.codes).all())
 
 
+class TestBinaryHierarchicalSoftmaxHuffman(unittest.TestCase):
+
+    def setUp(self):
+        counts = dict((i, numpy.random.randint(1, 100)) for i in range(20))
+        tree = links.BinaryHierarchicalSoftmax.create_huffman_tree(counts)
+        self.link = links.BinaryHierarchicalSoftmax(3, tree)
+        self.link.cleargrads()
+        self.x = numpy.random.uniform(-1, 1, (10, 3)).astype(numpy.float32)
+        # repeated labels share the nodes of their paths
+        self.t = numpy.random.randint(0, 5, (10,)).astype(numpy.int32)
+        self.gy = numpy.random.uniform(-1, 1, ()).astype(numpy.float32)
+
+    def test_forward_cpu(self):
+        f = self.link._func
+        W = self.link.W.data
+        expect = 0
+        for x, t in zip(self.x, self.t):
+            path = f.paths[f.begins[t]:f.begins[t + 1]]
+            code = f.codes[f.begins[t]:f.begins[t + 1]]
+            expect += numpy.sum(numpy.logaddexp(0, -W[path].dot(x) * code))
+        loss = self.link(chainer.Variable(self.x), chainer.Variable(self.t))
+        testing.assert_allclose(loss.data, expect, atol=1e-4, rtol=1e-4)
+
+    @condition.retry(3)
+    def test_backward_cpu(self):
+        gradient_check.check_backward(
+            self.link, (self.x, self.t), self.gy, self.link.W,
+            eps=1e-2, atol=1e-3, rtol=1e-3)
+
+
 testing.run_module(__name__, __file__)
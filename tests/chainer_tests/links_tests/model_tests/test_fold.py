@@ -0,0 +1,103 @@
+import unittest
+
+import numpy
+
+import chainer
+from chainer import cuda
+from chainer import links
+from chainer.links.model import fold
+from chainer import testing
+from chainer.testing import attr
+
+
+def _uniform(low, high, size):
+    return numpy.random.uniform(low, high, size).astype(numpy.float32)
+
+
+@testing.parameterize(*testing.product({
+    'link': ['conv', 'linear'],
+    'nobias': [True, False],
+}))
+class TestFold(unittest.TestCase):
+
+    def setUp(self):
+        if self.link == 'conv':
+            self.target = links.Convolution2D(
+                3, 4, 3, nobias=self.nobias,
+                initialW=_uniform(-1, 1, (4, 3, 3, 3)))
+            self.x = _uniform(-1, 1, (2, 3, 5, 5))
+        else:
+            self.target = links.Linear(3, 4, nobias=self.nobias)
+            self.x = _uniform(-1, 1, (2, 3))
+        if not self.nobias:
+            self.target.b.data[:] = _uniform(-1, 1, 4)
+
+        self.bn = links.BatchNormalization(4)
+        self.bn.avg_mean[:] = _uniform(-1, 1, 4)
+        self.bn.avg_var[:] = _uniform(0.5, 1, 4)
+        self.bn.gamma.data[:] = _uniform(0.5, 1, 4)
+        self.bn.beta.data[:] = _uniform(-1, 1, 4)
+        self.scale = links.Scale(1, (4,), bias_term=True)
+        self.scale.W.data[:] = _uniform(-1, 1, 4)
+        self.scale.bias.b.data[:] = _uniform(-1, 1, 4)
+        self.bias = links.Bias(1, (4,))
+        self.bias.b.data[:] = _uniform(-1, 1, 4)
+
+    def check_fold(self, fold_func, follower):
+        with chainer.using_config('train', False):
+            y_expect = follower(self.target(self.x)).data
+            fold_func(self.target, follower)
+            y = self.target(self.x).data
+        testing.assert_allclose(y, y_expect, atol=1e-5, rtol=1e-4)
+        self.assertIsNotNone(self.target.b)
+
+    def test_batch_normalization(self):
+        self.check_fold(fold.fold_batch_normalization, self.bn)
+
+    def test_batch_normalization_without_gamma_beta(self):
+        bn = links.BatchNormalization(4, use_gamma=False, use_beta=False)
+        bn.avg_mean[:] = self.bn.avg_mean
+        bn.avg_var[:] = self.bn.avg_var
+        self.check_fold(fold.fold_batch_normalization, bn)
+
+    def test_scale(self):
+        self.check_fold(fold.fold_scale, self.scale)
+
+    def test_bias(self):
+        self.check_fold(fold.fold_bias, self.bias)
+
+    @attr.gpu
+    def test_batch_normalization_gpu(self):
+        self.target.to_gpu()
+        self.bn.to_gpu()
+        self.x = cuda.to_gpu(self.x)
+        self.check_fold(fold.fold_batch_normalization, self.bn)
+
+
+class TestFoldInvalid(unittest.TestCase):
+
+    def test_invalid_link(self):
+        with self.assertRaises(TypeError):
+            fold.fold_batch_normalization(
+                links.Bias(1, (4,)), links.BatchNormalization(4))
+
+    def test_uninitialized_link(self):
+        with self.assertRaises(RuntimeError):
+            fold.fold_batch_normalization(
+                links.Linear(None, 4), links.BatchNormalization(4))
+
+    def test_channel_mismatch(self):
+        with self.assertRaises(ValueError):
+            fold.fold_batch_normalization(
+                links.Linear(3, 4), links.BatchNormalization(5))
+
+    def test_scale_without_weight(self):
+        with self.assertRaises(ValueError):
+            fold.fold_scale(links.Linear(3, 4), links.Scale(1))
+
+    def test_scale_axis(self):
+        with self.assertRaises(ValueError):
+            fold.fold_scale(links.Linear(3, 4), links.Scale(0, (4,)))
+
+
+testing.run_module(__name__, __file__)
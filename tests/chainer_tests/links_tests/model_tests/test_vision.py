@@ -2,7 +2,9 @@ import unittest
 
 import numpy
 
+import chainer
 from chainer import cuda
+from chainer.links import BatchNormalization
 from chainer.links.model.vision import resnet
 from chainer.links.model.vision import vgg
 from chainer import testing
@@ -45,6 +47,25 @@ class TestResNet50Layers(unittest.TestCase):
         self.link.to_gpu()
         self.check_call()
 
+    def test_fold_batch_normalization(self):
+        for link in self.link.links():
+            if isinstance(link, BatchNormalization):
+                size = link.avg_mean.shape
+                link.avg_mean[:] = numpy.random.uniform(-1, 1, size)
+                link.avg_var[:] = numpy.random.uniform(0.5, 1, size)
+                link.gamma.data[:] = numpy.random.uniform(0.5, 1, size)
+                link.beta.data[:] = numpy.random.uniform(-1, 1, size)
+        x = numpy.random.uniform(-1, 1, (1, 3, 64, 64)).astype(numpy.float32)
+
+        with chainer.using_config('train', False):
+            y_expect = self.link(x, layers=['fc6'])['fc6'].data
+            folded = self.link.fold_batch_normalization()
+            y = folded(x, layers=['fc6'])['fc6'].data
+        self.assertIs(folded, self.link)
+        self.assertFalse(any(isinstance(link, BatchNormalization)
+                             for link in folded.links()))
+        testing.assert_allclose(y, y_expect, atol=1e-3, rtol=1e-3)
+
     def test_prepare(self):
         x1 = numpy.random.uniform(0, 255, (320, 240, 3)).astype(numpy.uint8)
         x2 = numpy.random.uniform(0, 255, (320, 240)).astype(numpy.uint8)
@@ -68,6 +89,29 @@ class TestResNet50Layers(unittest.TestCase):
         self.assertEqual(y5.shape, (3, 160, 120))
         self.assertEqual(y5.dtype, numpy.float32)
 
+    def test_prepare_batch(self):
+        x1 = numpy.random.uniform(0, 255, (320, 240, 3)).astype(numpy.uint8)
+        x2 = numpy.random.uniform(0, 255, (320, 240)).astype(numpy.uint8)
+        x3 = numpy.random.uniform(0, 255, (3, 160, 120)).astype(numpy.float32)
+
+        for n_threads in (None, 1, 2):
+            y = resnet.prepare_batch([x1, x2, x3], n_threads=n_threads)
+            expect = numpy.array([resnet.prepare(x) for x in (x1, x2, x3)])
+            numpy.testing.assert_array_equal(y, expect)
+
+    def test_extract_batchsize(self):
+        x1 = numpy.random.uniform(0, 255, (64, 48, 3)).astype(numpy.uint8)
+        x2 = numpy.random.uniform(0, 255, (64, 48)).astype(numpy.uint8)
+
+        with numpy.errstate(divide='ignore'), \
+                chainer.using_config('train', False):
+            expect = self.link.extract(
+                [x1, x2, x1], layers=['pool5'], size=(64, 64))
+            result = self.link.extract(
+                iter([x1, x2, x1]), layers=['pool5'], size=(64, 64),
+                batchsize=2)
+        testing.assert_allclose(result['pool5'].data, expect['pool5'].data)
+
     def check_extract(self):
         x1 = numpy.random.uniform(0, 255, (320, 240, 3)).astype(numpy.uint8)
         x2 = numpy.random.uniform(0, 255, (320, 240)).astype(numpy.uint8)
@@ -110,6 +154,11 @@ class TestResNet50Layers(unittest.TestCase):
             y = cuda.to_cpu(result.data)
             self.assertEqual(y.shape, (2, 1000))
             self.assertEqual(y.dtype, numpy.float32)
+            result = self.link.predict(
+                iter([x1, x2, x1]), oversample=True, batchsize=2)
+            y = cuda.to_cpu(result.data)
+            self.assertEqual(y.shape, (3, 1000))
+            self.assertEqual(y.dtype, numpy.float32)
 
     def test_predict_cpu(self):
         self.check_predict()
@@ -171,6 +220,29 @@ class TestVGG16Layers(unittest.TestCase):
         self.assertEqual(y5.shape, (3, 160, 120))
         self.assertEqual(y5.dtype, numpy.float32)
 
+    def test_prepare_batch(self):
+        x1 = numpy.random.uniform(0, 255, (320, 240, 3)).astype(numpy.uint8)
+        x2 = numpy.random.uniform(0, 255, (320, 240)).astype(numpy.uint8)
+        x3 = numpy.random.uniform(0, 255, (3, 160, 120)).astype(numpy.float32)
+
+        for n_threads in (None, 1, 2):
+            y = vgg.prepare_batch([x1, x2, x3], n_threads=n_threads)
+            expect = numpy.array([vgg.prepare(x) for x in (x1, x2, x3)])
+            numpy.testing.assert_array_equal(y, expect)
+
+    def test_extract_batchsize(self):
+        x1 = numpy.random.uniform(0, 255, (64, 48, 3)).astype(numpy.uint8)
+        x2 = numpy.random.uniform(0, 255, (64, 48)).astype(numpy.uint8)
+
+        with numpy.errstate(divide='ignore'), \
+                chainer.using_config('train', False):
+            expect = self.link.extract(
+                [x1, x2, x1], layers=['pool5'], size=(64, 64))
+            result = self.link.extract(
+                iter([x1, x2, x1]), layers=['pool5'], size=(64, 64),
+                batchsize=2)
+        testing.assert_allclose(result['pool5'].data, expect['pool5'].data)
+
     def check_extract(self):
         x1 = numpy.random.uniform(0, 255, (320, 240, 3)).astype(numpy.uint8)
         x2 = numpy.random.uniform(0, 255, (320, 240)).astype(numpy.uint8)
@@ -209,6 +281,11 @@ class TestVGG16Layers(unittest.TestCase):
         y = cuda.to_cpu(result.data)
         self.assertEqual(y.shape, (2, 1000))
         self.assertEqual(y.dtype, numpy.float32)
+        result = self.link.predict(
+            iter([x1, x2, x1]), oversample=True, batchsize=2)
+        y = cuda.to_cpu(result.data)
+        self.assertEqual(y.shape, (3, 1000))
+        self.assertEqual(y.dtype, numpy.float32)
 
     def test_predict_cpu(self):
         self.check_predict()
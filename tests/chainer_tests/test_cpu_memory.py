@@ -0,0 +1,118 @@
+import unittest
+
+import numpy
+
+from chainer import cpu_memory
+from chainer import testing
+
+
+class TestMemoryPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = cpu_memory.MemoryPool(1 << 20, min_size=1024)
+
+    def test_empty(self):
+        a = self.pool.empty((16, 32), numpy.float32)
+        self.assertIsInstance(a, numpy.ndarray)
+        self.assertEqual(a.shape, (16, 32))
+        self.assertEqual(a.dtype, numpy.float32)
+        self.assertTrue(a.flags.c_contiguous)
+        self.assertTrue(a.flags.writeable)
+        a[...] = 1
+        self.assertEqual(self.pool.info(), (0, 1, 2048, 0, 1 << 20))
+
+    def test_int_shape(self):
+        a = self.pool.empty(numpy.int64(512), 'i')
+        self.assertEqual(a.shape, (512,))
+
+    def test_reuse(self):
+        a = self.pool.empty((16, 32), numpy.float32)
+        ptr = a.ctypes.data
+        del a
+        self.assertEqual(self.pool.info(), (0, 1, 0, 2048, 1 << 20))
+
+        # Same size in bytes
+        b = self.pool.empty((1024,), numpy.int16)
+        self.assertEqual(b.ctypes.data, ptr)
+        self.assertEqual(self.pool.info(), (1, 1, 1024 * 2, 0, 1 << 20))
+
+    def test_different_size(self):
+        a = self.pool.empty((16, 32), numpy.float32)
+        del a
+        b = self.pool.empty((16, 33), numpy.float32)
+        self.assertEqual(self.pool.info(), (0, 2, b.nbytes, 2048, 1 << 20))
+
+    def test_view_keeps_memory(self):
+        a = self.pool.empty((16, 32), numpy.float32)
+        a[...] = 3
+        v = a[1:].T
+        del a
+        b = self.pool.empty((16, 32), numpy.float32)
+        b[...] = 0
+        self.assertEqual(self.pool.info().used_bytes, 4096)
+        numpy.testing.assert_array_equal(v, 3)
+        del v
+        self.assertEqual(self.pool.info().cached_bytes, 2048)
+
+    def test_small_array(self):
+        a = self.pool.empty((10,), numpy.float32)
+        self.assertTrue(a.flags.owndata)
+        self.assertEqual(self.pool.info(), (0, 0, 0, 0, 1 << 20))
+
+    def test_capacity(self):
+        pool = cpu_memory.MemoryPool(4096, min_size=1024)
+        arrays = [pool.empty((1024,), numpy.uint8) for _ in range(3)]
+        ptrs = [a.ctypes.data for a in arrays]
+        while arrays:
+            arrays.pop(0)
+        self.assertEqual(pool.info().cached_bytes, 3072)
+
+        pool.set_capacity(2048)
+        self.assertEqual(pool.info().cached_bytes, 2048)
+        # The least recently freed memory has been released
+        a = pool.empty((1024,), numpy.uint8)
+        self.assertIn(a.ctypes.data, ptrs[1:])
+
+    def test_too_large(self):
+        pool = cpu_memory.MemoryPool(4096, min_size=1024)
+        a = pool.empty((8192,), numpy.uint8)
+        del a
+        self.assertEqual(pool.info(), (0, 1, 0, 0, 4096))
+
+    def test_zero_capacity(self):
+        pool = cpu_memory.MemoryPool(0)
+        a = pool.empty((1 << 20,), numpy.uint8)
+        self.assertTrue(a.flags.owndata)
+        self.assertEqual(pool.info(), (0, 0, 0, 0, 0))
+
+    def test_free_all_blocks(self):
+        a = self.pool.empty((2048,), numpy.uint8)
+        del a
+        self.pool.free_all_blocks()
+        self.assertEqual(self.pool.info(), (0, 1, 0, 0, 1 << 20))
+        self.pool.empty((2048,), numpy.uint8)
+        self.assertEqual(self.pool.info().misses, 2)
+
+    def test_allocated_bytes(self):
+        self.pool.empty((16, 32), numpy.float32)
+        self.pool.empty((10,), numpy.float32)
+        self.assertEqual(self.pool.allocated_bytes, 2048 + 40)
+
+    def test_negative_capacity(self):
+        with self.assertRaises(ValueError):
+            cpu_memory.MemoryPool(-1)
+        with self.assertRaises(ValueError):
+            self.pool.set_capacity(-1)
+
+
+class TestDefaultMemoryPool(unittest.TestCase):
+
+    def test_empty(self):
+        pool = cpu_memory.get_memory_pool()
+        self.assertIsInstance(pool, cpu_memory.MemoryPool)
+        a = cpu_memory.empty((1 << 17,), numpy.float32)
+        self.assertEqual(a.shape, (1 << 17,))
+        self.assertEqual(a.dtype, numpy.float32)
+
+
+testing.run_module(__name__, __file__)
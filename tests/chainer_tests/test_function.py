@@ -357,6 +357,100 @@ Actual: 1 < 2"""
             f(v)
 
 
+class TestFunctionTypeCheckCache(unittest.TestCase):
+
+    def setUp(self):
+        class Function(chainer.Function):
+
+            n_checks = 0
+
+            def __init__(self, axis=0, extra=None):
+                self.axis = axis
+                if extra is not None:
+                    self.extra = extra
+
+            def check_type_forward(self, in_types):
+                Function.n_checks += 1
+                x_type, = in_types
+                type_check.expect(
+                    x_type.dtype == numpy.float32,
+                    x_type.ndim > self.axis,
+                )
+
+            def forward(self, inputs):
+                return inputs
+
+        self.Function = Function
+        chainer.function.clear_type_check_cache()
+
+    def tearDown(self):
+        chainer.function.clear_type_check_cache()
+
+    def call(self, shape, dtype=numpy.float32, **kwargs):
+        self.Function(**kwargs)(numpy.zeros(shape, dtype))
+
+    def test_cached(self):
+        self.call((2, 3))
+        self.call((2, 3))
+        self.assertEqual(self.Function.n_checks, 1)
+
+    def test_input_signature(self):
+        self.call((2, 3))
+        self.call((2, 4))
+        self.call((2, 4))
+        self.assertEqual(self.Function.n_checks, 2)
+        with self.assertRaises(type_check.InvalidType):
+            self.call((2, 4), numpy.float64)
+        with self.assertRaises(type_check.InvalidType):
+            self.call((2, 4), numpy.float64)
+        self.assertEqual(self.Function.n_checks, 4)
+
+    def test_attributes(self):
+        self.call((2, 3), axis=1)
+        self.call((2, 3), axis=0)
+        self.assertEqual(self.Function.n_checks, 2)
+        with self.assertRaises(type_check.InvalidType):
+            self.call((2, 3), axis=2)
+
+    def test_array_attribute(self):
+        self.call((2, 3), extra=numpy.zeros(3))
+        self.call((2, 3), extra=numpy.zeros(3))
+        self.call((2, 3), extra=numpy.ones(3))
+        self.call((2, 3), extra=numpy.ones(4))
+        self.assertEqual(self.Function.n_checks, 3)
+
+    def test_large_array_attribute(self):
+        self.call((2, 3), extra=numpy.zeros(65))
+        self.call((2, 3), extra=numpy.zeros(65))
+        self.assertEqual(self.Function.n_checks, 2)
+
+    def test_split_axis_indices(self):
+        x = numpy.zeros((2, 10), numpy.float32)
+        F.split_axis(x, numpy.array([2, 5]), 1)
+        with self.assertRaises(type_check.InvalidType):
+            F.split_axis(x, numpy.array([2, 100]), 1)
+
+    def test_unsupported_attribute(self):
+        self.call((2, 3), extra=object())
+        self.call((2, 3), extra=object())
+        self.assertEqual(self.Function.n_checks, 2)
+
+    def test_clear(self):
+        self.call((2, 3))
+        chainer.function.clear_type_check_cache()
+        self.call((2, 3))
+        self.assertEqual(self.Function.n_checks, 2)
+
+    def test_bounded(self):
+        size = chainer.function._type_check_cache_size
+        for i in six.moves.range(size + 1):
+            self.call((i + 1,))
+        self.call((size + 1,))
+        self.assertEqual(self.Function.n_checks, size + 1)
+        self.call((1,))
+        self.assertEqual(self.Function.n_checks, size + 2)
+
+
 @testing.parameterize(
     {'return_value': (numpy.array([float('nan')], numpy.float32),),
      'valid': False},
@@ -7,6 +7,7 @@ import chainer
 from chainer import cuda
 from chainer import optimizer
 from chainer import optimizers
+from chainer import serializers
 from chainer import testing
 from chainer.testing import attr
 
@@ -418,4 +419,294 @@ class TestGradientMethodClearGrads(unittest.TestCase):
         self.optimizer.update()
 
 
+class FusedModel(chainer.Chain):
+
+    def __init__(self):
+        w = np.random.uniform(-1, 1, (2, 3))
+        super(FusedModel, self).__init__(
+            l1=chainer.links.Linear(3, 4),
+            bn=chainer.links.BatchNormalization(4),
+            l2=chainer.links.Linear(4, 2),
+            # A parameter of another dtype, which is put into another group
+            l3=SimpleLink(w, np.zeros_like(w)),
+        )
+
+    def __call__(self, x):
+        h = self.bn(chainer.functions.relu(self.l1(x)))
+        y = chainer.functions.cast(self.l2(h), np.float64)
+        y = y + chainer.functions.matmul(
+            chainer.functions.cast(x, np.float64), self.l3.param,
+            transb=True)
+        return chainer.functions.sum(y * y)
+
+
+@testing.parameterize(*testing.product({
+    'optimizer': ['SGD', 'MomentumSGD', 'Adam', 'AdaGrad', 'AdaDelta',
+                  'NesterovAG', 'RMSprop', 'RMSpropGraves', 'SMORMS3'],
+    'use_lossfun': [True, False],
+}))
+class TestGradientMethodFusedUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.uniform(-1, 1, (5, 3)).astype(np.float32)
+        self.model = FusedModel()
+        self.fused_model = self.model.copy()
+        self.fused_model.copyparams(self.model)
+        for param in self.fused_model.params():
+            param.data = param.data.copy()
+
+    def create(self, model, fused):
+        opt = getattr(optimizers, self.optimizer)()
+        opt.setup(model)
+        opt.add_hook(optimizer.WeightDecay(0.01))
+        # Clipping changes the gradients depending on the summation order of
+        # the norm, which some optimizers amplify, so it is kept inactive
+        # here and tested by TestFusedGradientClipping.
+        opt.add_hook(optimizer.GradientClipping(1e3))
+        opt.use_fused_update(fused)
+        return opt
+
+    def step(self, model, opt):
+        def lossfun():
+            return model(self.x)
+
+        if self.use_lossfun:
+            opt.update(lossfun)
+        else:
+            model.cleargrads()
+            lossfun().backward()
+            opt.update()
+
+    def check_consistency(self, n_steps=3):
+        for _ in range(n_steps):
+            self.step(self.model, self.opt)
+            self.step(self.fused_model, self.fused_opt)
+        params = dict(self.model.namedparams())
+        for name, param in self.fused_model.namedparams():
+            testing.assert_allclose(param.data, params[name].data,
+                                    atol=1e-5, rtol=1e-4)
+            for key, value in self.fused_opt._states[name].items():
+                testing.assert_allclose(
+                    value, self.opt._states[name][key],
+                    atol=1e-5, rtol=1e-4)
+
+    def test_update(self):
+        self.opt = self.create(self.model, False)
+        self.fused_opt = self.create(self.fused_model, True)
+        self.check_consistency()
+
+        layout = self.fused_opt._fused_layout
+        self.assertEqual(len(layout.groups), 2)
+        self.assertEqual(self.fused_model.l3.param.grad.dtype, np.float64)
+        flat = [fused.data for fused, _, _ in layout.groups]
+        for param in self.fused_model.params():
+            self.assertTrue(any(np.may_share_memory(param.data, f)
+                                for f in flat))
+
+    def test_replace_parameter(self):
+        self.opt = self.create(self.model, False)
+        self.fused_opt = self.create(self.fused_model, True)
+        self.check_consistency(1)
+        layout = self.fused_opt._fused_layout
+        self.fused_model.l1.W.data = self.fused_model.l1.W.data.copy()
+        self.check_consistency(1)
+        self.assertIsNot(self.fused_opt._fused_layout, layout)
+
+    def test_foreign_view(self):
+        # A view of memory shared with others must not be rebound
+        W = self.fused_model.l1.W
+        buf = np.empty(W.data.size + 1, W.data.dtype)
+        view = buf[1:].reshape(W.data.shape)
+        view[...] = W.data
+        W.data = view
+        self.opt = self.create(self.model, False)
+        self.fused_opt = self.create(self.fused_model, True)
+        self.check_consistency()
+        self.assertIs(W.data, view)
+
+    def test_disable(self):
+        self.opt = self.create(self.model, False)
+        self.fused_opt = self.create(self.fused_model, True)
+        self.check_consistency(1)
+        self.fused_opt.use_fused_update(False)
+        self.check_consistency(2)
+
+
+class TestFusedGradientClipping(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.random.uniform(-1, 1, (5, 3)).astype(np.float32)
+
+    def test_gradient_clipping(self):
+        model = FusedModel()
+        fused_model = model.copy()
+        fused_model.copyparams(model)
+        for param in fused_model.params():
+            param.data = param.data.copy()
+        for m, fused in ((model, False), (fused_model, True)):
+            opt = optimizers.SGD()
+            opt.setup(m)
+            opt.add_hook(optimizer.GradientClipping(0.1))
+            opt.use_fused_update(fused)
+            opt.update(lambda: m(self.x))
+        params = dict(model.namedparams())
+        for name, param in fused_model.namedparams():
+            testing.assert_allclose(param.data, params[name].data)
+
+
+@testing.parameterize(*testing.product({
+    'optimizer': ['SGD', 'MomentumSGD', 'AdaGrad', 'Adam'],
+    'hook': [False, True],
+    'fused': [False, True],
+}))
+class TestGradientMethodSparseUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.array([[1, 4, 1], [-1, 0, 4]], dtype=np.int32)
+        self.gy = np.random.uniform(-1, 1, (2, 3, 2)).astype(np.float32)
+        self.link = chainer.links.EmbedID(6, 2, ignore_label=-1)
+        self.sparse_link = self.link.copy()
+        self.sparse_link.copyparams(self.link)
+        self.sparse_link.W.data = self.link.W.data.copy()
+        self.sparse_link.sparse_grad = True
+
+    def create(self, link):
+        opt = getattr(optimizers, self.optimizer)()
+        opt.setup(link)
+        if self.hook:
+            opt.add_hook(optimizer.WeightDecay(0.01))
+        opt.use_fused_update(self.fused)
+        return opt
+
+    def test_update(self):
+        opt = self.create(self.link)
+        sparse_opt = self.create(self.sparse_link)
+        for _ in range(3):
+            for link, o in ((self.link, opt), (self.sparse_link, sparse_opt)):
+                link.cleargrads()
+                y = link(self.x)
+                y.grad = self.gy
+                y.backward()
+                o.update()
+        if (not self.hook and not self.fused and
+                self.optimizer in ('SGD', 'MomentumSGD', 'AdaGrad')):
+            # No dense gradient is made
+            self.assertIsNone(self.sparse_link.W.grad)
+        testing.assert_allclose(self.sparse_link.W.data, self.link.W.data)
+
+
+@testing.parameterize(*testing.product({
+    'optimizer': ['SGD', 'MomentumSGD', 'AdaGrad', 'RMSprop', 'Adam'],
+}))
+class TestGradientMethodLazyUpdate(unittest.TestCase):
+
+    def setUp(self):
+        # Row 5 is never touched and the others are skipped on some steps
+        self.xs = [np.array([0, 1, 1], dtype=np.int32),
+                   np.array([2], dtype=np.int32),
+                   np.array([3, 0], dtype=np.int32),
+                   np.array([4, 2], dtype=np.int32),
+                   np.array([1], dtype=np.int32)]
+        self.gys = [np.random.uniform(-1, 1, (len(x), 3)).astype(np.float32)
+                    for x in self.xs]
+        self.link = chainer.links.EmbedID(6, 3)
+        self.lazy_link = self.link.copy()
+        self.lazy_link.W.data = self.link.W.data.copy()
+        self.lazy_link.sparse_grad = True
+
+    def create(self, link, lazy):
+        opt = getattr(optimizers, self.optimizer)()
+        opt.setup(link)
+        opt.use_lazy_update(lazy)
+        return opt
+
+    def run_steps(self, link, opt, steps):
+        for i in steps:
+            link.cleargrads()
+            y = link(self.xs[i])
+            y.grad = self.gys[i]
+            y.backward()
+            opt.update()
+
+    def reference(self):
+        # Lazy Adam omits the parameter updates of the skipped steps
+        opt = self.create(self.link, False)
+        W = self.link.W.data
+        m = np.zeros_like(W)
+        v = np.zeros_like(W)
+        for i, (x, gy) in enumerate(zip(self.xs, self.gys)):
+            opt.t = i + 1
+            g = np.zeros_like(W)
+            np.add.at(g, x, gy)
+            m += (1 - opt.beta1) * (g - m)
+            v += (1 - opt.beta2) * (g * g - v)
+            rows = np.unique(x)
+            W[rows] -= opt.lr * m[rows] / (np.sqrt(v[rows]) + opt.eps)
+        return m, v
+
+    def test_lazy_update(self):
+        lazy_opt = self.create(self.lazy_link, True)
+        self.run_steps(self.lazy_link, lazy_opt, range(len(self.xs)))
+        lazy_opt.catch_up()
+        if self.optimizer == 'Adam':
+            m, v = self.reference()
+            state = lazy_opt._states['/W']
+            testing.assert_allclose(state['m'], m)
+            testing.assert_allclose(state['v'], v)
+        else:
+            opt = self.create(self.link, False)
+            self.run_steps(self.link, opt, range(len(self.xs)))
+        testing.assert_allclose(self.lazy_link.W.data, self.link.W.data)
+
+    def test_only_touched_rows(self):
+        W = self.lazy_link.W.data.copy()
+        lazy_opt = self.create(self.lazy_link, True)
+        self.run_steps(self.lazy_link, lazy_opt, range(3))
+        np.testing.assert_array_equal(self.lazy_link.W.data[4:], W[4:])
+        if self.optimizer in ('MomentumSGD', 'RMSprop', 'Adam'):
+            np.testing.assert_array_equal(
+                lazy_opt._states['/W']['t_row'], [3, 1, 2, 3, 0, 0])
+
+    def test_resume(self):
+        lazy_opt = self.create(self.lazy_link, True)
+        self.run_steps(self.lazy_link, lazy_opt, range(3))
+        saver = serializers.DictionarySerializer()
+        saver.save(lazy_opt)
+        snapshot = {key: value.copy() for key, value in saver.target.items()}
+        W = self.lazy_link.W.data.copy()
+        self.run_steps(self.lazy_link, lazy_opt, range(3, len(self.xs)))
+        lazy_opt.catch_up()
+
+        link = self.link.copy()
+        link.W.data = W
+        link.sparse_grad = True
+        opt = self.create(link, True)
+        serializers.NpzDeserializer(snapshot).load(opt)
+        self.run_steps(link, opt, range(3, len(self.xs)))
+        opt.catch_up()
+        testing.assert_allclose(link.W.data, self.lazy_link.W.data)
+
+    def test_load_without_t_row(self):
+        saver = serializers.DictionarySerializer()
+        saver.save(self.create(self.link, True))
+        lazy_opt = self.create(self.lazy_link, True)
+        self.run_steps(self.lazy_link, lazy_opt, range(3))
+        serializers.NpzDeserializer(saver.target).load(lazy_opt)
+        self.assertNotIn('t_row', lazy_opt._states['/W'])
+
+    def test_dense_update_between(self):
+        if self.optimizer == 'Adam':
+            return
+        opt = self.create(self.link, False)
+        lazy_opt = self.create(self.lazy_link, True)
+        self.run_steps(self.link, opt, range(len(self.xs)))
+        self.run_steps(self.lazy_link, lazy_opt, range(2))
+        self.lazy_link.sparse_grad = False
+        self.run_steps(self.lazy_link, lazy_opt, [2])
+        self.lazy_link.sparse_grad = True
+        self.run_steps(self.lazy_link, lazy_opt, range(3, len(self.xs)))
+        lazy_opt.catch_up()
+        testing.assert_allclose(self.lazy_link.W.data, self.link.W.data)
+
+
 testing.run_module(__name__, __file__)
@@ -0,0 +1,242 @@
+import unittest
+
+import numpy
+
+import chainer
+from chainer import functions as F
+from chainer import links as L
+from chainer import testing
+
+
+class MLP(chainer.Chain):
+
+    def __init__(self):
+        super(MLP, self).__init__(
+            l1=L.Linear(3, 4),
+            l2=L.Linear(4, 4),
+            l3=L.Linear(4, 2),
+        )
+
+    def __call__(self, x, scale=1):
+        h = F.relu(self.l1(x))
+        # h is used twice to accumulate its gradient
+        h = F.tanh(self.l2(h)) + h * scale
+        a, b = F.split_axis(self.l3(h), 2, axis=1)
+        return a * b, b
+
+
+class DecoratedMLP(MLP):
+
+    @chainer.static_graph
+    def __call__(self, x, scale=1):
+        return super(DecoratedMLP, self).__call__(x, scale)
+
+
+def _is_replayed(y):
+    return y.creator is not None and y.creator.label == 'StaticGraph'
+
+
+class TestStaticGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.model = MLP()
+        self.graph = chainer.static_graph(self.model)
+        self.x = numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32)
+        self.gy = numpy.random.uniform(-1, 1, (5, 1)).astype(numpy.float32)
+
+    def check(self, x, expect_replay, **kwargs):
+        x1 = chainer.Variable(x)
+        self.model.cleargrads()
+        y1, z1 = self.model(x1, **kwargs)
+        y1.grad = self.gy[:len(x)]
+        y1.backward()
+        grads = [p.grad.copy() for p in self.model.params()]
+
+        x2 = chainer.Variable(x)
+        self.model.cleargrads()
+        y2, z2 = self.graph(x2, **kwargs)
+        self.assertEqual(_is_replayed(y2), expect_replay)
+        y2.grad = self.gy[:len(x)]
+        y2.backward()
+
+        testing.assert_allclose(y1.data, y2.data)
+        testing.assert_allclose(z1.data, z2.data)
+        testing.assert_allclose(x1.grad, x2.grad)
+        for g, p in zip(grads, self.model.params()):
+            testing.assert_allclose(g, p.grad)
+
+    def test_replay(self):
+        self.check(self.x, False)
+        for _ in range(3):
+            self.check(self.x, True)
+
+    def test_array_input(self):
+        y = self.graph(self.x)[0]
+        self.assertFalse(_is_replayed(y))
+        y = self.graph(self.x)[0]
+        self.assertTrue(_is_replayed(y))
+        testing.assert_allclose(y.data, self.model(self.x)[0].data)
+
+    def test_shape_change(self):
+        self.check(self.x, False)
+        self.check(self.x[:2], False)
+        self.check(self.x, True)
+        self.check(self.x[:2], True)
+
+    def test_kwargs_change(self):
+        self.check(self.x, False)
+        self.check(self.x, False, scale=2)
+        self.check(self.x, True, scale=2)
+        self.check(self.x, True)
+
+    def test_config_change(self):
+        self.check(self.x, False)
+        with chainer.using_config('train', False):
+            self.check(self.x, False)
+        self.check(self.x, True)
+
+    def test_parameter_update(self):
+        self.check(self.x, False)
+        self.model.l1.W.data *= 2
+        self.check(self.x, True)
+
+    def test_debug(self):
+        self.check(self.x, False)
+        with chainer.using_config('debug', True):
+            self.check(self.x, False)
+
+    def test_no_backprop(self):
+        self.graph(self.x)
+        with chainer.no_backprop_mode():
+            y = self.graph(self.x)[0]
+            self.assertIsNone(y.creator)
+            y = self.graph(self.x)[0]
+            self.assertIsNone(y.creator)
+
+    def test_pending_backward(self):
+        self.graph(self.x)[0].grad = None
+        y1 = self.graph(self.x)[0]
+        y2 = self.graph(self.x)[0]
+        self.assertTrue(_is_replayed(y1))
+        self.assertFalse(_is_replayed(y2))
+        testing.assert_allclose(y1.data, y2.data)
+
+        # A replay whose output is released does not block later ones
+        del y1, y2
+        self.assertTrue(_is_replayed(self.graph(self.x)[0]))
+
+    def test_max_graphs(self):
+        graph = chainer.static_graph(self.model, max_graphs=1)
+        graph(self.x)
+        graph(self.x[:2])
+        self.assertFalse(_is_replayed(graph(self.x)[0]))
+        self.assertTrue(_is_replayed(graph(self.x)[0]))
+
+    def test_clear(self):
+        self.graph(self.x)
+        self.graph.clear()
+        self.assertFalse(_is_replayed(self.graph(self.x)[0]))
+
+
+class TestStaticGraphFallback(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (3, 2)).astype(numpy.float32)
+
+    def test_unsupported_output(self):
+        graph = chainer.static_graph(lambda x: {'y': F.exp(x)})
+        for _ in range(2):
+            y = graph(self.x)['y']
+            self.assertFalse(_is_replayed(y))
+
+    def test_returns_input(self):
+        graph = chainer.static_graph(lambda x: (x, F.exp(x)))
+        for _ in range(2):
+            x = chainer.Variable(self.x)
+            y = graph(x)
+            self.assertIs(y[0], x)
+
+    def test_unhashable_argument(self):
+        graph = chainer.static_graph(lambda x, s: F.exp(x) * s[0])
+        for _ in range(2):
+            y = graph(self.x, [2])
+            self.assertFalse(_is_replayed(y))
+
+    def test_reused_function(self):
+        f = F.Exp()
+        graph = chainer.static_graph(lambda x: f(f(x)))
+        for _ in range(2):
+            y = graph(self.x)
+            self.assertFalse(_is_replayed(y))
+        testing.assert_allclose(y.data, numpy.exp(numpy.exp(self.x)))
+
+    def test_single_output(self):
+        graph = chainer.static_graph(lambda x: F.exp(x))
+        graph(self.x)
+        y = graph(self.x)
+        self.assertIsInstance(y, chainer.Variable)
+        self.assertTrue(_is_replayed(y))
+        testing.assert_allclose(y.data, numpy.exp(self.x))
+
+    def check_random(self, f):
+        x = numpy.ones((4, 8), numpy.float32)
+        graph = chainer.static_graph(f)
+        ys = []
+        for _ in range(4):
+            y = graph(x)
+            y.grad = numpy.ones_like(y.data)
+            y.backward()
+            ys.append(y.data)
+        self.assertTrue(_is_replayed(y))
+        for y in ys[1:]:
+            self.assertFalse(numpy.array_equal(ys[0], y))
+
+    def test_dropout_mask(self):
+        self.check_random(lambda x: F.dropout(F.exp(x), .5))
+
+    def test_dropout_seed_mask(self):
+        self.check_random(
+            lambda x: F.dropout(F.exp(x), .5, mask_mode='seed'))
+
+    def test_dropout_packed_mask(self):
+        self.check_random(
+            lambda x: F.dropout(F.exp(x), .5, mask_mode='packed'))
+
+    def test_gaussian_noise(self):
+        self.check_random(lambda x: F.gaussian(F.exp(x), x))
+
+    def test_negative_sampling(self):
+        # The samples drawn on the recorded call must not be reused
+        W = chainer.Variable(
+            numpy.random.uniform(-1, 1, (10, 3)).astype(numpy.float32))
+
+        def sampler(shape):
+            return numpy.zeros(shape, numpy.int32)
+
+        def f(x, t):
+            return F.negative_sampling(x, t, W, sampler, 2)
+
+        graph = chainer.static_graph(f)
+        x = numpy.random.uniform(-1, 1, (4, 3)).astype(numpy.float32)
+        graph(x, numpy.array([0, 1, 2, 3], numpy.int32))
+        for t in ([7, 8, 9, 6], [5, 4, 3, 2]):
+            t = numpy.array(t, numpy.int32)
+            y = graph(x, t)
+            self.assertTrue(_is_replayed(y))
+            testing.assert_allclose(y.data, f(x, t).data)
+            y.backward()
+
+
+class TestStaticGraphMethod(unittest.TestCase):
+
+    def test_method(self):
+        x = numpy.random.uniform(-1, 1, (5, 3)).astype(numpy.float32)
+        model1 = DecoratedMLP()
+        model2 = DecoratedMLP()
+        model1(x)
+        self.assertTrue(_is_replayed(model1(x)[0]))
+        self.assertFalse(_is_replayed(model2(x)[0]))
+        self.assertTrue(_is_replayed(model2(x)[0]))
+
+
+testing.run_module(__name__, __file__)
@@ -7,6 +7,7 @@ import chainer
 from chainer import cuda
 from chainer import testing
 from chainer.testing import attr
+from chainer.utils import array
 
 import re
 import six
@@ -507,6 +508,26 @@ class TestVariable(unittest.TestCase):
         with cuda.get_device(1):
             self.check_addgrad(a, b, c, clear_src_grad=True)
 
+    def check_addgrad_sparse(self, src_grad, dst_grad, expect):
+        a = chainer.Variable(np.zeros((3, 2), dtype=np.float32))
+        a.grad = src_grad
+        a.sparse_grad = array.RowSparseGrad(
+            np.array([2, 0, 2]), np.ones((3, 2), dtype=np.float32), (3, 2))
+        b = chainer.Variable(np.zeros((3, 2), dtype=np.float32))
+        b.grad = dst_grad
+        b.addgrad(a)
+        np.testing.assert_array_equal(b.grad, expect)
+        self.assertIsNone(b.sparse_grad)
+
+    def test_addgrad_sparse(self):
+        self.check_addgrad_sparse(
+            np.ones((3, 2), dtype=np.float32),
+            np.ones((3, 2), dtype=np.float32),
+            [[3, 3], [2, 2], [4, 4]])
+
+    def test_addgrad_sparse_only(self):
+        self.check_addgrad_sparse(None, None, [[1, 1], [0, 0], [2, 2]])
+
     def test_addgrad_cpu_to_cpu_none_dst(self):
         self.check_addgrad(np.full(3, 20, dtype=np.float32),
                            np.full(3, 10, dtype=np.float32),
@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from chainer import serializers
+from chainer import testing
+from chainer.training import extensions
+from chainer.training.extensions import log_report
+
+
+class TestLogReport(unittest.TestCase):
+
+    def setUp(self):
+        self.out = tempfile.mkdtemp()
+        self.trainer = mock.MagicMock()
+        self.trainer.out = self.out
+        self.trainer.elapsed_time = 0
+        self.trainer.updater.epoch = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.out)
+
+    def _run(self, ext, n):
+        for i in range(n):
+            self.trainer.updater.iteration = i + 1
+            self.trainer.observation = {'loss': float(i)}
+            ext(self.trainer)
+
+    def test_json(self):
+        ext = extensions.LogReport(trigger=(1, 'iteration'))
+        self._run(ext, 3)
+        with open(os.path.join(self.out, 'log')) as f:
+            log = json.load(f)
+        self.assertEqual(log, ext.log)
+        self.assertEqual([e['loss'] for e in log], [0, 1, 2])
+
+    def test_json_lines(self):
+        ext = extensions.LogReport(trigger=(1, 'iteration'), json_lines=True)
+        self._run(ext, 3)
+        path = os.path.join(self.out, 'log')
+        log, offset = log_report.read_json_lines(path)
+        self.assertEqual(log, ext.log)
+        self.assertEqual(offset, os.path.getsize(path))
+
+        self._run(ext, 5)
+        tail, offset = log_report.read_json_lines(path, offset)
+        self.assertEqual(tail, ext.log[3:])
+        self.assertEqual(len(ext.log), 8)
+
+    def test_json_lines_overwrites_stale_file(self):
+        path = os.path.join(self.out, 'log')
+        with open(path, 'w') as f:
+            f.write('{"loss": 100.0}\n')
+        ext = extensions.LogReport(trigger=(1, 'iteration'), json_lines=True)
+        self._run(ext, 2)
+        log, _ = log_report.read_json_lines(path)
+        self.assertEqual(log, ext.log)
+
+    def test_json_lines_resume(self):
+        ext = extensions.LogReport(trigger=(1, 'iteration'), json_lines=True)
+        self._run(ext, 2)
+        snapshot = os.path.join(self.out, 'snapshot')
+        serializers.save_npz(snapshot, ext)
+
+        ext = extensions.LogReport(trigger=(1, 'iteration'), json_lines=True)
+        serializers.load_npz(snapshot, ext)
+        self._run(ext, 1)
+        log, _ = log_report.read_json_lines(os.path.join(self.out, 'log'))
+        self.assertEqual(log, ext.log)
+        self.assertEqual(len(log), 3)
+
+    def test_read_json_lines_incomplete_line(self):
+        path = os.path.join(self.out, 'log')
+        with open(path, 'w') as f:
+            f.write('{"loss": 1.0}\n{"loss": 2')
+        log, offset = log_report.read_json_lines(path)
+        self.assertEqual(log, [{'loss': 1.0}])
+        with open(path, 'a') as f:
+            f.write('.0}\n')
+        log, _ = log_report.read_json_lines(path, offset)
+        self.assertEqual(log, [{'loss': 2.0}])
+
+
+testing.run_module(__name__, __file__)
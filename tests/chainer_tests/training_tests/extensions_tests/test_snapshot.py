@@ -1,7 +1,13 @@
+import os
+import shutil
+import tempfile
 import unittest
 
 import mock
+import numpy
 
+from chainer import links
+from chainer import serializers
 from chainer import testing
 from chainer.training import extensions
 
@@ -21,4 +27,48 @@ class TestSnapshot(unittest.TestCase):
         self.assertEqual(snapshot.trigger, (1, 'epoch'))
 
 
+class TestAsyncSnapshotWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.out = tempfile.mkdtemp()
+        self.trainer = mock.MagicMock()
+        self.trainer.out = self.out
+        self.target = links.Linear(3, 2)
+
+    def tearDown(self):
+        shutil.rmtree(self.out)
+
+    def test_snapshot_object(self):
+        writer = extensions.AsyncSnapshotWriter()
+        ext = extensions.snapshot_object(
+            self.target, 'snapshot_{.updater.iteration}', writer=writer)
+        self.trainer.updater.iteration = 1
+        expect = self.target.W.data.copy()
+        ext(self.trainer)
+        # updates after taking the snapshot do not affect the saved arrays
+        self.target.W.data[...] = 0
+        ext.finalize()
+
+        loaded = links.Linear(3, 2)
+        serializers.load_npz(os.path.join(self.out, 'snapshot_1'), loaded)
+        numpy.testing.assert_array_equal(loaded.W.data, expect)
+
+    def test_n_retains(self):
+        writer = extensions.AsyncSnapshotWriter(n_retains=2, max_queue=2)
+        ext = extensions.snapshot_object(
+            self.target, 'snapshot_{.updater.iteration}', writer=writer)
+        for i in range(4):
+            self.trainer.updater.iteration = i
+            ext(self.trainer)
+        ext.finalize()
+        self.assertEqual(sorted(os.listdir(self.out)),
+                         ['snapshot_2', 'snapshot_3'])
+
+    def test_error(self):
+        writer = extensions.AsyncSnapshotWriter()
+        writer(os.path.join(self.out, 'not_exist'), 'snapshot', self.target)
+        with self.assertRaises(OSError):
+            writer.finalize()
+
+
 testing.run_module(__name__, __file__)
@@ -1,3 +1,6 @@
+import copy
+import multiprocessing
+import os
 import unittest
 
 import mock
@@ -5,6 +8,8 @@ import numpy
 
 import chainer
 from chainer import dataset
+from chainer import links
+from chainer import optimizers
 from chainer import testing
 from chainer import training
 
@@ -176,4 +181,128 @@ class TestUpdaterUpdateArguments(unittest.TestCase):
         self.assertEqual(iterator.next_called, 1)
 
 
+@unittest.skipUnless(os.name == 'posix', 'fork is not available')
+class TestCPUParallelUpdater(unittest.TestCase):
+
+    def setUp(self):
+        self.model = links.Classifier(links.Linear(3, 2))
+        self.model_ref = copy.deepcopy(self.model)
+        x = numpy.random.uniform(-1, 1, (7, 3)).astype(numpy.float32)
+        t = numpy.random.randint(0, 2, (7,)).astype(numpy.int32)
+        self.batch = list(zip(x, t))
+
+    def _update_ref(self, optimizer, n):
+        model = self.model_ref
+        model.cleargrads()
+        for i in range(n):
+            x, t = chainer.dataset.concat_examples(self.batch[i::n])
+            model(chainer.Variable(x), chainer.Variable(t)).backward()
+        optimizer.update()
+
+    def check_update(self, fused):
+        optimizer = optimizers.SGD(0.1)
+        optimizer.setup(self.model)
+        optimizer.use_fused_update(fused)
+        optimizer_ref = optimizers.SGD(0.1)
+        optimizer_ref.setup(self.model_ref)
+
+        updater = training.CPUParallelUpdater(
+            DummyIterator(self.batch), optimizer, n_processes=3)
+        try:
+            for _ in range(3):
+                updater.update()
+                self._update_ref(optimizer_ref, 3)
+                testing.assert_allclose(
+                    self.model.predictor.W.data,
+                    self.model_ref.predictor.W.data, atol=1e-6)
+                testing.assert_allclose(
+                    self.model.predictor.b.data,
+                    self.model_ref.predictor.b.data, atol=1e-6)
+        finally:
+            updater.finalize()
+        self.assertEqual(updater.iteration, 3)
+
+    def test_update(self):
+        self.check_update(False)
+
+    def test_update_fused(self):
+        self.check_update(True)
+        # The fused buffer is the shared memory seen by the workers
+        layout = self.model.predictor.W.data.base
+        self.assertIs(self.model.predictor.b.data.base, layout)
+
+    def test_small_batch(self):
+        optimizer = optimizers.SGD(0.1)
+        optimizer.setup(self.model)
+        optimizer_ref = optimizers.SGD(0.1)
+        optimizer_ref.setup(self.model_ref)
+
+        self.batch = self.batch[:2]
+        updater = training.CPUParallelUpdater(
+            DummyIterator(self.batch), optimizer, n_processes=4)
+        try:
+            for _ in range(2):
+                updater.update()
+                self._update_ref(optimizer_ref, 2)
+                testing.assert_allclose(
+                    self.model.predictor.W.data,
+                    self.model_ref.predictor.W.data, atol=1e-6)
+        finally:
+            updater.finalize()
+
+    def test_sparse_grad(self):
+        # The row-sparse gradients of the workers are also reduced
+        class Model(chainer.Chain):
+
+            def __init__(self):
+                super(Model, self).__init__(embed=links.EmbedID(8, 2))
+                self.embed.sparse_grad = True
+
+            def __call__(self, x):
+                return chainer.functions.sum(self.embed(x))
+
+        model = Model()
+        W = model.embed.W.data.copy()
+        optimizer = optimizers.SGD(0.1)
+        optimizer.setup(model)
+        batch = list(numpy.arange(8, dtype=numpy.int32))
+        updater = training.CPUParallelUpdater(
+            DummyIterator(batch), optimizer, n_processes=2)
+        try:
+            updater.update()
+        finally:
+            updater.finalize()
+        testing.assert_allclose(model.embed.W.data, W - 0.1)
+
+    @unittest.skipUnless(hasattr(multiprocessing, 'get_context'),
+                         'start methods are not available')
+    def test_start_method(self):
+        optimizer = optimizers.SGD(0.1)
+        optimizer.setup(self.model)
+        updater = training.CPUParallelUpdater(
+            DummyIterator(self.batch), optimizer, n_processes=2)
+        self.assertEqual(updater._context.get_start_method(), 'fork')
+
+        with mock.patch('multiprocessing.get_context',
+                        side_effect=ValueError):
+            with self.assertRaises(RuntimeError):
+                training.CPUParallelUpdater(
+                    DummyIterator(self.batch), optimizer, n_processes=2)
+
+    def test_worker_error(self):
+        optimizer = optimizers.SGD(0.1)
+        optimizer.setup(self.model)
+        updater = training.CPUParallelUpdater(
+            DummyIterator(self.batch), optimizer, n_processes=2)
+        try:
+            updater.update()
+            updater.get_iterator('main').next_data = [
+                (numpy.zeros(3, numpy.float32), numpy.int32(0)),
+                (numpy.zeros(4, numpy.float32), numpy.int32(0))]
+            with self.assertRaises(RuntimeError):
+                updater.update()
+        finally:
+            updater.finalize()
+
+
 testing.run_module(__name__, __file__)
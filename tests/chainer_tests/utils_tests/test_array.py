@@ -0,0 +1,82 @@
+import unittest
+
+import numpy
+
+from chainer import testing
+from chainer.utils import array
+
+
+@testing.parameterize(*testing.product({
+    'shape': [(10,), (10, 3), (10, 2, 3)],
+    'n': [0, 1, 20],
+}))
+class TestScatterAddRows(unittest.TestCase):
+
+    def setUp(self):
+        self.dst = numpy.random.uniform(-1, 1, self.shape)
+        self.indices = numpy.random.randint(
+            0, self.shape[0], (self.n,)).astype(numpy.int32)
+        self.values = numpy.random.uniform(
+            -1, 1, (self.n,) + self.shape[1:])
+
+    def test_scatter_add_rows(self):
+        expect = self.dst.copy()
+        for i, v in zip(self.indices, self.values):
+            expect[i] += v
+        array.scatter_add_rows(self.dst, self.indices, self.values)
+        testing.assert_allclose(self.dst, expect)
+
+    def test_scatter_add_rows_2d_indices(self):
+        if self.n % 2 != 0:
+            return
+        expect = self.dst.copy()
+        for i, v in zip(self.indices, self.values):
+            expect[i] += v
+        array.scatter_add_rows(
+            self.dst, self.indices.reshape(2, -1),
+            self.values.reshape((2, -1) + self.shape[1:]))
+        testing.assert_allclose(self.dst, expect)
+
+
+class TestRowSparseGrad(unittest.TestCase):
+
+    def setUp(self):
+        self.indices = numpy.array([[3, 0], [3, 1]], dtype=numpy.int32)
+        self.values = numpy.random.uniform(-1, 1, (2, 2, 3))
+        self.expect = numpy.zeros((5, 3))
+        numpy.add.at(self.expect, self.indices, self.values)
+
+    def test_init(self):
+        grad = array.RowSparseGrad(self.indices, self.values, (5, 3))
+        numpy.testing.assert_array_equal(grad.indices, [0, 1, 3])
+        self.assertEqual(grad.values.shape, (3, 3))
+        self.assertEqual(grad.shape, (5, 3))
+        self.assertEqual(grad.dtype, numpy.float64)
+        testing.assert_allclose(grad.to_dense(), self.expect)
+
+    def test_add(self):
+        grad1 = array.RowSparseGrad(self.indices[0], self.values[0], (5, 3))
+        grad2 = array.RowSparseGrad(self.indices[1], self.values[1], (5, 3))
+        grad = grad1 + grad2
+        numpy.testing.assert_array_equal(grad.indices, [0, 1, 3])
+        testing.assert_allclose(grad.to_dense(), self.expect)
+
+    def test_add_shape_mismatch(self):
+        grad1 = array.RowSparseGrad(self.indices, self.values, (5, 3))
+        grad2 = array.RowSparseGrad(self.indices, self.values, (6, 3))
+        with self.assertRaises(ValueError):
+            grad1 + grad2
+
+    def test_add_to(self):
+        dst = numpy.random.uniform(-1, 1, (5, 3))
+        expect = dst + self.expect
+        array.RowSparseGrad(self.indices, self.values, (5, 3)).add_to(dst)
+        testing.assert_allclose(dst, expect)
+
+    def test_empty(self):
+        grad = array.RowSparseGrad(
+            numpy.empty(0, numpy.int32), numpy.empty((0, 3)), (5, 3))
+        testing.assert_allclose(grad.to_dense(), numpy.zeros((5, 3)))
+
+
+testing.run_module(__name__, __file__)
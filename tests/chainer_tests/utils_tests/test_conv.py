@@ -3,6 +3,7 @@ import unittest
 import numpy
 from six import moves
 
+import chainer
 from chainer import cuda
 from chainer import testing
 from chainer.testing import attr
@@ -157,4 +158,61 @@ class TestCol2Im(unittest.TestCase):
         self.check_col2im(*self.params, gpu=True)
 
 
+@testing.parameterize(*testing.product({
+    'params': [
+        (3, 3, 1, 1, 1, 1, 1, 1, False),
+        (3, 2, 2, 3, 1, 0, 1, 1, True),
+        (3, 3, 2, 2, 2, 2, 2, 2, False),
+    ],
+    'workspace_size': [None, 1],
+    'n_threads': [1, 3],
+}))
+class TestConvCPU(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, (7, 3, 8, 10)).astype('f')
+        kh, kw = self.params[:2]
+        self.W = numpy.random.uniform(-1, 1, (4, 3, kh, kw)).astype('f')
+        if self.workspace_size is None:
+            self.workspace_size = chainer.config.cpu_conv_workspace_size
+
+    def reference(self):
+        kh, kw, sy, sx, ph, pw, dy, dx, cover_all = self.params
+        col = conv.im2col_cpu(self.x, kh, kw, sy, sx, ph, pw,
+                              cover_all=cover_all, dy=dy, dx=dx)
+        y = numpy.tensordot(col, self.W, ((1, 2, 3), (1, 2, 3)))
+        y = numpy.rollaxis(y, 3, 1)
+        gy = numpy.random.uniform(-1, 1, y.shape).astype('f')
+        gW = numpy.tensordot(gy, col, ((0, 2, 3), (0, 4, 5)))
+        gcol = numpy.rollaxis(numpy.tensordot(self.W, gy, (0, 1)), 3)
+        gx = conv.col2im_cpu(gcol, sy, sx, ph, pw, 8, 10, dy=dy, dx=dx)
+        return y, gy, gx, gW
+
+    def test_conv_cpu(self):
+        kh, kw, sy, sx, ph, pw, dy, dx, cover_all = self.params
+        y_expect, gy, gx_expect, gW_expect = self.reference()
+        with chainer.using_config('cpu_conv_threads', self.n_threads), \
+                chainer.using_config('cpu_conv_workspace_size',
+                                     self.workspace_size):
+            y, col = conv.conv_forward_cpu(
+                self.x, self.W, sy, sx, ph, pw, cover_all=cover_all,
+                dy=dy, dx=dx, keep_col=True)
+            gW = conv.conv_backward_filter_cpu(
+                self.x, gy, kh, kw, sy, sx, ph, pw, cover_all=cover_all,
+                dy=dy, dx=dx, col=col)
+            gx = conv.conv_backward_data_cpu(
+                self.W, gy, sy, sx, ph, pw, 8, 10, dy=dy, dx=dx)
+
+        # Splitting the batch does not change the results except for the
+        # sum over the batch
+        numpy.testing.assert_array_equal(y, y_expect)
+        numpy.testing.assert_array_equal(gx, gx_expect)
+        if self.workspace_size == 1 or self.n_threads > 1:
+            self.assertIsNone(col)
+            testing.assert_allclose(gW, gW_expect)
+        else:
+            self.assertIsNotNone(col)
+            numpy.testing.assert_array_equal(gW, gW_expect)
+
+
 testing.run_module(__name__, __file__)
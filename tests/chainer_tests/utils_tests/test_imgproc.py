@@ -0,0 +1,129 @@
+import threading
+import unittest
+
+import numpy
+
+from chainer import testing
+from chainer.utils import imgproc
+
+
+def _oversample_reference(images, crop_dims):
+    n, channels, src_h, src_w = images.shape
+    cy, cx = src_h / 2.0, src_w / 2.0
+    dst_h, dst_w = crop_dims
+    origins = [(0, 0), (0, src_w - dst_w), (src_h - dst_h, 0),
+               (src_h - dst_h, src_w - dst_w),
+               (int(cy - dst_h / 2.0), int(cx - dst_w / 2.0))]
+    crops = []
+    for img in images:
+        five = [img[:, y:y + dst_h, x:x + dst_w] for y, x in origins]
+        crops.extend(five)
+        crops.extend(crop[:, :, ::-1] for crop in five)
+    return numpy.array(crops)
+
+
+@testing.parameterize(
+    {'shape': (2, 3, 8, 10), 'crop_dims': (4, 6)},
+    {'shape': (2, 3, 8, 10), 'crop_dims': (5, 5)},
+    {'shape': (1, 1, 5, 5), 'crop_dims': (5, 5)},
+)
+class TestOversample(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.uniform(-1, 1, self.shape).astype('f')
+
+    def test_oversample(self):
+        y = imgproc.oversample(self.x, self.crop_dims)
+        numpy.testing.assert_array_equal(
+            y, _oversample_reference(self.x, self.crop_dims))
+
+    def test_oversample_list(self):
+        y = imgproc.oversample(list(self.x), self.crop_dims)
+        numpy.testing.assert_array_equal(
+            y, _oversample_reference(self.x, self.crop_dims))
+
+    def test_iter_oversample(self):
+        crops = list(imgproc.iter_oversample(self.x, self.crop_dims))
+        self.assertEqual(len(crops), 10)
+        expect = _oversample_reference(self.x, self.crop_dims)
+        for i, crop in enumerate(crops):
+            self.assertIs(crop.base, self.x)
+            numpy.testing.assert_array_equal(crop, expect[i::10])
+
+
+class TestIterChunks(unittest.TestCase):
+
+    def test_chunks(self):
+        chunks = list(imgproc.iter_chunks(iter(range(7)), 3))
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5], [6]])
+
+    def test_exact(self):
+        chunks = list(imgproc.iter_chunks(range(6), 3))
+        self.assertEqual(chunks, [[0, 1, 2], [3, 4, 5]])
+
+    def test_none(self):
+        chunks = list(imgproc.iter_chunks(iter(range(7)), None))
+        self.assertEqual(chunks, [list(range(7))])
+
+    def test_empty(self):
+        self.assertEqual(list(imgproc.iter_chunks([], 3)), [[]])
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            list(imgproc.iter_chunks(range(3), 0))
+
+
+@testing.parameterize(*testing.product({
+    'n_threads': [None, 1, 3],
+}))
+class TestLoadImages(unittest.TestCase):
+
+    def test_load_images(self):
+        images = list(range(10))
+        threads = set()
+
+        def load(i):
+            threads.add(threading.current_thread().ident)
+            return numpy.full((2, 3), i, dtype=numpy.uint8)
+
+        batch = imgproc.load_images(images, load, self.n_threads)
+        self.assertEqual(batch.shape, (10, 2, 3))
+        self.assertEqual(batch.dtype, numpy.uint8)
+        for i in images:
+            numpy.testing.assert_array_equal(batch[i], i)
+        if self.n_threads == 1:
+            self.assertEqual(threads, {threading.current_thread().ident})
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            imgproc.load_images([], lambda x: x, self.n_threads)
+
+
+class TestSubtractMean(unittest.TestCase):
+
+    def setUp(self):
+        self.x = numpy.random.randint(
+            0, 256, (4, 5, 6, 3)).astype(numpy.uint8)
+        self.mean = numpy.array([1.5, 2.25, 3.125], dtype=numpy.float32)
+
+    def expect(self):
+        y = []
+        for image in self.x:
+            image = numpy.asarray(image, dtype=numpy.float32)[:, :, ::-1]
+            y.append((image - self.mean).transpose(2, 0, 1))
+        return numpy.array(y)
+
+    def test_subtract_mean(self):
+        y = imgproc.subtract_mean(self.x, self.mean)
+        self.assertEqual(y.dtype, numpy.float32)
+        self.assertTrue(y.flags.c_contiguous)
+        numpy.testing.assert_array_equal(y, self.expect())
+
+    def test_out(self):
+        out = numpy.empty((4, 3, 5, 6), dtype=numpy.float32)
+        y = imgproc.subtract_mean(self.x, self.mean, out=out)
+        self.assertIs(y, out)
+        numpy.testing.assert_array_equal(y, self.expect())
+
+
+testing.run_module(__name__, __file__)
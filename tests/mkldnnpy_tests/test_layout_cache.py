@@ -0,0 +1,50 @@
+import gc
+import numpy as np
+import unittest
+import chainer.testing as testing
+from chainer import functions as F
+from chainer import mkld
+
+
+@unittest.skipUnless(mkld.avaiable, 'mkldnn is not available')
+class TestLayoutCache(unittest.TestCase):
+
+    def setUp(self):
+        self.enabled = mkld.layout_cache_enabled
+        mkld.clear_layout_cache()
+        self.x = np.random.uniform(-1, 1, (2, 16, 12, 12)).astype('f')
+        self.W = np.random.uniform(-1, 1, (16, 16, 3, 3)).astype('f')
+
+    def tearDown(self):
+        mkld.set_layout_cache_enabled(self.enabled)
+        mkld.clear_layout_cache()
+
+    def forward(self):
+        h = F.convolution_2d(self.x, self.W, pad=1)
+        h = F.max_pooling_2d(h, 2)
+        h = F.local_response_normalization(h)
+        return F.average_pooling_2d(h, 2).data
+
+    def test_consistency(self):
+        mkld.set_layout_cache_enabled(False)
+        expect = self.forward()
+        mkld.set_layout_cache_enabled(True)
+        for _ in range(2):
+            testing.assert_allclose(self.forward(), expect)
+
+    def test_release(self):
+        mkld.set_layout_cache_enabled(True)
+        self.forward()
+        self.forward()
+        gc.collect()
+        self.assertEqual(mkld.layout_cache_info().size, 0)
+
+    def test_disable(self):
+        mkld.set_layout_cache_enabled(False)
+        self.forward()
+        self.forward()
+        info = mkld.layout_cache_info()
+        self.assertEqual((info.hits, info.misses, info.size), (0, 0, 0))
+
+
+testing.run_module(__name__, __file__)
@@ -0,0 +1,63 @@
+import numpy as np
+import unittest
+import chainer.testing as testing
+from chainer import functions as F
+from chainer import mkld
+
+
+@unittest.skipUnless(mkld.avaiable, 'mkldnn is not available')
+class TestPrimitiveCache(unittest.TestCase):
+
+    def setUp(self):
+        mkld.clear_cache()
+        self.capacity = mkld.cache_info().capacity
+
+    def tearDown(self):
+        mkld.set_cache_capacity(self.capacity)
+        mkld.clear_cache()
+
+    def forward(self, n):
+        x = np.random.rand(n, 3, 8, 8).astype('f')
+        F.ReLU(False).forward((x,))
+
+    def test_hit_miss(self):
+        mkld.enable_relu = True
+        self.forward(2)
+        self.forward(2)
+        info = mkld.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.size, 1)
+
+    def test_lru_eviction(self):
+        mkld.enable_relu = True
+        mkld.set_cache_capacity(2)
+        for n in (1, 2, 1, 3):
+            self.forward(n)
+        info = mkld.cache_info()
+        self.assertEqual(info.size, 2)
+        self.assertEqual(info.evictions, 1)
+        # n=1 is recently used, so n=2 was evicted
+        self.forward(1)
+        self.assertEqual(mkld.cache_info().evictions, 1)
+        self.forward(2)
+        self.assertEqual(mkld.cache_info().evictions, 2)
+
+    def test_released_before_backward(self):
+        mkld.enable_relu = True
+        x = np.random.rand(2, 3, 8, 8).astype('f')
+        f = F.ReLU(False)
+        f.forward((x,))
+        mkld.clear_cache()
+        with self.assertRaises(RuntimeError):
+            f.backward((x,), (np.ones_like(x),))
+
+    def test_clear(self):
+        mkld.enable_relu = True
+        self.forward(2)
+        mkld.clear_cache()
+        info = mkld.cache_info()
+        self.assertEqual((info.hits, info.misses, info.size), (0, 0, 0))
+
+
+testing.run_module(__name__, __file__)